@@ -6,22 +6,89 @@
 #
 #    or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions and limitations under the License.
 
+import collections
 import concurrent.futures
 import copy
 
 from rdk import rdk
 
 
+def prepare_init(account_args_list):
+    regions = [cell_args.region for cell_args in account_args_list]
+    return rdk.rdk(copy.copy(account_args_list[0])).prepare_multi_region_init(regions)
+
+
+def prepare_lambda_layer(account_args_list):
+    regions = [cell_args.region for cell_args in account_args_list]
+    return rdk.rdk(copy.copy(account_args_list[0])).prepare_multi_region_lambda_layer(regions)
+
+
+def run_matrix(args_list, account_workers, region_workers):
+    # Runs up to account_workers accounts at a time, and up to region_workers regions at a time within each account.
+    # Each cell's output is buffered by its worker and printed whole once that cell finishes.
+    pending = list(args_list)
+    running = {}
+    active_cells = collections.Counter()
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(len(args_list), account_workers * region_workers)
+    ) as executor:
+        while pending or running:
+            for cell_args in list(pending):
+                account = cell_args.role_arn
+                if active_cells[account] >= region_workers:
+                    continue
+                if not active_cells[account] and len(active_cells) >= account_workers:
+                    continue
+                running[executor.submit(rdk.run_multi_region, cell_args)] = cell_args
+                active_cells[account] += 1
+                pending.remove(cell_args)
+
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                cell_args = running.pop(future)
+                active_cells[cell_args.role_arn] -= 1
+                if not active_cells[cell_args.role_arn]:
+                    del active_cells[cell_args.role_arn]
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {
+                        "Account": rdk.get_account_from_role_arn(cell_args.role_arn),
+                        "Region": cell_args.region,
+                        "ReturnValue": 1,
+                        "Duration": 0.0,
+                        "Rules": {},
+                        "Log": f"[{cell_args.region}]: Region worker failed: {e}\n",
+                    }
+                print(f"----- {' '.join(filter(None, [result['Account'], result['Region']]))} -----")
+                print(result["Log"], end="")
+                results.append(result)
+
+    return results
+
+
 def main():
     # Set up command-line argument parser and parse the args.
     my_parser = rdk.get_command_parser()
     args = my_parser.parse_args()
     my_rdk = rdk.rdk(args)
 
-    if args.region_file:
+    if args.region_file or args.accounts_file:
         if args.command in ["init", "deploy", "undeploy", "deploy-organization", "undeploy-organization"]:
-            regions = rdk.parse_region_file(args)
-            print(f"{args.command.capitalize()}ing rules in the following regions: {regions}.")
+            if args.region_workers < 1 or args.account_workers < 1:
+                my_parser.error("--region-workers and --account-workers must be at least 1.")
+
+            # Each cell of the matrix is one region in one account.  Without an accounts file, the matrix is just the
+            # regions of the region file, in the account of the current credentials.
+            if args.accounts_file:
+                accounts = rdk.parse_accounts_file(args)
+                print(f"{args.command.capitalize()}ing rules in {len(accounts)} accounts.")
+            else:
+                accounts = [{"RoleArn": None, "ExternalId": None, "Regions": rdk.parse_region_file(args)}]
+                print(f"{args.command.capitalize()}ing rules in the following regions: {accounts[0]['Regions']}.")
+
             if args.command in ["undeploy", "undeploy-organization"] and "--force" not in args.command_args:
                 my_input = input("Delete specified Rules and Lambda Functions from your AWS Account? (y/N): ")
                 while my_input.lower() not in ["y", "n"]:
@@ -32,18 +99,68 @@ def main():
                     exit(0)
 
             args_list = []
-            for region in regions:
-                vars(args)["region"] = region
-                args_list.append(copy.copy(args))
-
-            data = []
-            with concurrent.futures.ProcessPoolExecutor(max_workers=16) as executor:
-                future_run_multi_region = {executor.submit(rdk.run_multi_region, args): args for args in args_list}
-                for future in concurrent.futures.as_completed(future_run_multi_region):
-                    data.append(future.result())
-            exit(0)
+            for account in accounts:
+                for region in account["Regions"]:
+                    vars(args)["region"] = region
+                    vars(args)["role_arn"] = account["RoleArn"]
+                    vars(args)["role_external_id"] = account["ExternalId"]
+                    args_list.append(copy.copy(args))
+
+            if args.command == "init":
+                # IAM is global, so each account's Config role is set up once here instead of in every region.  The
+                # rdklib-layer is deployed to all of an account's regions at the same time, alongside the role.
+                account_cells = collections.defaultdict(list)
+                for cell_args in args_list:
+                    account_cells[cell_args.role_arn].append(cell_args)
+                with concurrent.futures.ThreadPoolExecutor(max_workers=2 * args.account_workers) as executor:
+                    role_futures = {executor.submit(prepare_init, cells): cells for cells in account_cells.values()}
+                    layer_futures = {
+                        executor.submit(prepare_lambda_layer, cells): cells for cells in account_cells.values()
+                    }
+                    for future in concurrent.futures.as_completed(role_futures):
+                        for cell_args in role_futures[future]:
+                            vars(cell_args)["config_role_ready"] = future.result()
+                    for future in concurrent.futures.as_completed(layer_futures):
+                        layer_results = future.result()
+                        for cell_args in layer_futures[future]:
+                            if cell_args.region not in layer_results:
+                                vars(cell_args)["lambda_layer_ready"] = False
+                            elif layer_results[cell_args.region]:
+                                vars(cell_args)["lambda_layer_ready"] = True
+                            else:
+                                vars(cell_args)["lambda_layer_ready"] = "sar-failed"
+
+                # A locally built layer only needs building once, whichever regions and accounts publish it, and the
+                # region workers run in separate processes that can't share a build.  So it is built here if any region
+                # needs it, including the rdklib-layer wherever the Serverless Application Repository failed.  The
+                # builder is kept until the workers finish, since a layer it couldn't cache lives in its temporary
+                # directory.
+                sar_failed = any(cell_args.lambda_layer_ready == "sar-failed" for cell_args in args_list)
+                layer_builder = rdk.rdk(copy.copy(args_list[0]))
+                prebuilt_lambda_layer = layer_builder.prebuild_lambda_layer(sar_failed)
+                for cell_args in args_list:
+                    vars(cell_args)["prebuilt_lambda_layer"] = prebuilt_lambda_layer
+
+            if args.command in ["deploy", "deploy-organization"]:
+                # Build each Rule package once and stage it in the first region, instead of once per region.  Other
+                # accounts can't copy from the staging bucket, so they aren't given it, but still reuse the local
+                # packages.
+                artifact_source_bucket = rdk.rdk(copy.copy(args_list[0])).stage_multi_region_artifacts(
+                    args_list[0].region
+                )
+                for cell_args in args_list:
+                    if cell_args.role_arn == args_list[0].role_arn:
+                        vars(cell_args)["artifact_source_bucket"] = artifact_source_bucket
+
+            results = run_matrix(args_list, args.account_workers, args.region_workers)
+
+            print()
+            rdk.print_multi_region_summary(results)
+            exit(1 if any(result["ReturnValue"] for result in results) else 0)
         else:
-            my_parser.error("Command must be 'init', 'deploy', or 'undeploy' when --region-file argument is provided.")
+            my_parser.error(
+                "Command must be 'init', 'deploy', or 'undeploy' when --region-file or --accounts-file argument is provided."
+            )
 
     return_val = my_rdk.process_command()
     exit(return_val)
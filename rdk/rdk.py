@@ -20,20 +20,32 @@ import argparse
 import base64
 import boto3
 import botocore
+import botocore.config
+import botocore.credentials
+import botocore.session
+import concurrent.futures
+import contextlib
+import copy
 import fileinput
 import fnmatch
+import hashlib
+import io
 import json
 import logging
 import os
+import random
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
+import traceback
 import unittest
 import uuid
 import yaml
+import zipfile
 
 # sphinx-argparse is a delight.
 try:
@@ -53,11 +65,46 @@ config_role_name = "config-role"
 assume_role_policy_file = "configRuleAssumeRolePolicyDoc.json"
 delivery_permission_policy_file = "deliveryPermissionsPolicy.json"
 code_bucket_prefix = "config-rule-code-bucket-"
+content_hash_metadata_key = "rdk-content-hash"
+# Packages installed into a locally built rdklib layer.
+lambda_layer_packages = ["boto3", "botocore", "rdk", "rdklib", "future", "mock"]
+# Packages that the Lambda Python runtimes already provide, and test-only packages, which a slim layer leaves out.
+lambda_layer_slim_excludes = ["boto3", "botocore", "s3transfer", "jmespath", "mock"]
+# The parts of a package's .dist-info that a slim layer keeps, so that installed package metadata still works.
+lambda_layer_slim_dist_info_files = ["METADATA", "entry_points.txt", "top_level.txt"]
+lambda_layer_runtimes = [
+    "python3.7",
+    "python3.8",
+    "python3.9",
+    "python3.10",
+    "python3.11",
+    "python3.12",
+    "python3.13",
+]
+identity_cache_ttl_variable = "RDK_IDENTITY_CACHE_TTL"
+layer_cache_ttl_variable = "RDK_LAYER_CACHE_TTL"
+plan_change_set_prefix = "rdk-plan-"
+aggregated_stack_prefix = "RDK-Config-Rules"
+aggregated_rules_metadata_key = "RdkAggregatedRules"
 parameter_file_name = "parameters.json"
 example_ci_dir = "example_ci"
 test_ci_filename = "test_ci.json"
 event_template_filename = "test_event_template.yaml"
 
+# Files that never belong in a Rule's Lambda deployment package.  Rules can add their own with "PackageExclude".
+PACKAGE_EXCLUDE_PATTERNS = [
+    ".*",
+    "__pycache__",
+    "*.pyc",
+    "*_test.py",
+    parameter_file_name,
+    "*.tfvars.json",
+    "*_rule.tf",
+    "*_variables.tf",
+]
+JAVA_SOURCE_EXCLUDE_PATTERNS = [".*", "build", "*.zip"]
+PACKAGE_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)  # earliest timestamp a zip entry can hold
+
 rdklib_versions_filepath = os.path.join(os.path.dirname(__file__), "rdklib_versions.yaml")
 RDKLIB_LAYER_VERSION = yaml.safe_load(open(rdklib_versions_filepath).read()).get("rdklib_layer_versions")
 
@@ -65,6 +112,24 @@ RDKLIB_LAYER_SAR_ID = "arn:aws:serverlessrepo:ap-southeast-1:711761543063:applic
 
 RDKLIB_ARN_STRING = "arn:aws:lambda:{region}:711761543063:layer:rdklib-layer:{version}"
 PARALLEL_COMMAND_THROTTLE_PERIOD = 2  # 2 seconds, used in running commands in parallel over multiple regions
+CFN_WAIT_MIN_DELAY = 2  # seconds between CloudFormation stack status polls while stacks are progressing
+CFN_WAIT_MAX_DELAY = 20  # upper bound for the backoff between polls while nothing is changing
+SAR_CHANGE_SET_TIMEOUT = 600  # seconds to wait for the Serverless Application Repository to create a change set
+IAM_PROPAGATION_TIMEOUT = 30  # seconds to wait for a new IAM role to become usable
+IAM_PROPAGATION_MAX_DELAY = 5  # upper bound for the backoff between IAM role readiness probes
+IAM_PROPAGATION_FALLBACK_DELAY = 10  # fixed wait for a new IAM role when the caller can't assume it to probe it
+CFN_DELETE_WORKERS = 8  # concurrent DeleteStack requests when tearing down stacks
+S3_DELETE_BATCH_SIZE = 1000  # the most keys a single DeleteObjects request accepts
+S3_DELETE_WORKERS = 8  # concurrent DeleteObjects requests when emptying a bucket
+BOTO_MAX_POOL_CONNECTIONS = 10  # minimum HTTP connection pool size for each cached boto3 client
+BOTO_MAX_ATTEMPTS = 10  # attempts per API call, including botocore's retries of throttled calls
+MULTI_REGION_WORKERS = 16  # default number of regions that a --region-file run works on at once, per account
+MULTI_ACCOUNT_WORKERS = 4  # default number of accounts that an --accounts-file run works on at once
+# CloudFormation quotas that aggregated stacks are sharded to respect.  Templates are passed by S3 URL, which allows
+# up to 1 MB; the size budget leaves headroom for the JSON that joins the Rules' resources together.
+CFN_MAX_RESOURCES = 500
+CFN_MAX_TEMPLATE_SIZE = 900000
+THROTTLING_ERROR_CODES = ["Throttling", "ThrottlingException", "TooManyRequestsException", "RequestLimitExceeded"]
 
 # This need to be update whenever config service supports more resource types
 # See: https://docs.aws.amazon.com/config/latest/developerguide/resource-config-reference.html
@@ -128,6 +193,26 @@ def get_command_parser():
         "--region-set",
         help="[optional] Set of regions within the region file with which to run the command in parallel. Looks for a 'default' region set if not specified.",
     )
+    parser.add_argument(
+        "--region-workers",
+        type=int,
+        default=MULTI_REGION_WORKERS,
+        help=f"[optional] Number of regions to run the command in at the same time, in each account. Defaults to {MULTI_REGION_WORKERS}.",
+    )
+    parser.add_argument(
+        "--accounts-file",
+        help="[optional] File listing the accounts to run the command in, with the role to assume and the regions for each. Supported for init, deploy, and undeploy.",
+    )
+    parser.add_argument(
+        "--account-set",
+        help="[optional] Set of accounts within the accounts file with which to run the command. Looks for a 'default' account set if not specified.",
+    )
+    parser.add_argument(
+        "--account-workers",
+        type=int,
+        default=MULTI_ACCOUNT_WORKERS,
+        help=f"[optional] Number of accounts from the accounts file to run the command in at the same time. Defaults to {MULTI_ACCOUNT_WORKERS}.",
+    )
     # parser.add_argument('--verbose','-v', action='count')
     # Removed for now from command choices: 'test-remote', 'status'
     rdk_commands = sorted(
@@ -209,6 +294,20 @@ def get_init_parser():
         default="rdklib-layer",
         help='[optional] Sets the name of the generated lambda-layer, "rdklib-layer" by default',
     )
+    parser.add_argument(
+        "--lambda-layer-profile",
+        required=False,
+        default="full",
+        choices=["full", "slim"],
+        help='[optional] How to build a generated lambda-layer locally. "slim" leaves out boto3, botocore and the other packages the Lambda runtime provides, test-only packages, tests, most .dist-info files and __pycache__. "full" by default',
+    )
+    parser.add_argument(
+        "--precompile-lambda-layer",
+        required=False,
+        metavar="RUNTIME",
+        choices=lambda_layer_runtimes,
+        help="[optional] Precompiles a locally built lambda-layer to bytecode for this runtime, e.g. python3.12. Needs that Python version installed locally",
+    )
 
     return parser
 
@@ -500,6 +599,45 @@ def get_deployment_parser(ForceArgument=False, Command="deploy"):
         default="rdklib-layer",
         help='[optional] To use with --generated-lambda-layer, forces the flag to look for a specific lambda-layer name. If omitted, "rdklib-layer" will be used',
     )
+    if ForceArgument:
+        aggregate_help = '[optional] Remove Rules deployed with deploy --aggregate by deleting all of the aggregated CloudFormation stacks.  Requires --all.  Use --stack-name to set the stack name prefix.  If omitted, "RDK-Config-Rules" will be used.'
+    else:
+        aggregate_help = '[optional] Deploy the Rules in as few CloudFormation stacks as CloudFormation limits allow, instead of one stack per Rule.  Requires --all.  Use --stack-name to set the stack name prefix.  If omitted, "RDK-Config-Rules" will be used.'
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        required=False,
+        help=aggregate_help,
+    )
+
+    if not ForceArgument:
+        parser.add_argument(
+            "--parallel",
+            required=False,
+            default=1,
+            type=int,
+            metavar="N",
+            help="[optional] Number of Rules to deploy concurrently. Defaults to 1, which deploys Rules one at a time.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            required=False,
+            help="[optional] Continue a deploy that stopped part-way, skipping the steps it already completed for Rules that haven't changed since.",
+        )
+        plan_group = parser.add_mutually_exclusive_group()
+        plan_group.add_argument(
+            "--plan",
+            action="store_true",
+            required=False,
+            help="[optional] Create CloudFormation change sets for the selected Rules and show the planned changes, without deploying anything.",
+        )
+        plan_group.add_argument(
+            "--apply",
+            action="store_true",
+            required=False,
+            help="[optional] Deploy the selected Rules by executing the change sets created by an earlier --plan.",
+        )
 
     if ForceArgument:
         parser.add_argument(
@@ -853,15 +991,183 @@ def parse_region_file(args):
         raise SyntaxError(f"Error reading regions: {region_set} in file: {args.region_file}")
 
 
+def parse_accounts_file(args):
+    # An account set is a list of accounts, each with the role to assume in it and, optionally, its own regions:
+    #   default:
+    #     - role_arn: arn:aws:iam::111122223333:role/rdk-deploy
+    #       external_id: <optional>
+    #       regions: [us-east-1, eu-west-1]
+    # Accounts without regions use the regions from --region-file, or else --region.
+    account_set = "default"
+    if args.account_set:
+        account_set = args.account_set
+    try:
+        account_text = yaml.safe_load(open(args.accounts_file, "r"))
+        account_entries = account_text[account_set]
+    except Exception:
+        raise SyntaxError(f"Error reading accounts: {account_set} in file: {args.accounts_file}")
+
+    default_regions = parse_region_file(args) if args.region_file else [args.region] if args.region else []
+    accounts = []
+    for account_entry in account_entries:
+        role_arn = account_entry.get("role_arn") if isinstance(account_entry, dict) else None
+        if not role_arn or not re.match(r"^arn:[\w-]+:iam::\d{12}:role/", role_arn):
+            raise SyntaxError(f"Invalid role_arn for an account in {account_set} in file: {args.accounts_file}")
+        regions = account_entry.get("regions", default_regions)
+        if not regions:
+            raise SyntaxError(
+                f"No regions for {role_arn} in file: {args.accounts_file}. Add regions, or use --region-file or --region."
+            )
+        accounts.append({"RoleArn": role_arn, "ExternalId": account_entry.get("external_id"), "Regions": list(regions)})
+
+    return accounts
+
+
+def get_account_from_role_arn(role_arn):
+    return role_arn.split(":")[4] if role_arn else ""
+
+
+# Caller identities already resolved by this process, keyed by credential source.  See __get_caller_identity_details.
+_caller_identity_cache = {}
+_caller_identity_cache_lock = threading.Lock()
+
+# Refreshable credentials for roles assumed by this process, keyed by the role and the credentials that assumed it.
+# Multi-account workers run many cells in the same process, so each account's role is only assumed again when its
+# credentials are about to expire, including in the middle of a long-running cell.
+_assumed_role_credentials_cache = {}
+_assumed_role_credentials_cache_lock = threading.Lock()
+
+
 def run_multi_region(args):
-    my_rdk = rdk(args)
-    return_val = my_rdk.process_command()
-    return return_val
+    # Runs the command in one region, in a worker process.  Output is buffered and returned with the results rather
+    # than printed, so that each region's log can be printed whole instead of interleaving with the other regions'.
+    log = io.StringIO()
+    start_time = time.time()
+    my_rdk = None
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            my_rdk = rdk(args)
+            return_val = my_rdk.process_command()
+        except SystemExit as se:
+            if se.code is not None and not isinstance(se.code, int):
+                print(se.code)
+            return_val = se.code if isinstance(se.code, int) else int(se.code is not None)
+        except Exception:
+            traceback.print_exc()
+            return_val = 1
+
+    return {
+        "Account": get_account_from_role_arn(getattr(args, "role_arn", None)),
+        "Region": args.region,
+        "ReturnValue": return_val or 0,
+        "Duration": time.time() - start_time,
+        "Rules": my_rdk.rule_results if my_rdk else {},
+        "Log": log.getvalue(),
+    }
+
+
+def print_multi_region_summary(results):
+    # One row per account and region, followed by a row per Rule for commands that track their Rules individually.
+    rows = [("Account", "Region", "Rule", "Status", "Duration")]
+    for result in sorted(results, key=lambda result: (result["Account"], result["Region"])):
+        status = f"Failed ({result['ReturnValue']})" if result["ReturnValue"] else "Succeeded"
+        rows.append((result["Account"], result["Region"], "", status, f"{result['Duration']:.1f}s"))
+        for rule_name, rule_result in sorted(result["Rules"].items()):
+            rows.append(("", "", rule_name, rule_result["Status"], f"{rule_result['Duration']:.1f}s"))
+
+    # Runs over a single account's regions don't need the account column.
+    if not any(result["Account"] for result in results):
+        rows = [row[1:] for row in rows]
+
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+
+
+def _jittered_delay(delay):
+    # Spread polls out so that Rules and regions that started together don't keep calling the same API in lockstep.
+    return random.uniform(delay / 2, delay)
+
+
+def _is_failed_stack_status(stack_status):
+    # Covers CREATE_FAILED, ROLLBACK_COMPLETE, UPDATE_ROLLBACK_COMPLETE and the like.
+    return "FAILED" in stack_status or "ROLLBACK" in stack_status
+
+
+def _package_pattern_matches(relative_path, pattern):
+    # Patterns containing a "/" match the whole relative path, others match any single path component.
+    if "/" in pattern:
+        return fnmatch.fnmatch(relative_path, pattern)
+    return any(fnmatch.fnmatch(component, pattern) for component in relative_path.split("/"))
+
+
+def get_package_files(source_dir, include_patterns=None, exclude_patterns=None, keep_paths=None):
+    # Returns a sorted list of (relative path, absolute path) for every file that belongs in the package.  Files in
+    # keep_paths, such as the Lambda handler, are never excluded, even when an exclude pattern matches them.
+    include_patterns = include_patterns or ["*"]
+    exclude_patterns = exclude_patterns or []
+    keep_paths = keep_paths or []
+    package_files = []
+    for top, dirs, filenames in os.walk(source_dir):
+        # Prune excluded directories up front rather than walking into them.
+        dirs[:] = [
+            dir_name
+            for dir_name in dirs
+            if not any(
+                _package_pattern_matches(
+                    os.path.relpath(os.path.join(top, dir_name), source_dir).replace(os.sep, "/"), p
+                )
+                for p in exclude_patterns
+            )
+        ]
+        for filename in filenames:
+            file_path = os.path.join(top, filename)
+            relative_path = os.path.relpath(file_path, source_dir).replace(os.sep, "/")
+            if relative_path not in keep_paths and any(
+                _package_pattern_matches(relative_path, p) for p in exclude_patterns
+            ):
+                continue
+            if not any(_package_pattern_matches(relative_path, p) for p in include_patterns):
+                continue
+            package_files.append((relative_path, file_path))
+
+    return sorted(package_files)
+
+
+def build_package_zip(source_dir, include_patterns=None, exclude_patterns=None, keep_paths=None):
+    # Builds the archive in memory with sorted entries, fixed timestamps and normalised permissions,
+    # so the same files always produce byte-identical zips on any machine.  Executables stay executable.
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as package_zip:
+        for relative_path, file_path in get_package_files(source_dir, include_patterns, exclude_patterns, keep_paths):
+            zip_info = zipfile.ZipInfo(relative_path, date_time=PACKAGE_ZIP_DATE_TIME)
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            file_mode = 0o755 if os.stat(file_path).st_mode & 0o111 else 0o644
+            zip_info.external_attr = file_mode << 16
+            with open(file_path, "rb") as f:
+                package_zip.writestr(zip_info, f.read(), compresslevel=9)
+
+    return zip_buffer.getvalue()
 
 
 class rdk:
     def __init__(self, args):
         self.args = args
+        self.__sessions = {}
+        self.__sessions_lock = threading.Lock()
+        self.__rule_plans = {}
+        self.__journal = None
+        self.__journal_lock = threading.Lock()
+        # Whether buckets and IAM roles exist, by name, as far as this command has checked.
+        self.__existing_buckets = {}
+        self.__existing_roles = {}
+        self.__layer_build_lock = threading.Lock()
+        self.__unresolved_lambda_layer = None
+        # Latest version ARN of each layer, by region and layer name.  See __get_existing_lambda_layer.
+        self.__lambda_layer_versions = {}
+        self.__lambda_layer_lock = threading.RLock()
+        # Status and duration of each Rule handled by the command, reported in the multi-region summary.
+        self.rule_results = {}
 
     @staticmethod
     def get_command_parser(self):
@@ -911,22 +1217,6 @@ class rdk:
             )
             control_tower = True
 
-        if self.args.generate_lambda_layer:
-            lambda_layer_version = self.__get_existing_lambda_layer(my_session, layer_name=self.args.custom_layer_name)
-            if lambda_layer_version:
-                print(f"[{my_session.region_name}]: Found Version: " + lambda_layer_version)
-            if self.args.generate_lambda_layer:
-                print(
-                    f"[{my_session.region_name}]: --generate-lambda-layer Flag received, forcing update of the Lambda Layer in {my_session.region_name}"
-                )
-            else:
-                print(
-                    f"[{my_session.region_name}]: Lambda Layer not found in {my_session.region_name}. Creating one now"
-                )
-            # Try to generate lambda layer with ServerlessAppRepo, manually generate if impossible
-            self.__create_new_lambda_layer(my_session, layer_name=self.args.custom_layer_name)
-            lambda_layer_version = self.__get_existing_lambda_layer(my_session, layer_name=self.args.custom_layer_name)
-
         # Check to see if the ConfigRecorder has been created.
         recorders = my_config.describe_configuration_recorders()
         if len(recorders["ConfigurationRecorders"]) > 0:
@@ -949,86 +1239,38 @@ class rdk:
             )
         if not control_tower and not config_bucket_exists:
             # check whether bucket exists if not create config bucket
-            response = my_s3.list_buckets()
-            bucket_exists = False
-            for bucket in response["Buckets"]:
-                if bucket["Name"] == config_bucket_name:
-                    print(f"[{my_session.region_name}]: Found Bucket: " + config_bucket_name)
-                    config_bucket_exists = True
-                    bucket_exists = True
+            bucket_exists = self.__s3_bucket_exists(my_s3, config_bucket_name)
+            if bucket_exists:
+                print(f"[{my_session.region_name}]: Found Bucket: " + config_bucket_name)
+                config_bucket_exists = True
 
             if not bucket_exists:
                 print(f"[{my_session.region_name}]: Creating Config bucket " + config_bucket_name)
-                if my_session.region_name == "us-east-1":
-                    my_s3.create_bucket(Bucket=config_bucket_name)
-                else:
-                    my_s3.create_bucket(
-                        Bucket=config_bucket_name,
-                        CreateBucketConfiguration={"LocationConstraint": my_session.region_name},
-                    )
+                try:
+                    if my_session.region_name == "us-east-1":
+                        my_s3.create_bucket(Bucket=config_bucket_name)
+                    else:
+                        my_s3.create_bucket(
+                            Bucket=config_bucket_name,
+                            CreateBucketConfiguration={"LocationConstraint": my_session.region_name},
+                        )
+                except ClientError as ce:
+                    # The Config bucket is shared by every region, so another region's init may have just created it.
+                    if ce.response["Error"]["Code"] != "BucketAlreadyOwnedByYou":
+                        raise
+                    print(f"[{my_session.region_name}]: Found Bucket: " + config_bucket_name)
+                self.__existing_buckets[config_bucket_name] = True
 
         if not config_role_arn:
-            # create config role
-            my_iam = my_session.client("iam")
-            response = my_iam.list_roles()
-            role_exists = False
-            for role in response["Roles"]:
-                if role["RoleName"] == config_role_name:
-                    role_exists = True
-
-            if not role_exists:
-                print(f"[{my_session.region_name}]: Creating IAM role config-role")
-                if partition in ["aws", "aws-us-gov"]:
-                    partition_url = ".com"
-                elif partition == "aws-cn":
-                    partition_url = ".com.cn"
-                assume_role_policy_template = open(
-                    os.path.join(path.dirname(__file__), "template", assume_role_policy_file),
-                    "r",
-                ).read()
-                assume_role_policy = json.loads(assume_role_policy_template.replace("${PARTITIONURL}", partition_url))
-                assume_role_policy["Statement"].append(
-                    {
-                        "Effect": "Allow",
-                        "Principal": {"AWS": str(account_id)},
-                        "Action": "sts:AssumeRole",
-                    }
-                )
-                my_iam.create_role(
-                    RoleName=config_role_name,
-                    AssumeRolePolicyDocument=json.dumps(assume_role_policy),
-                    Path="/rdk/",
-                )
-
-            # attach role policy
-            my_iam.attach_role_policy(
-                RoleName=config_role_name,
-                PolicyArn="arn:" + partition + ":iam::aws:policy/service-role/AWS_ConfigRole",
-            )
-            my_iam.attach_role_policy(
-                RoleName=config_role_name,
-                PolicyArn="arn:" + partition + ":iam::aws:policy/ReadOnlyAccess",
-            )
-            policy_template = open(
-                os.path.join(path.dirname(__file__), "template", delivery_permission_policy_file),
-                "r",
-            ).read()
-            delivery_permissions_policy = policy_template.replace("${ACCOUNTID}", account_id).replace(
-                "${PARTITION}", partition
-            )
-            my_iam.put_role_policy(
-                RoleName=config_role_name,
-                PolicyName="ConfigDeliveryPermissions",
-                PolicyDocument=delivery_permissions_policy,
-            )
-
-            # wait for changes to propagate.
-            print(f"[{my_session.region_name}]: Waiting for IAM role to propagate")
-            time.sleep(16)
+            config_role_arn = "arn:" + partition + ":iam::" + account_id + ":role/rdk/config-role"
+            if getattr(self.args, "config_role_ready", False):
+                # A multi-region init already set the role up for this account before the region workers started.
+                print(f"[{my_session.region_name}]: Found Config Role: " + config_role_arn)
+            else:
+                if self.__create_config_role(my_session, account_id, partition):
+                    self.__wait_for_iam_role(my_session, config_role_arn)
 
         # create or update config recorder
-        if not config_role_arn:
-            config_role_arn = "arn:" + partition + ":iam::" + account_id + ":role/rdk/config-role"
 
         if not control_tower and not config_recorder_exists:
             my_config.put_configuration_recorder(
@@ -1065,12 +1307,9 @@ class rdk:
 
         # create code bucket
         code_bucket_name = code_bucket_prefix + account_id + "-" + my_session.region_name
-        response = my_s3.list_buckets()
-        bucket_exists = False
-        for bucket in response["Buckets"]:
-            if bucket["Name"] == code_bucket_name:
-                bucket_exists = True
-                print(f"[{my_session.region_name}]: Found code bucket: " + code_bucket_name)
+        bucket_exists = self.__s3_bucket_exists(my_s3, code_bucket_name)
+        if bucket_exists:
+            print(f"[{my_session.region_name}]: Found code bucket: " + code_bucket_name)
 
         if not bucket_exists:
             if self.args.skip_code_bucket_creation:
@@ -1078,17 +1317,190 @@ class rdk:
             else:
                 print(f"[{my_session.region_name}]: Creating Code bucket " + code_bucket_name)
 
-            # Consideration for us-east-1 S3 API
-            if my_session.region_name == "us-east-1":
-                my_s3.create_bucket(Bucket=code_bucket_name)
+                # Consideration for us-east-1 S3 API
+                if my_session.region_name == "us-east-1":
+                    my_s3.create_bucket(Bucket=code_bucket_name)
+                else:
+                    my_s3.create_bucket(
+                        Bucket=code_bucket_name,
+                        CreateBucketConfiguration={"LocationConstraint": my_session.region_name},
+                    )
+                self.__existing_buckets[code_bucket_name] = True
+
+        # The layer is generated once the code bucket exists, since a locally built layer is published from there.
+        lambda_layer_ready = getattr(self.args, "lambda_layer_ready", False)
+        if self.args.generate_lambda_layer and lambda_layer_ready == "sar-failed":
+            # SAR was already tried for this region before the region workers started, so don't try it again.
+            print(
+                f"[{my_session.region_name}]: Serverless Application Repository deployment not supported, attempting manual deployment"
+            )
+            self.__create_new_lambda_layer_locally(my_session, layer_name=self.args.custom_layer_name)
+            lambda_layer_version = self.__get_existing_lambda_layer(
+                my_session, layer_name=self.args.custom_layer_name, refresh=True
+            )
+        elif self.args.generate_lambda_layer and lambda_layer_ready:
+            print(f"[{my_session.region_name}]: rdklib-layer was deployed before the region workers started.")
+        elif self.args.generate_lambda_layer:
+            lambda_layer_version = self.__get_existing_lambda_layer(
+                my_session, layer_name=self.args.custom_layer_name, refresh=True
+            )
+            if lambda_layer_version:
+                print(f"[{my_session.region_name}]: Found Version: " + lambda_layer_version)
+            if self.args.generate_lambda_layer:
+                print(
+                    f"[{my_session.region_name}]: --generate-lambda-layer Flag received, forcing update of the Lambda Layer in {my_session.region_name}"
+                )
             else:
-                my_s3.create_bucket(
-                    Bucket=code_bucket_name,
-                    CreateBucketConfiguration={"LocationConstraint": my_session.region_name},
+                print(
+                    f"[{my_session.region_name}]: Lambda Layer not found in {my_session.region_name}. Creating one now"
                 )
+            # Try to generate lambda layer with ServerlessAppRepo, manually generate if impossible
+            self.__create_new_lambda_layer(my_session, layer_name=self.args.custom_layer_name)
+            lambda_layer_version = self.__get_existing_lambda_layer(
+                my_session, layer_name=self.args.custom_layer_name, refresh=True
+            )
 
         return 0
 
+    def __s3_bucket_exists(self, s3_client, bucket_name):
+        # A HeadBucket on the one bucket rather than listing every bucket in the account.  Results are kept, so each
+        # bucket is only checked once however many times init asks about it.
+        if bucket_name not in self.__existing_buckets:
+            try:
+                s3_client.head_bucket(Bucket=bucket_name)
+                self.__existing_buckets[bucket_name] = True
+            except ClientError as ce:
+                error_code = ce.response["Error"]["Code"]
+                if error_code in ["404", "NoSuchBucket"]:
+                    self.__existing_buckets[bucket_name] = False
+                elif error_code in ["403", "AccessDenied"]:
+                    # The bucket exists, but this account can't see into it, so it can't be created either.
+                    print(f"[{s3_client.meta.region_name}]: Bucket {bucket_name} exists but is not accessible.")
+                    self.__existing_buckets[bucket_name] = True
+                else:
+                    raise
+        return self.__existing_buckets[bucket_name]
+
+    def __iam_role_exists(self, iam_client, role_name):
+        if role_name not in self.__existing_roles:
+            try:
+                iam_client.get_role(RoleName=role_name)
+                self.__existing_roles[role_name] = True
+            except ClientError as ce:
+                if ce.response["Error"]["Code"] != "NoSuchEntity":
+                    raise
+                self.__existing_roles[role_name] = False
+        return self.__existing_roles[role_name]
+
+    def __create_config_role(self, my_session, account_id, partition):
+        # Creates the Config role if it doesn't exist yet, and makes sure its policies are attached.  Returns whether
+        # the role was created, in which case it needs time to propagate before it can be used.
+        my_iam = my_session.client("iam")
+        role_created = False
+        if not self.__iam_role_exists(my_iam, config_role_name):
+            print(f"[{my_session.region_name}]: Creating IAM role config-role")
+            if partition in ["aws", "aws-us-gov"]:
+                partition_url = ".com"
+            elif partition == "aws-cn":
+                partition_url = ".com.cn"
+            assume_role_policy_template = open(
+                os.path.join(path.dirname(__file__), "template", assume_role_policy_file),
+                "r",
+            ).read()
+            assume_role_policy = json.loads(assume_role_policy_template.replace("${PARTITIONURL}", partition_url))
+            assume_role_policy["Statement"].append(
+                {
+                    "Effect": "Allow",
+                    "Principal": {"AWS": str(account_id)},
+                    "Action": "sts:AssumeRole",
+                }
+            )
+            my_iam.create_role(
+                RoleName=config_role_name,
+                AssumeRolePolicyDocument=json.dumps(assume_role_policy),
+                Path="/rdk/",
+            )
+            self.__existing_roles[config_role_name] = True
+            role_created = True
+
+        # attach role policy
+        my_iam.attach_role_policy(
+            RoleName=config_role_name,
+            PolicyArn="arn:" + partition + ":iam::aws:policy/service-role/AWS_ConfigRole",
+        )
+        my_iam.attach_role_policy(
+            RoleName=config_role_name,
+            PolicyArn="arn:" + partition + ":iam::aws:policy/ReadOnlyAccess",
+        )
+        policy_template = open(
+            os.path.join(path.dirname(__file__), "template", delivery_permission_policy_file),
+            "r",
+        ).read()
+        delivery_permissions_policy = policy_template.replace("${ACCOUNTID}", account_id).replace(
+            "${PARTITION}", partition
+        )
+        my_iam.put_role_policy(
+            RoleName=config_role_name,
+            PolicyName="ConfigDeliveryPermissions",
+            PolicyDocument=delivery_permissions_policy,
+        )
+        return role_created
+
+    def __wait_for_iam_role(self, my_session, role_arn):
+        # IAM is eventually consistent, so a new role can't be used straight away.  If the caller may assume the role
+        # (it trusts its own account), a successful AssumeRole is a good sign that Config can use it too.  Most callers
+        # may not, and AccessDenied can't tell that apart from a role that hasn't propagated yet, so in that case wait
+        # until IAM returns the role and then for a short fixed time.
+        print(f"[{my_session.region_name}]: Waiting for IAM role to propagate")
+        try:
+            my_session.client("sts").assume_role(RoleArn=role_arn, RoleSessionName="rdk-init-readiness-probe")
+            return True
+        except ClientError as ce:
+            if ce.response["Error"]["Code"] != "AccessDenied":
+                print(f"[{my_session.region_name}]: Unable to confirm that the IAM role has propagated: {ce}")
+                return False
+
+        iam_client = my_session.client("iam")
+        deadline = time.time() + IAM_PROPAGATION_TIMEOUT
+        delay = 1
+        while True:
+            try:
+                iam_client.get_role(RoleName=role_arn.split("/")[-1])
+                break
+            except ClientError as ce:
+                if ce.response["Error"]["Code"] != "NoSuchEntity" or time.time() + delay > deadline:
+                    print(f"[{my_session.region_name}]: Unable to confirm that the IAM role has propagated: {ce}")
+                    return False
+            time.sleep(_jittered_delay(delay))
+            delay = min(delay * 2, IAM_PROPAGATION_MAX_DELAY)
+        time.sleep(IAM_PROPAGATION_FALLBACK_DELAY)
+        return True
+
+    def prepare_multi_region_init(self, regions):
+        # Called once per account before a multi-region init fans out.  IAM is global, so the Config role only needs
+        # to be created, and waited on, once rather than in every region.  Returns whether the region workers can
+        # skip setting the role up; that's only needed if some region doesn't have a Configuration Recorder yet.
+        self.args = get_init_parser().parse_args(self.args.command_args, self.args)
+        needs_config_role = False
+        for region in regions:
+            self.args.region = region
+            my_config = self.__get_boto_session().client("config")
+            if not my_config.describe_configuration_recorders()["ConfigurationRecorders"]:
+                needs_config_role = True
+                break
+
+        self.args.region = regions[0]
+        if not needs_config_role:
+            return False
+
+        my_session = self.__get_boto_session()
+        identity_details = self.__get_caller_identity_details(my_session)
+        account_id = identity_details["account_id"]
+        partition = identity_details["partition"]
+        if self.__create_config_role(my_session, account_id, partition):
+            self.__wait_for_iam_role(my_session, "arn:" + partition + ":iam::" + account_id + ":role/rdk/config-role")
+        return True
+
     def clean(self):
         self.args = get_clean_parser().parse_args(self.args.command_args, self.args)
 
@@ -1169,49 +1581,40 @@ class rdk:
                 except Exception as e:
                     print("Error encountered trying to delete Delivery Channel: " + str(e))
 
+        # Start deleting any of the Rules deployed the traditional way, and the Functions stack, if one exists.  The
+        # buckets are emptied while CloudFormation works through the stacks.
+        self.args.all = True
+        rule_names = self.__get_rule_list_for_command()
+        deleted_stacks = self.__delete_cfn_stacks(
+            cfn_client,
+            [self.__get_stack_name_from_rule_name(rule_name) for rule_name in rule_names]
+            + ["RDK-Config-Rule-Functions"],
+        )
+        if "RDK-Config-Rule-Functions" not in deleted_stacks:
+            print("No Functions stack found.")
+
         if config_bucket_names:
             # empty and then delete the config bucket.
             for config_bucket_name in config_bucket_names:
                 try:
-                    config_bucket = my_session.resource("s3").Bucket(config_bucket_name)
-                    config_bucket.objects.all().delete()
-                    config_bucket.delete()
+                    self.__delete_s3_bucket(s3_client, config_bucket_name)
                 except Exception as e:
                     print("Error encountered trying to delete config bucket: " + str(e))
 
-        # Delete any of the Rules deployed the traditional way.
-        self.args.all = True
-        rule_names = self.__get_rule_list_for_command()
-        for rule_name in rule_names:
-            my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
-            try:
-                cfn_client.delete_stack(StackName=my_stack_name)
-            except Exception as e:
-                print("Error encountered deleting Rule stack: " + str(e))
-
-        # Delete the Functions stack, if one exists.
-        try:
-            response = cfn_client.describe_stacks(StackName="RDK-Config-Rule-Functions")
-            if response["Stacks"]:
-                cfn_client.delete_stack(StackName="RDK-Config-Rule-Functions")
-        except ClientError as ce:
-            if ce.response["Error"]["Code"] == "ValidationError":
-                print("No Functions stack found.")
-        except Exception as e:
-            print("Error encountered deleting Functions stack: " + str(e))
-
         # Delete the code bucket, if one exists.
         code_bucket_name = code_bucket_prefix + account_id + "-" + my_session.region_name
         try:
-            code_bucket = my_session.resource("s3").Bucket(code_bucket_name)
-            code_bucket.objects.all().delete()
-            code_bucket.delete()
+            self.__delete_s3_bucket(s3_client, code_bucket_name)
         except ClientError as ce:
             if ce.response["Error"]["Code"] == "NoSuchBucket":
                 print("No code bucket found.")
+            else:
+                print("Error encountered trying to delete code bucket: " + str(ce))
         except Exception as e:
             print("Error encountered trying to delete code bucket: " + str(e))
 
+        self.__wait_for_cfn_stack_deletions(cfn_client, deleted_stacks)
+
         # Done!
         print("Config has been removed.")
 
@@ -1471,25 +1874,15 @@ class rdk:
 
             return
 
-        for rule_name in rule_names:
-            try:
-                cfn_client.delete_stack(StackName=self.__get_stack_name_from_rule_name(rule_name))
-                deleted_stacks.append(self.__get_stack_name_from_rule_name(rule_name))
-            except ClientError as ce:
-                print(
-                    f"[{my_session.region_name}]: Client Error encountered attempting to delete CloudFormation stack for Rule: "
-                    + str(ce)
-                )
-            except Exception as e:
-                print(
-                    f"[{my_session.region_name}]: Exception encountered attempting to delete CloudFormation stack for Rule: "
-                    + str(e)
-                )
+        if self.args.aggregate:
+            stack_names = sorted(self.__get_aggregated_stacks(cfn_client, self.args.stack_name))
+        else:
+            stack_names = [self.__get_stack_name_from_rule_name(rule_name) for rule_name in rule_names]
+        deleted_stacks = self.__delete_cfn_stacks(cfn_client, stack_names)
 
         print(f"[{my_session.region_name}]: Rule removal initiated. Waiting for Stack Deletion to complete.")
 
-        for stack_name in deleted_stacks:
-            self.__wait_for_cfn_stack(cfn_client, stack_name)
+        self.__wait_for_cfn_stack_deletions(cfn_client, deleted_stacks)
 
         print(f"[{my_session.region_name}]: Rule removal complete, but local files have been preserved.")
         print(f"[{my_session.region_name}]: To re-deploy, use the 'deploy' command.")
@@ -1497,6 +1890,10 @@ class rdk:
     def undeploy_organization(self):
         self.__parse_deploy_args(ForceArgument=True)
 
+        if self.args.aggregate:
+            print("--aggregate is not supported for Organization Rules.")
+            sys.exit(1)
+
         if not self.args.force:
             confirmation = False
             while not confirmation:
@@ -1536,25 +1933,13 @@ class rdk:
 
             return
 
-        for rule_name in rule_names:
-            try:
-                cfn_client.delete_stack(StackName=self.__get_stack_name_from_rule_name(rule_name))
-                deleted_stacks.append(self.__get_stack_name_from_rule_name(rule_name))
-            except ClientError as ce:
-                print(
-                    f"[{my_session.region_name}]: Client Error encountered attempting to delete CloudFormation stack for Rule: "
-                    + str(ce)
-                )
-            except Exception as e:
-                print(
-                    f"[{my_session.region_name}]: Exception encountered attempting to delete CloudFormation stack for Rule: "
-                    + str(e)
-                )
+        deleted_stacks = self.__delete_cfn_stacks(
+            cfn_client, [self.__get_stack_name_from_rule_name(rule_name) for rule_name in rule_names]
+        )
 
         print(f"[{my_session.region_name}]: Rule removal initiated. Waiting for Stack Deletion to complete.")
 
-        for stack_name in deleted_stacks:
-            self.__wait_for_cfn_stack(cfn_client, stack_name)
+        self.__wait_for_cfn_stack_deletions(cfn_client, deleted_stacks)
 
         print(f"[{my_session.region_name}]: Rule removal complete, but local files have been preserved.")
         print(f"[{my_session.region_name}]: To re-deploy, use the 'deploy-organization' command.")
@@ -1580,10 +1965,15 @@ class rdk:
         else:
             code_bucket_name = code_bucket_prefix + account_id + "-" + my_session.region_name
 
+        self.__resolve_lambda_layers(my_session, rule_names)
+
+        if self.args.aggregate:
+            return self.__deploy_aggregated(rule_names, identity_details, code_bucket_name)
+
         # If we're only deploying the Lambda functions (and role + permissions), branch here.  Someday the "main" execution path should use the same generated CFN templates for single-account deployment.
         if self.args.functions_only:
             # Generate the template
-            function_template = self.__create_function_cloudformation_template()
+            function_template = self.__create_function_cloudformation_template(identity_details)
 
             # Generate CFN parameter json
             cfn_params = [
@@ -1594,11 +1984,8 @@ class rdk:
             ]
 
             # Write template to S3
-            my_s3_client = my_session.client("s3")
-            my_s3_client.put_object(
-                Body=bytes(function_template.encode("utf-8")),
-                Bucket=code_bucket_name,
-                Key=self.args.stack_name + ".json",
+            template_url = self.__upload_cloudformation_template(
+                my_session, code_bucket_name, self.args.stack_name, function_template
             )
 
             # Package code and push to S3
@@ -1615,22 +2002,9 @@ class rdk:
 
             my_cfn = my_session.client("cloudformation")
 
-            # Generate the template_url regardless of region using the s3 sdk
-            config = my_s3_client._client_config
-            config.signature_version = botocore.UNSIGNED
-            template_url = boto3.client("s3", config=config).generate_presigned_url(
-                "get_object",
-                ExpiresIn=0,
-                Params={
-                    "Bucket": code_bucket_name,
-                    "Key": self.args.stack_name + ".json",
-                },
-            )
-
             # Check if stack exists.  If it does, update it.  If it doesn't, create it.
 
-            try:
-                my_stack = my_cfn.describe_stacks(StackName=self.args.stack_name)
+            if self.__describe_cfn_stack(my_cfn, self.args.stack_name) is not None:
 
                 # If we've gotten here, stack exists and we should update it.
                 print(f"[{my_session.region_name}]: Updating CloudFormation Stack for Lambda functions.")
@@ -1676,17 +2050,11 @@ class rdk:
                         print(f"[{my_session.region_name}]: Skipping Lambda upload for Managed Rule.")
                         continue
 
-                    print(f"[{my_session.region_name}]: Publishing Lambda code...")
-                    my_lambda_client = my_session.client("lambda")
-                    my_lambda_client.update_function_code(
-                        FunctionName=my_lambda_arn,
-                        S3Bucket=code_bucket_name,
-                        S3Key=s3_code_objects[rule_name],
-                        Publish=True,
+                    self.__publish_function_code(
+                        rule_name, my_lambda_arn, my_session, code_bucket_name, s3_code_objects[rule_name]
                     )
-                    print(f"[{my_session.region_name}]: Lambda code updated.")
-            except ClientError:
-                # If we're in the exception, the stack does not exist and we should create it.
+            else:
+                # The stack does not exist, so we should create it.
                 print(f"[{my_session.region_name}]: Creating CloudFormation Stack for Lambda Functions.")
 
                 cfn_args = {
@@ -1709,308 +2077,94 @@ class rdk:
             sys.exit(0)
 
         # If we're deploying both the functions and the Config rules, run the following process:
-        for rule_name in rule_names:
-            rule_params, cfn_tags = self.__get_rule_parameters(rule_name)
+        if not self.args.plan:
+            self.__open_deploy_journal(my_session.region_name)
 
-            # create CFN Parameters common for Managed and Custom
-            source_events = "NONE"
-            if "SourceEvents" in rule_params:
-                source_events = rule_params["SourceEvents"]
+        if self.args.parallel > 1:
+            return_val = self.__deploy_rules_in_parallel(rule_names, account_id, partition, code_bucket_name)
+        else:
+            return_val = 0
+            for rule_name in rule_names:
+                return_val = self.__deploy_rule(rule_name, my_session, account_id, partition, code_bucket_name)
+                if return_val:
+                    break
 
-            source_periodic = "NONE"
-            if "SourcePeriodic" in rule_params:
-                source_periodic = rule_params["SourcePeriodic"]
+        if return_val:
+            return return_val
 
-            combined_input_parameters = {}
-            if "InputParameters" in rule_params:
-                combined_input_parameters.update(json.loads(rule_params["InputParameters"]))
+        if self.args.plan:
+            return self.__report_rule_plans(rule_names, my_session)
 
-            if "OptionalParameters" in rule_params:
-                # Remove empty parameters
-                keys_to_delete = []
-                optional_parameters_json = json.loads(rule_params["OptionalParameters"])
-                for key, value in optional_parameters_json.items():
-                    if not value:
-                        keys_to_delete.append(key)
-                for key in keys_to_delete:
-                    del optional_parameters_json[key]
-                combined_input_parameters.update(optional_parameters_json)
+        self.__close_deploy_journal()
+        print(f"[{my_session.region_name}]: Config deploy complete.")
 
-            if "SourceIdentifier" in rule_params:
-                print(f"[{my_session.region_name}]: Found Managed Rule.")
-                # create CFN Parameters for Managed Rules
+        return 0
 
-                try:
-                    rule_description = rule_params["Description"]
-                except KeyError:
-                    rule_description = rule_name
-                my_params = [
-                    {
-                        "ParameterKey": "RuleName",
-                        "ParameterValue": rule_name,
-                    },
-                    {
-                        "ParameterKey": "Description",
-                        "ParameterValue": rule_description,
-                    },
-                    {
-                        "ParameterKey": "SourceEvents",
-                        "ParameterValue": source_events,
-                    },
-                    {
-                        "ParameterKey": "SourcePeriodic",
-                        "ParameterValue": source_periodic,
-                    },
-                    {
-                        "ParameterKey": "SourceInputParameters",
-                        "ParameterValue": json.dumps(combined_input_parameters),
-                    },
-                    {
-                        "ParameterKey": "SourceIdentifier",
-                        "ParameterValue": rule_params["SourceIdentifier"],
-                    },
-                    {
-                        "ParameterKey": "EvaluationMode",
-                        "ParameterValue": rule_params.get("EvaluationMode", "DETECTIVE"),
-                    },
-                ]
-                my_cfn = my_session.client("cloudformation")
-                if "Remediation" in rule_params:
-                    print(f"[{my_session.region_name}]: Build The CFN Template with Remediation Settings")
-                    cfn_body = os.path.join(
-                        path.dirname(__file__),
-                        "template",
-                        "configManagedRuleWithRemediation.yaml",
-                    )
-                    template_body = open(cfn_body, "r").read()
-                    yaml_body = yaml.safe_load(template_body)
-                    remediation = self.__create_remediation_cloudformation_block(rule_params["Remediation"])
-                    yaml_body["Resources"]["Remediation"] = remediation
-
-                    if "SSMAutomation" in rule_params:
-                        # Reference the SSM Automation Role Created, if IAM is created
-                        print(f"[{my_session.region_name}]: Building SSM Automation Section")
-                        ssm_automation = self.__create_automation_cloudformation_block(
-                            rule_params["SSMAutomation"],
-                            self.__get_alphanumeric_rule_name(rule_name),
-                        )
-                        yaml_body["Resources"][
-                            self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")
-                        ] = ssm_automation
-                        if "IAM" in rule_params["SSMAutomation"]:
-                            print(f"[{my_session.region_name}]: Lets Build IAM Role and Policy")
-                            # TODO Check For IAM Settings
-                            yaml_body["Resources"]["Remediation"]["Properties"]["Parameters"]["AutomationAssumeRole"][
-                                "StaticValue"
-                            ]["Values"] = [
-                                {
-                                    "Fn::GetAtt": [
-                                        self.__get_alphanumeric_rule_name(rule_name + "Role"),
-                                        "Arn",
-                                    ]
-                                }
-                            ]
-
-                            (
-                                ssm_iam_role,
-                                ssm_iam_policy,
-                            ) = self.__create_automation_iam_cloudformation_block(
-                                rule_params["SSMAutomation"],
-                                self.__get_alphanumeric_rule_name(rule_name),
-                            )
-                            yaml_body["Resources"][self.__get_alphanumeric_rule_name(rule_name + "Role")] = ssm_iam_role
-                            yaml_body["Resources"][
-                                self.__get_alphanumeric_rule_name(rule_name + "Policy")
-                            ] = ssm_iam_policy
-
-                            print(f"[{my_session.region_name}]: Build Supporting SSM Resources")
-                            resource_depends_on = [
-                                "rdkConfigRule",
-                                self.__get_alphanumeric_rule_name(rule_name + "RemediationAction"),
-                            ]
-                            # Builds SSM Document Before Config RUle
-                            yaml_body["Resources"]["Remediation"]["DependsOn"] = resource_depends_on
-                            yaml_body["Resources"]["Remediation"]["Properties"]["TargetId"] = {
-                                "Ref": self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")
-                            }
-
-                    try:
-                        my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
-                        my_stack = my_cfn.describe_stacks(StackName=my_stack_name)
-                        # If we've gotten here, stack exists and we should update it.
-                        print(f"[{my_session.region_name}]: Updating CloudFormation Stack for " + rule_name)
-                        try:
-                            cfn_args = {
-                                "StackName": my_stack_name,
-                                "TemplateBody": json.dumps(yaml_body, indent=2),
-                                "Parameters": my_params,
-                                "Capabilities": [
-                                    "CAPABILITY_IAM",
-                                    "CAPABILITY_NAMED_IAM",
-                                ],
-                            }
-
-                            # If no tags key is specified, or if the tags dict is empty
-                            if cfn_tags is not None:
-                                cfn_args["Tags"] = cfn_tags
-
-                            response = my_cfn.update_stack(**cfn_args)
-                        except ClientError as e:
-                            if e.response["Error"]["Code"] == "ValidationError":
-                                if "No updates are to be performed." in str(e):
-                                    # No changes made to Config rule definition, so CloudFormation won't do anything.
-                                    print(f"[{my_session.region_name}]: No changes to Config Rule.")
-                                else:
-                                    # Something unexpected has gone wrong.  Emit an error and bail.
-                                    print(f"[{my_session.region_name}]: {e}")
-                                    return 1
-                            else:
-                                raise
-                    except ClientError:
-                        # If we're in the exception, the stack does not exist and we should create it.
-                        print(f"[{my_session.region_name}]: Creating CloudFormation Stack for " + rule_name)
-
-                        if "Remediation" in rule_params:
-                            cfn_args = {
-                                "StackName": my_stack_name,
-                                "TemplateBody": json.dumps(yaml_body, indent=2),
-                                "Parameters": my_params,
-                                "Capabilities": [
-                                    "CAPABILITY_IAM",
-                                    "CAPABILITY_NAMED_IAM",
-                                ],
-                            }
-
-                        else:
-                            cfn_args = {
-                                "StackName": my_stack_name,
-                                "TemplateBody": open(cfn_body, "r").read(),
-                                "Parameters": my_params,
-                            }
-
-                        if cfn_tags is not None:
-                            cfn_args["Tags"] = cfn_tags
-
-                        response = my_cfn.create_stack(**cfn_args)
-
-                    # wait for changes to propagate.
-                    self.__wait_for_cfn_stack(my_cfn, my_stack_name)
-                    continue
-
-                else:
-                    # deploy config rule
-                    cfn_body = os.path.join(path.dirname(__file__), "template", "configManagedRule.yaml")
-
-                    try:
-                        my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
-                        my_stack = my_cfn.describe_stacks(StackName=my_stack_name)
-                        # If we've gotten here, stack exists and we should update it.
-                        print(f"[{my_session.region_name}]: Updating CloudFormation Stack for " + rule_name)
-                        try:
-                            cfn_args = {
-                                "StackName": my_stack_name,
-                                "TemplateBody": open(cfn_body, "r").read(),
-                                "Parameters": my_params,
-                            }
-
-                            # If no tags key is specified, or if the tags dict is empty
-                            if cfn_tags is not None:
-                                cfn_args["Tags"] = cfn_tags
-
-                            response = my_cfn.update_stack(**cfn_args)
-                        except ClientError as e:
-                            if e.response["Error"]["Code"] == "ValidationError":
-                                if "No updates are to be performed." in str(e):
-                                    # No changes made to Config rule definition, so CloudFormation won't do anything.
-                                    print(f"[{my_session.region_name}]: No changes to Config Rule.")
-                                else:
-                                    # Something unexpected has gone wrong.  Emit an error and bail.
-                                    print(f"[{my_session.region_name}]:  {e}")
-                                    return 1
-                            else:
-                                raise
-                    except ClientError as e:
-                        # If we're in the exception, the stack does not exist and we should create it.
-                        print(f"[{my_session.region_name}]: Creating CloudFormation Stack for " + rule_name)
-                        cfn_args = {
-                            "StackName": my_stack_name,
-                            "TemplateBody": open(cfn_body, "r").read(),
-                            "Parameters": my_params,
-                        }
-
-                        if cfn_tags is not None:
-                            cfn_args["Tags"] = cfn_tags
-
-                        response = my_cfn.create_stack(**cfn_args)
-
-                    # wait for changes to propagate.
-                    self.__wait_for_cfn_stack(my_cfn, my_stack_name)
-
-                # Cloudformation is not supporting tagging config rule currently.
-                if cfn_tags is not None and len(cfn_tags) > 0:
-                    self.__tag_config_rule(rule_name, cfn_tags, my_session)
-
-                continue
-
-            print(f"[{my_session.region_name}]: Found Custom Rule.")
-
-            s3_src = ""
-            s3_dst = self.__upload_function_code(rule_name, rule_params, account_id, my_session, code_bucket_name)
-
-            # create CFN Parameters for Custom Rules
-            lambdaRoleArn = ""
-            if self.args.lambda_role_arn:
-                print(f"[{my_session.region_name}]: Existing IAM Role provided: " + self.args.lambda_role_arn)
-                lambdaRoleArn = self.args.lambda_role_arn
-            elif self.args.lambda_role_name:
-                print(f"[{my_session.region_name}]: Building IAM Role ARN from Name: " + self.args.lambda_role_name)
-                arn = f"arn:{partition}:iam::{account_id}:role/{self.args.lambda_role_name}"
-                lambdaRoleArn = arn
+    def __deploy_rule(self, rule_name, my_session, account_id, partition, code_bucket_name):
+        start_time = time.time()
+        self.rule_results[rule_name] = {"Status": "Failed", "Duration": 0.0}
+        try:
+            resumed_phases = self.__start_deploy_journal_entry(rule_name)
+            if "Complete" in resumed_phases:
+                print(f"[{my_session.region_name}]: {rule_name} was deployed before the last run stopped. Skipping.")
+                self.rule_results[rule_name]["Status"] = "Skipped"
+                return 0
 
-            if self.args.boundary_policy_arn:
-                print(f"[{my_session.region_name}]: Boundary Policy provided: " + self.args.boundary_policy_arn)
-                boundaryPolicyArn = self.args.boundary_policy_arn
-            else:
-                boundaryPolicyArn = ""
+            return_val = self.__deploy_rule_phases(
+                rule_name, my_session, account_id, partition, code_bucket_name, resumed_phases
+            )
+            if not return_val:
+                self.__record_deploy_phases(rule_name, "Complete")
+                self.rule_results[rule_name]["Status"] = "Planned" if self.args.plan else "Deployed"
+
+            return return_val
+        finally:
+            self.rule_results[rule_name]["Duration"] = time.time() - start_time
+
+    def __deploy_rule_phases(self, rule_name, my_session, account_id, partition, code_bucket_name, resumed_phases):
+        rule_params, cfn_tags = self.__get_rule_parameters(rule_name)
+
+        # create CFN Parameters common for Managed and Custom
+        source_events = "NONE"
+        if "SourceEvents" in rule_params:
+            source_events = rule_params["SourceEvents"]
+
+        source_periodic = "NONE"
+        if "SourcePeriodic" in rule_params:
+            source_periodic = rule_params["SourcePeriodic"]
+
+        combined_input_parameters = {}
+        if "InputParameters" in rule_params:
+            combined_input_parameters.update(json.loads(rule_params["InputParameters"]))
+
+        if "OptionalParameters" in rule_params:
+            # Remove empty parameters
+            keys_to_delete = []
+            optional_parameters_json = json.loads(rule_params["OptionalParameters"])
+            for key, value in optional_parameters_json.items():
+                if not value:
+                    keys_to_delete.append(key)
+            for key in keys_to_delete:
+                del optional_parameters_json[key]
+            combined_input_parameters.update(optional_parameters_json)
+
+        if "SourceIdentifier" in rule_params:
+            print(f"[{my_session.region_name}]: Found Managed Rule.")
+            # create CFN Parameters for Managed Rules
 
             try:
                 rule_description = rule_params["Description"]
             except KeyError:
                 rule_description = rule_name
-
             my_params = [
                 {
                     "ParameterKey": "RuleName",
                     "ParameterValue": rule_name,
                 },
-                {
-                    "ParameterKey": "RuleLambdaName",
-                    "ParameterValue": self.__get_lambda_name(rule_name, rule_params),
-                },
                 {
                     "ParameterKey": "Description",
                     "ParameterValue": rule_description,
                 },
-                {
-                    "ParameterKey": "LambdaRoleArn",
-                    "ParameterValue": lambdaRoleArn,
-                },
-                {
-                    "ParameterKey": "BoundaryPolicyArn",
-                    "ParameterValue": boundaryPolicyArn,
-                },
-                {
-                    "ParameterKey": "SourceBucket",
-                    "ParameterValue": code_bucket_name,
-                },
-                # {
-                #     "ParameterKey": "SourcePath",
-                #     "ParameterValue": s3_dst,
-                # },
-                {
-                    "ParameterKey": "SourceRuntime",
-                    "ParameterValue": self.__get_runtime_string(rule_params),
-                },
                 {
                     "ParameterKey": "SourceEvents",
                     "ParameterValue": source_events,
@@ -2024,165 +2178,978 @@ class rdk:
                     "ParameterValue": json.dumps(combined_input_parameters),
                 },
                 {
-                    "ParameterKey": "SourceHandler",
-                    "ParameterValue": self.__get_handler(rule_name, rule_params),
-                },
-                {
-                    "ParameterKey": "Timeout",
-                    "ParameterValue": str(self.args.lambda_timeout),
+                    "ParameterKey": "SourceIdentifier",
+                    "ParameterValue": rule_params["SourceIdentifier"],
                 },
                 {
                     "ParameterKey": "EvaluationMode",
                     "ParameterValue": rule_params.get("EvaluationMode", "DETECTIVE"),
                 },
             ]
-            layers = self.__get_lambda_layers(my_session, self.args, rule_params)
+            my_cfn = my_session.client("cloudformation")
+            if "Remediation" in rule_params:
+                print(f"[{my_session.region_name}]: Build The CFN Template with Remediation Settings")
+                cfn_body = os.path.join(
+                    path.dirname(__file__),
+                    "template",
+                    "configManagedRuleWithRemediation.yaml",
+                )
+                template_body = open(cfn_body, "r").read()
+                yaml_body = yaml.safe_load(template_body)
+                remediation = self.__create_remediation_cloudformation_block(rule_params["Remediation"])
+                yaml_body["Resources"]["Remediation"] = remediation
+
+                if "SSMAutomation" in rule_params:
+                    # Reference the SSM Automation Role Created, if IAM is created
+                    print(f"[{my_session.region_name}]: Building SSM Automation Section")
+                    ssm_automation = self.__create_automation_cloudformation_block(
+                        rule_params["SSMAutomation"],
+                        self.__get_alphanumeric_rule_name(rule_name),
+                    )
+                    yaml_body["Resources"][
+                        self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")
+                    ] = ssm_automation
+                    if "IAM" in rule_params["SSMAutomation"]:
+                        print(f"[{my_session.region_name}]: Lets Build IAM Role and Policy")
+                        # TODO Check For IAM Settings
+                        yaml_body["Resources"]["Remediation"]["Properties"]["Parameters"]["AutomationAssumeRole"][
+                            "StaticValue"
+                        ]["Values"] = [
+                            {
+                                "Fn::GetAtt": [
+                                    self.__get_alphanumeric_rule_name(rule_name + "Role"),
+                                    "Arn",
+                                ]
+                            }
+                        ]
+
+                        (
+                            ssm_iam_role,
+                            ssm_iam_policy,
+                        ) = self.__create_automation_iam_cloudformation_block(
+                            rule_params["SSMAutomation"],
+                            self.__get_alphanumeric_rule_name(rule_name),
+                        )
+                        yaml_body["Resources"][self.__get_alphanumeric_rule_name(rule_name + "Role")] = ssm_iam_role
+                        yaml_body["Resources"][self.__get_alphanumeric_rule_name(rule_name + "Policy")] = ssm_iam_policy
+
+                        print(f"[{my_session.region_name}]: Build Supporting SSM Resources")
+                        resource_depends_on = [
+                            "rdkConfigRule",
+                            self.__get_alphanumeric_rule_name(rule_name + "RemediationAction"),
+                        ]
+                        # Builds SSM Document Before Config RUle
+                        yaml_body["Resources"]["Remediation"]["DependsOn"] = resource_depends_on
+                        yaml_body["Resources"]["Remediation"]["Properties"]["TargetId"] = {
+                            "Ref": self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")
+                        }
+
+                my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
+                cfn_args = {
+                    "StackName": my_stack_name,
+                    "TemplateBody": json.dumps(yaml_body, indent=2),
+                    "Parameters": my_params,
+                    "Capabilities": [
+                        "CAPABILITY_IAM",
+                        "CAPABILITY_NAMED_IAM",
+                    ],
+                }
+
+                # If no tags key is specified, or if the tags dict is empty
+                if cfn_tags is not None:
+                    cfn_args["Tags"] = cfn_tags
+
+                if self.__deploy_journaled_rule_stack(rule_name, my_cfn, cfn_args, resumed_phases) == "FAILED":
+                    return 1
+                if self.args.plan:
+                    return 0
+
+                # wait for changes to propagate.
+                return self.__wait_for_rule_stack(rule_name, my_cfn, my_stack_name)
+
+            else:
+                # deploy config rule
+                cfn_body = os.path.join(path.dirname(__file__), "template", "configManagedRule.yaml")
+
+                my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
+                cfn_args = {
+                    "StackName": my_stack_name,
+                    "TemplateBody": open(cfn_body, "r").read(),
+                    "Parameters": my_params,
+                }
 
+                # If no tags key is specified, or if the tags dict is empty
+                if cfn_tags is not None:
+                    cfn_args["Tags"] = cfn_tags
+
+                if self.__deploy_journaled_rule_stack(rule_name, my_cfn, cfn_args, resumed_phases) == "FAILED":
+                    return 1
+                if self.args.plan:
+                    return 0
+
+                # wait for changes to propagate.
+                if self.__wait_for_rule_stack(rule_name, my_cfn, my_stack_name):
+                    return 1
+
+            # Cloudformation is not supporting tagging config rule currently.
+            if cfn_tags is not None and len(cfn_tags) > 0:
+                self.__tag_config_rule(rule_name, cfn_tags, my_session)
+
+            return 0
+
+        print(f"[{my_session.region_name}]: Found Custom Rule.")
+
+        s3_src = ""
+        if self.args.plan:
+            # Nothing is uploaded while planning, but the package is built so the plan can report code changes.
+            self.__build_function_package(rule_name, rule_params, my_session.region_name)
+            s3_dst = None
+        elif "Uploaded" in resumed_phases:
+            print(
+                f"[{my_session.region_name}]: {rule_name} code was uploaded before the last run stopped. Skipping upload."
+            )
+            s3_dst = "/".join((rule_name, rule_name + ".zip"))
+        else:
+            s3_dst = self.__upload_function_code(rule_name, rule_params, account_id, my_session, code_bucket_name)
+            self.__record_deploy_phases(rule_name, "Packaged", "Uploaded")
+
+        # create CFN Parameters for Custom Rules
+        lambdaRoleArn = ""
+        if self.args.lambda_role_arn:
+            print(f"[{my_session.region_name}]: Existing IAM Role provided: " + self.args.lambda_role_arn)
+            lambdaRoleArn = self.args.lambda_role_arn
+        elif self.args.lambda_role_name:
+            print(f"[{my_session.region_name}]: Building IAM Role ARN from Name: " + self.args.lambda_role_name)
+            arn = f"arn:{partition}:iam::{account_id}:role/{self.args.lambda_role_name}"
+            lambdaRoleArn = arn
+
+        if self.args.boundary_policy_arn:
+            print(f"[{my_session.region_name}]: Boundary Policy provided: " + self.args.boundary_policy_arn)
+            boundaryPolicyArn = self.args.boundary_policy_arn
+        else:
+            boundaryPolicyArn = ""
+
+        try:
+            rule_description = rule_params["Description"]
+        except KeyError:
+            rule_description = rule_name
+
+        my_params = [
+            {
+                "ParameterKey": "RuleName",
+                "ParameterValue": rule_name,
+            },
+            {
+                "ParameterKey": "RuleLambdaName",
+                "ParameterValue": self.__get_lambda_name(rule_name, rule_params),
+            },
+            {
+                "ParameterKey": "Description",
+                "ParameterValue": rule_description,
+            },
+            {
+                "ParameterKey": "LambdaRoleArn",
+                "ParameterValue": lambdaRoleArn,
+            },
+            {
+                "ParameterKey": "BoundaryPolicyArn",
+                "ParameterValue": boundaryPolicyArn,
+            },
+            {
+                "ParameterKey": "SourceBucket",
+                "ParameterValue": code_bucket_name,
+            },
+            # {
+            #     "ParameterKey": "SourcePath",
+            #     "ParameterValue": s3_dst,
+            # },
+            {
+                "ParameterKey": "SourceRuntime",
+                "ParameterValue": self.__get_runtime_string(rule_params),
+            },
+            {
+                "ParameterKey": "SourceEvents",
+                "ParameterValue": source_events,
+            },
+            {
+                "ParameterKey": "SourcePeriodic",
+                "ParameterValue": source_periodic,
+            },
+            {
+                "ParameterKey": "SourceInputParameters",
+                "ParameterValue": json.dumps(combined_input_parameters),
+            },
+            {
+                "ParameterKey": "SourceHandler",
+                "ParameterValue": self.__get_handler(rule_name, rule_params),
+            },
+            {
+                "ParameterKey": "Timeout",
+                "ParameterValue": str(self.args.lambda_timeout),
+            },
+            {
+                "ParameterKey": "EvaluationMode",
+                "ParameterValue": rule_params.get("EvaluationMode", "DETECTIVE"),
+            },
+        ]
+        layers = self.__get_lambda_layers(my_session, self.args, rule_params)
+
+        if self.args.lambda_layers:
+            additional_layers = self.args.lambda_layers.split(",")
+            layers.extend(additional_layers)
+
+        if layers:
+            my_params.append({"ParameterKey": "Layers", "ParameterValue": ",".join(layers)})
+
+        if self.args.lambda_security_groups and self.args.lambda_subnets:
+            my_params.append(
+                {
+                    "ParameterKey": "SecurityGroupIds",
+                    "ParameterValue": self.args.lambda_security_groups,
+                }
+            )
+            my_params.append(
+                {
+                    "ParameterKey": "SubnetIds",
+                    "ParameterValue": self.args.lambda_subnets,
+                }
+            )
+
+        # create json of CFN template
+        cfn_body = os.path.join(path.dirname(__file__), "template", "configRule.yaml")
+        template_body = open(cfn_body, "r").read()
+        yaml_body = yaml.safe_load(template_body)
+
+        remediation = ""
+        if "Remediation" in rule_params:
+            remediation = self.__create_remediation_cloudformation_block(rule_params["Remediation"])
+            yaml_body["Resources"]["Remediation"] = remediation
+
+            if "SSMAutomation" in rule_params:
+                ##AWS needs to build the SSM before the Config Rule
+                resource_depends_on = [
+                    "rdkConfigRule",
+                    self.__get_alphanumeric_rule_name(rule_name + "RemediationAction"),
+                ]
+                remediation["DependsOn"] = resource_depends_on
+                # Add JSON Reference to SSM Document { "Ref" : "MyEC2Instance" }
+                remediation["Properties"]["TargetId"] = {
+                    "Ref": self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")
+                }
+
+        if "SSMAutomation" in rule_params:
+            print(f"[{my_session.region_name}]: Building SSM Automation Section")
+
+            ssm_automation = self.__create_automation_cloudformation_block(rule_params["SSMAutomation"], rule_name)
+            yaml_body["Resources"][self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")] = ssm_automation
+            if "IAM" in rule_params["SSMAutomation"]:
+                print("Lets Build IAM Role and Policy")
+                # TODO Check For IAM Settings
+                yaml_body["Resources"]["Remediation"]["Properties"]["Parameters"]["AutomationAssumeRole"][
+                    "StaticValue"
+                ]["Values"] = [
+                    {
+                        "Fn::GetAtt": [
+                            self.__get_alphanumeric_rule_name(rule_name + "Role"),
+                            "Arn",
+                        ]
+                    }
+                ]
+
+                (
+                    ssm_iam_role,
+                    ssm_iam_policy,
+                ) = self.__create_automation_iam_cloudformation_block(rule_params["SSMAutomation"], rule_name)
+                yaml_body["Resources"][self.__get_alphanumeric_rule_name(rule_name + "Role")] = ssm_iam_role
+                yaml_body["Resources"][self.__get_alphanumeric_rule_name(rule_name + "Policy")] = ssm_iam_policy
+
+        # debugging
+        # print(json.dumps(json_body, indent=2))
+
+        # deploy config rule
+        my_cfn = my_session.client("cloudformation")
+        my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
+        cfn_args = {
+            "StackName": my_stack_name,
+            "TemplateBody": json.dumps(yaml_body, indent=2),
+            "Parameters": my_params,
+            "Capabilities": ["CAPABILITY_IAM", "CAPABILITY_NAMED_IAM"],
+        }
+
+        # If no tags key is specified, or if the tags dict is empty
+        if cfn_tags is not None:
+            cfn_args["Tags"] = cfn_tags
+
+        stack_operation = self.__deploy_journaled_rule_stack(rule_name, my_cfn, cfn_args, resumed_phases)
+        if stack_operation == "FAILED":
+            return 1
+
+        if self.args.plan:
+            my_lambda_arn = self.__get_lambda_arn_for_rule(
+                rule_name, partition, my_session.region_name, account_id, rule_params
+            )
+            self.__rule_plans[rule_name]["CodeChanged"] = not self.__is_function_code_current(
+                rule_name, my_lambda_arn, my_session
+            )
+            return 0
+
+        # A new stack creates the function with the uploaded code.  Otherwise, since CFN won't detect changes to the
+        # lambda code stored in S3 as a reason to update the stack, publish it once the stack is done.
+        if stack_operation != "CREATE":
+            my_lambda_arn = self.__get_lambda_arn_for_stack(my_stack_name)
+            self.__publish_function_code(rule_name, my_lambda_arn, my_session, code_bucket_name, s3_dst)
+            self.__record_deploy_phases(rule_name, "CodePublished")
+
+        # wait for changes to propagate.
+        if self.__wait_for_rule_stack(rule_name, my_cfn, my_stack_name):
+            return 1
+
+        # Cloudformation is not supporting tagging config rule currently.
+        if cfn_tags is not None and len(cfn_tags) > 0:
+            self.__tag_config_rule(rule_name, cfn_tags, my_session)
+
+        return 0
+
+    def __deploy_journaled_rule_stack(self, rule_name, my_cfn, cfn_args, resumed_phases):
+        if "StackSubmitted" in resumed_phases:
+            # Whatever the stopped run submitted has either finished or is still running; either way, just wait on it.
+            print(
+                f"[{my_cfn.meta.region_name}]: CloudFormation Stack for {rule_name} was submitted before the last run stopped."
+            )
+            return "RESUMED"
+
+        stack_operation = self.__deploy_rule_stack(rule_name, my_cfn, cfn_args)
+        if stack_operation != "FAILED" and not self.args.plan:
+            self.__record_deploy_phases(rule_name, "StackSubmitted")
+        return stack_operation
+
+    def __wait_for_rule_stack(self, rule_name, my_cfn, my_stack_name):
+        # Returns 1 if the Rule's stack failed or rolled back.  The journal then forgets that the stack was submitted,
+        # so that --resume submits it again instead of skipping the Rule.
+        stack_status = self.__wait_for_cfn_stack(my_cfn, my_stack_name)
+        if _is_failed_stack_status(stack_status):
+            print(f"[{my_cfn.meta.region_name}]: Deploy failed for {rule_name} ({stack_status}).")
+            self.__forget_deploy_phases(rule_name, "StackSubmitted")
+            return 1
+
+        self.__record_deploy_phases(rule_name, "StackComplete")
+        return 0
+
+    def __get_deploy_journal_path(self, region):
+        return os.path.join(os.getcwd(), rdk_dir, "journal", "deploy-" + region + ".json")
+
+    def __open_deploy_journal(self, region):
+        # The journal records which phases of each Rule's deploy have finished, so that --resume can pick up an
+        # interrupted deploy where it stopped.  Each region has its own, since regions deploy in separate processes.
+        journal_path = self.__get_deploy_journal_path(region)
+        self.__journal = {"Path": journal_path, "Rules": {}}
+        if not self.args.resume:
+            return
+
+        try:
+            with open(journal_path, "r") as journal_file:
+                self.__journal["Rules"] = json.load(journal_file)["Rules"]
+            print(f"[{region}]: Resuming the deploy recorded in {journal_path}.")
+        except (OSError, ValueError, KeyError):
+            print(f"[{region}]: No interrupted deploy found to resume. Deploying all selected Rules.")
+
+    def __close_deploy_journal(self):
+        # Only a deploy that finished completely removes its journal.
+        try:
+            os.remove(self.__journal["Path"])
+        except OSError:
+            pass
+        self.__journal = None
+
+    def __get_deploy_fingerprint(self, rule_name, rule_params, cfn_tags):
+        # Anything that changes what would be deployed for the Rule invalidates the phases recorded for it.
+        fingerprint = {
+            "Parameters": rule_params,
+            "Tags": cfn_tags,
+            "Options": {
+                option: getattr(self.args, option, None)
+                for option in [
+                    "custom_code_bucket",
+                    "rdklib_layer_arn",
+                    "lambda_role_arn",
+                    "lambda_role_name",
+                    "lambda_layers",
+                    "lambda_subnets",
+                    "lambda_security_groups",
+                    "lambda_timeout",
+                    "boundary_policy_arn",
+                    "generated_lambda_layer",
+                    "custom_layer_name",
+                    "apply",
+                ]
+            },
+        }
+        if "SourceIdentifier" not in rule_params:
+            fingerprint["Code"] = self.__get_rule_content_hash(rule_name, rule_params)
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def __start_deploy_journal_entry(self, rule_name):
+        # Returns the phases that an interrupted deploy already finished for the Rule, if it hasn't changed since.
+        if self.__journal is None:
+            return []
+
+        rule_params, cfn_tags = self.__get_rule_parameters(rule_name)
+        fingerprint = self.__get_deploy_fingerprint(rule_name, rule_params, cfn_tags)
+        with self.__journal_lock:
+            entry = self.__journal["Rules"].get(rule_name, {})
+            if entry.get("Fingerprint") != fingerprint:
+                entry = {"Fingerprint": fingerprint, "Phases": []}
+                self.__journal["Rules"][rule_name] = entry
+            return list(entry["Phases"])
+
+    def __record_deploy_phases(self, rule_name, *phases):
+        if self.__journal is None:
+            return
+
+        with self.__journal_lock:
+            entry = self.__journal["Rules"][rule_name]
+            entry["Phases"].extend(phase for phase in phases if phase not in entry["Phases"])
+            self.__write_deploy_journal()
+
+    def __forget_deploy_phases(self, rule_name, *phases):
+        if self.__journal is None:
+            return
+
+        with self.__journal_lock:
+            entry = self.__journal["Rules"][rule_name]
+            entry["Phases"] = [phase for phase in entry["Phases"] if phase not in phases]
+            self.__write_deploy_journal()
+
+    def __write_deploy_journal(self):
+        # Write then rename, so that a deploy killed mid-write never leaves a corrupt journal behind.
+        journal_path = self.__journal["Path"]
+        os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+        tmp_path = journal_path + "." + str(uuid.uuid4())
+        with open(tmp_path, "w") as journal_file:
+            json.dump({"Rules": self.__journal["Rules"]}, journal_file, indent=2)
+        os.replace(tmp_path, journal_path)
+
+    def __upload_cloudformation_template(self, my_session, code_bucket_name, stack_name, template_body):
+        my_s3_client = my_session.client("s3")
+        my_s3_client.put_object(
+            Body=bytes(template_body.encode("utf-8")),
+            Bucket=code_bucket_name,
+            Key=stack_name + ".json",
+        )
+
+        # Generate the template_url regardless of region using the s3 sdk
+        # Merge rather than modify, the S3 client is shared with the rest of the deploy.
+        config = my_s3_client._client_config.merge(botocore.config.Config(signature_version=botocore.UNSIGNED))
+        return boto3.client("s3", config=config).generate_presigned_url(
+            "get_object",
+            ExpiresIn=0,
+            Params={
+                "Bucket": code_bucket_name,
+                "Key": stack_name + ".json",
+            },
+        )
+
+    def __deploy_aggregated(self, rule_names, identity_details, code_bucket_name):
+        start_time = time.time()
+        for rule_name in rule_names:
+            self.rule_results[rule_name] = {"Status": "Failed", "Duration": 0.0}
+        my_session = self.__get_boto_session()
+        region = my_session.region_name
+        account_id = identity_details["account_id"]
+        partition = identity_details["partition"]
+        my_cfn = my_session.client("cloudformation")
+
+        lambda_role_arn = ""
+        if self.args.lambda_role_arn:
+            lambda_role_arn = self.args.lambda_role_arn
+        elif self.args.lambda_role_name:
+            lambda_role_arn = f"arn:{partition}:iam::{account_id}:role/{self.args.lambda_role_name}"
+
+        # Package code and push to S3, and build each Rule's resources up front so that they can be sharded.
+        s3_code_objects = {}
+        rule_resources = {}
+        for rule_name in rule_names:
+            rule_params, cfn_tags = self.__get_rule_parameters(rule_name)
+            if "SourceIdentifier" in rule_params:
+                print(f"[{region}]: Skipping code packaging for Managed Rule {rule_name}.")
+            else:
+                s3_code_objects[rule_name] = self.__upload_function_code(
+                    rule_name, rule_params, account_id, my_session, code_bucket_name
+                )
+            rule_resources[rule_name] = self.__create_aggregated_rule_resources(
+                rule_name, rule_params, lambda_role_arn, my_session
+            )
+
+        # Every stack shares the same parameters and, unless a role was given, its own Lambda execution role.
+        base_template = json.loads(self.__create_function_cloudformation_template(identity_details, rule_names=[]))
+        base_template["Parameters"]["LambdaAccountId"] = {
+            "Description": "Account ID that contains Lambda functions for Config Rules.",
+            "Type": "String",
+        }
+        if self.args.boundary_policy_arn and "rdkLambdaRole" in base_template["Resources"]:
+            base_template["Resources"]["rdkLambdaRole"]["Properties"][
+                "PermissionsBoundary"
+            ] = self.args.boundary_policy_arn
+
+        existing_stacks = self.__get_aggregated_stacks(my_cfn, self.args.stack_name)
+        stacks = self.__assign_aggregated_stacks(rule_names, rule_resources, base_template, existing_stacks)
+        print(f"[{region}]: Deploying {len(rule_names)} Rules in {len(stacks)} CloudFormation stacks.")
+
+        # A Rule can only be created in its new stack once it has been removed from its old one, so stacks gaining
+        # Rules from another stack are deployed in a second pass.  Stacks left without any Rules are deleted.
+        previous_stacks = {}
+        for stack_name, stack_rules in existing_stacks.items():
+            for rule_name in stack_rules:
+                previous_stacks[rule_name] = stack_name
+        second_pass = [
+            stack_name
+            for stack_name, stack_rules in stacks.items()
+            if any(previous_stacks.get(rule_name, stack_name) != stack_name for rule_name in stack_rules)
+        ]
+        first_pass = [stack_name for stack_name in stacks if stack_name not in second_pass]
+        deleted_stacks = [stack_name for stack_name in existing_stacks if stack_name not in stacks]
+
+        failed_stacks = []
+        for stack_batch in [first_pass, second_pass]:
+            started_stacks = []
+            for stack_name in stack_batch:
+                template = copy.deepcopy(base_template)
+                template["Metadata"] = {aggregated_rules_metadata_key: stacks[stack_name]}
+                for rule_name in stacks[stack_name]:
+                    template["Resources"].update(rule_resources[rule_name])
+
+                template_url = self.__upload_cloudformation_template(
+                    my_session, code_bucket_name, stack_name, json.dumps(template, indent=2)
+                )
+                cfn_args = {
+                    "StackName": stack_name,
+                    "TemplateURL": template_url,
+                    "Parameters": [
+                        {"ParameterKey": "SourceBucket", "ParameterValue": code_bucket_name},
+                        {"ParameterKey": "LambdaAccountId", "ParameterValue": account_id},
+                    ],
+                    "Capabilities": ["CAPABILITY_IAM", "CAPABILITY_NAMED_IAM"],
+                }
+                stack_operation = self.__deploy_rule_stack(stack_name, my_cfn, cfn_args)
+                if stack_operation == "FAILED":
+                    failed_stacks.append(stack_name)
+                elif stack_operation:
+                    started_stacks.append(stack_name)
+
+            if stack_batch is first_pass:
+                for stack_name in deleted_stacks:
+                    print(f"[{region}]: Deleting CloudFormation Stack {stack_name}, which no longer holds any Rules.")
+                    my_cfn.delete_stack(StackName=stack_name)
+                    started_stacks.append(stack_name)
+
+            final_statuses = self.__wait_for_cfn_stacks(my_cfn, started_stacks)
+            for stack_name, stack_status in final_statuses.items():
+                if _is_failed_stack_status(stack_status):
+                    failed_stacks.append(stack_name)
+
+        # Since CFN won't detect changes to the lambda code stored in S3 as a reason to update the stack,
+        # publish any new code once the stacks are done.  Config Rule tags aren't supported by CloudFormation either.
+        for stack_name, stack_rules in stacks.items():
+            if stack_name in failed_stacks:
+                continue
+            for rule_name in stack_rules:
+                self.rule_results[rule_name]["Status"] = "Deployed"
+                rule_params, cfn_tags = self.__get_rule_parameters(rule_name)
+                if rule_name in s3_code_objects:
+                    my_lambda_arn = self.__get_lambda_arn_for_rule(
+                        rule_name, partition, region, account_id, rule_params
+                    )
+                    self.__publish_function_code(
+                        rule_name, my_lambda_arn, my_session, code_bucket_name, s3_code_objects[rule_name]
+                    )
+                if cfn_tags is not None and len(cfn_tags) > 0:
+                    self.__tag_config_rule(rule_name, cfn_tags, my_session)
+
+        # The Rules of a stack are deployed together, so each one is reported with the time the whole deploy took.
+        for rule_name in rule_names:
+            self.rule_results[rule_name]["Duration"] = time.time() - start_time
+
+        if failed_stacks:
+            print(
+                f"[{region}]: Deploy failed for {len(failed_stacks)} CloudFormation stacks: "
+                + ", ".join(sorted(failed_stacks))
+            )
+            return 1
+
+        print(f"[{region}]: Config deploy complete.")
+
+        return 0
+
+    def __create_aggregated_rule_resources(self, rule_name, rule_params, lambda_role_arn, my_session):
+        # A Rule's Lambda function and Config Rule for an aggregated stack.  Input parameter values are written into
+        # the Config Rule rather than passed as template Parameters, which are limited to 200 per stack.
+        resources = {}
+        if "SourceIdentifier" not in rule_params:
+            resources.update(self.__create_function_cloudformation_resources(rule_name, lambda_role_arn))
+
+            # Layers are resolved the same way as for a single-Rule deploy.
+            alphanum_rule_name = self.__get_alphanumeric_rule_name(rule_name)
+            layers = self.__get_lambda_layers(my_session, self.args, rule_params)
             if self.args.lambda_layers:
-                additional_layers = self.args.lambda_layers.split(",")
-                layers.extend(additional_layers)
+                layers.extend(self.args.lambda_layers.split(","))
+            function_properties = resources[alphanum_rule_name + "LambdaFunction"]["Properties"]
+            function_properties.pop("Layers", None)
+            if layers:
+                function_properties["Layers"] = layers
+
+        rule_template = self.__create_rule_cloudformation_resources(rule_name, True, inline_parameters=True)
+        resources.update(rule_template["Resources"])
+        if "SourceIdentifier" not in rule_params:
+            # Config checks that it may invoke the function when the Rule is created.
+            alphanum_rule_name = self.__get_alphanumeric_rule_name(rule_name)
+            resources[alphanum_rule_name + "ConfigRule"]["DependsOn"] = alphanum_rule_name + "LambdaPermissions"
+
+        return resources
+
+    def __get_aggregated_stacks(self, my_cfn, stack_prefix):
+        # Returns the existing aggregated stacks and the Rules each one holds, as recorded in its template metadata.
+        stack_name_pattern = re.compile("^" + re.escape(stack_prefix) + "-[0-9]+$")
+        stacks = {}
+        for page in my_cfn.get_paginator("describe_stacks").paginate():
+            for stack in page["Stacks"]:
+                if not stack_name_pattern.match(stack["StackName"]) or stack["StackStatus"] in [
+                    "DELETE_COMPLETE",
+                    "REVIEW_IN_PROGRESS",
+                ]:
+                    continue
+                metadata = my_cfn.get_template_summary(StackName=stack["StackName"]).get("Metadata")
+                stack_rules = json.loads(metadata).get(aggregated_rules_metadata_key, []) if metadata else []
+                stacks[stack["StackName"]] = stack_rules
+        return stacks
+
+    def __assign_aggregated_stacks(self, rule_names, rule_resources, base_template, existing_stacks):
+        # Packs the Rules into stacks named <prefix>-1, <prefix>-2, ... within the CloudFormation resource and
+        # template size limits.  Rules stay in the stack that already holds them while it has room, so a deploy
+        # doesn't shuffle resources between stacks.
+        base_resource_count = len(base_template["Resources"])
+        base_size = len(json.dumps(base_template, indent=2))
+        rule_sizes = {
+            rule_name: len(json.dumps(resources, indent=2)) for rule_name, resources in rule_resources.items()
+        }
+
+        stacks = {}
+        usage = {}
+
+        def add_rule(stack_name, rule_name):
+            resource_count, size = usage[stack_name]
+            resource_count += len(rule_resources[rule_name])
+            size += rule_sizes[rule_name]
+            if resource_count > CFN_MAX_RESOURCES or size > CFN_MAX_TEMPLATE_SIZE:
+                return False
+            usage[stack_name] = (resource_count, size)
+            stacks[stack_name].append(rule_name)
+            return True
+
+        def stack_number(stack_name):
+            return int(stack_name.rsplit("-", 1)[1])
+
+        placed_rules = set()
+        for stack_name in sorted(existing_stacks, key=stack_number):
+            stacks[stack_name] = []
+            usage[stack_name] = (base_resource_count, base_size)
+            for rule_name in existing_stacks[stack_name]:
+                if rule_name in rule_resources and rule_name not in placed_rules and add_rule(stack_name, rule_name):
+                    placed_rules.add(rule_name)
 
-            if layers:
-                my_params.append({"ParameterKey": "Layers", "ParameterValue": ",".join(layers)})
+        for rule_name in rule_names:
+            if rule_name in placed_rules:
+                continue
+            if any(add_rule(stack_name, rule_name) for stack_name in stacks):
+                continue
+            stack_name = self.args.stack_name + "-" + str(max([0] + [stack_number(name) for name in stacks]) + 1)
+            stacks[stack_name] = []
+            usage[stack_name] = (base_resource_count, base_size)
+            if not add_rule(stack_name, rule_name):
+                print(f"Rule {rule_name} is too large to deploy in an aggregated CloudFormation stack.")
+                sys.exit(1)
 
-            if self.args.lambda_security_groups and self.args.lambda_subnets:
-                my_params.append(
-                    {
-                        "ParameterKey": "SecurityGroupIds",
-                        "ParameterValue": self.args.lambda_security_groups,
-                    }
-                )
-                my_params.append(
-                    {
-                        "ParameterKey": "SubnetIds",
-                        "ParameterValue": self.args.lambda_subnets,
-                    }
-                )
+        return {stack_name: stack_rules for stack_name, stack_rules in stacks.items() if stack_rules}
 
-            # create json of CFN template
-            cfn_body = os.path.join(path.dirname(__file__), "template", "configRule.yaml")
-            template_body = open(cfn_body, "r").read()
-            yaml_body = yaml.safe_load(template_body)
+    def __deploy_rule_stack(self, rule_name, my_cfn, cfn_args):
+        # Creates or updates the stack for a Rule.  With --plan a change set is created instead, and with --apply the
+        # change set left by an earlier --plan is executed.
+        # Returns the operation started ("CREATE" or "UPDATE"), None if there is nothing to change, or "FAILED".
+        region = my_cfn.meta.region_name
+        my_stack_name = cfn_args["StackName"]
 
-            remediation = ""
-            if "Remediation" in rule_params:
-                remediation = self.__create_remediation_cloudformation_block(rule_params["Remediation"])
-                yaml_body["Resources"]["Remediation"] = remediation
+        if self.args.plan:
+            return self.__create_rule_change_set(rule_name, my_cfn, cfn_args)
 
-                if "SSMAutomation" in rule_params:
-                    ##AWS needs to build the SSM before the Config Rule
-                    resource_depends_on = [
-                        "rdkConfigRule",
-                        self.__get_alphanumeric_rule_name(rule_name + "RemediationAction"),
-                    ]
-                    remediation["DependsOn"] = resource_depends_on
-                    # Add JSON Reference to SSM Document { "Ref" : "MyEC2Instance" }
-                    remediation["Properties"]["TargetId"] = {
-                        "Ref": self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")
-                    }
+        if self.args.apply:
+            return self.__execute_rule_change_set(rule_name, my_cfn, my_stack_name)
 
-            if "SSMAutomation" in rule_params:
-                print(f"[{my_session.region_name}]: Building SSM Automation Section")
-
-                ssm_automation = self.__create_automation_cloudformation_block(rule_params["SSMAutomation"], rule_name)
-                yaml_body["Resources"][
-                    self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")
-                ] = ssm_automation
-                if "IAM" in rule_params["SSMAutomation"]:
-                    print("Lets Build IAM Role and Policy")
-                    # TODO Check For IAM Settings
-                    yaml_body["Resources"]["Remediation"]["Properties"]["Parameters"]["AutomationAssumeRole"][
-                        "StaticValue"
-                    ]["Values"] = [
-                        {
-                            "Fn::GetAtt": [
-                                self.__get_alphanumeric_rule_name(rule_name + "Role"),
-                                "Arn",
-                            ]
-                        }
-                    ]
+        my_stack = self.__describe_cfn_stack(my_cfn, my_stack_name)
+        if my_stack is None:
+            print(f"[{region}]: Creating CloudFormation Stack for " + rule_name)
+            my_cfn.create_stack(**cfn_args)
+            return "CREATE"
 
-                    (
-                        ssm_iam_role,
-                        ssm_iam_policy,
-                    ) = self.__create_automation_iam_cloudformation_block(rule_params["SSMAutomation"], rule_name)
-                    yaml_body["Resources"][self.__get_alphanumeric_rule_name(rule_name + "Role")] = ssm_iam_role
-                    yaml_body["Resources"][self.__get_alphanumeric_rule_name(rule_name + "Policy")] = ssm_iam_policy
+        if my_stack["StackStatus"] == "REVIEW_IN_PROGRESS":
+            # The stack was planned but never created, so all it holds is a change set.
+            print(f"[{region}]: {rule_name} has a planned change set that was never applied. Run deploy with --apply.")
+            return "FAILED"
 
-            # debugging
-            # print(json.dumps(json_body, indent=2))
+        # If we've gotten here, stack exists and we should update it.
+        print(f"[{region}]: Updating CloudFormation Stack for " + rule_name)
+        try:
+            my_cfn.update_stack(**cfn_args)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ValidationError":
+                if "No updates are to be performed." in str(e):
+                    # No changes made to Config rule definition, so CloudFormation won't do anything.
+                    print(f"[{region}]: No changes to Config Rule.")
+                    return None
+                # Something unexpected has gone wrong.  Emit an error and bail.
+                print(f"[{region}]: Validation Error on CFN\n")
+                print(f"[{region}]: {e}\n")
+                return "FAILED"
+            raise
+
+        return "UPDATE"
+
+    def __create_rule_change_set(self, rule_name, my_cfn, cfn_args):
+        region = my_cfn.meta.region_name
+        my_stack_name = cfn_args["StackName"]
+
+        # A stack that was planned but never applied sits in REVIEW_IN_PROGRESS, and still needs a CREATE change set.
+        my_stack = self.__describe_cfn_stack(my_cfn, my_stack_name)
+        if my_stack is None or my_stack["StackStatus"] == "REVIEW_IN_PROGRESS":
+            change_set_type = "CREATE"
+        else:
+            change_set_type = "UPDATE"
+
+        # Only the latest plan for a stack is kept, so --apply can't execute a stale one.
+        if my_stack is not None:
+            for change_set in self.__get_plan_change_sets(my_cfn, my_stack_name):
+                my_cfn.delete_change_set(ChangeSetName=change_set["ChangeSetId"])
+
+        print(f"[{region}]: Planning changes to CloudFormation Stack for " + rule_name)
+        response = my_cfn.create_change_set(
+            ChangeSetName=plan_change_set_prefix
+            + time.strftime("%Y%m%d%H%M%S", time.gmtime())
+            + "-"
+            + uuid.uuid4().hex[:8],
+            ChangeSetType=change_set_type,
+            Description="Planned by rdk deploy --plan",
+            **cfn_args,
+        )
+        self.__rule_plans[rule_name] = {
+            "StackName": my_stack_name,
+            "ChangeSetId": response["Id"],
+            "ChangeSetType": change_set_type,
+        }
+        return change_set_type
+
+    def __execute_rule_change_set(self, rule_name, my_cfn, my_stack_name):
+        region = my_cfn.meta.region_name
+
+        my_stack = self.__describe_cfn_stack(my_cfn, my_stack_name)
+        change_sets = self.__get_plan_change_sets(my_cfn, my_stack_name) if my_stack else []
+        if not change_sets:
+            if my_stack is None:
+                print(f"[{region}]: No planned changes for new Rule {rule_name}. Run deploy with --plan first.")
+                return "FAILED"
+            # --plan removes change sets that don't change anything.
+            print(f"[{region}]: No planned changes to Config Rule.")
+            return None
 
-            # deploy config rule
-            my_cfn = my_session.client("cloudformation")
-            try:
-                my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
-                my_stack = my_cfn.describe_stacks(StackName=my_stack_name)
-                # If we've gotten here, stack exists and we should update it.
-                print(f"[{my_session.region_name}]: Updating CloudFormation Stack for " + rule_name)
+        change_set = change_sets[-1]
+        if change_set["Status"] != "CREATE_COMPLETE" or change_set["ExecutionStatus"] != "AVAILABLE":
+            print(
+                f"[{region}]: Planned change set for {rule_name} can't be applied ({change_set['Status']}, "
+                f"{change_set['ExecutionStatus']}): {change_set.get('StatusReason', '')}"
+            )
+            return "FAILED"
+
+        print(f"[{region}]: Applying planned changes to CloudFormation Stack for " + rule_name)
+        my_cfn.execute_change_set(ChangeSetName=change_set["ChangeSetId"])
+        return "CREATE" if my_stack["StackStatus"] == "REVIEW_IN_PROGRESS" else "UPDATE"
+
+    def __get_plan_change_sets(self, my_cfn, my_stack_name):
+        # Change sets created by --plan for a stack that haven't been executed yet, oldest first.
+        change_sets = []
+        for page in my_cfn.get_paginator("list_change_sets").paginate(StackName=my_stack_name):
+            for change_set in page["Summaries"]:
+                if (
+                    change_set["ChangeSetName"].startswith(plan_change_set_prefix)
+                    and change_set["ExecutionStatus"] != "EXECUTE_COMPLETE"
+                ):
+                    change_sets.append(change_set)
+        return sorted(change_sets, key=lambda change_set: change_set["CreationTime"])
+
+    def __wait_for_change_sets(self, my_cfn, change_set_ids):
+        # Polls all of the change sets in one loop, since CloudFormation computes them concurrently.
+        # Returns a dict of change set ID to its final description, including all of its changes.
+        pending = list(change_set_ids)
+        results = {}
+        delay = CFN_WAIT_MIN_DELAY
+        while pending:
+            for change_set_id in list(pending):
                 try:
-                    cfn_args = {
-                        "StackName": my_stack_name,
-                        "TemplateBody": json.dumps(yaml_body, indent=2),
-                        "Parameters": my_params,
-                        "Capabilities": ["CAPABILITY_IAM", "CAPABILITY_NAMED_IAM"],
-                    }
+                    response = my_cfn.describe_change_set(ChangeSetName=change_set_id)
+                except ClientError as ce:
+                    if ce.response["Error"]["Code"] in THROTTLING_ERROR_CODES:
+                        delay = CFN_WAIT_MAX_DELAY
+                        break
+                    raise
+                if response["Status"] in ["CREATE_PENDING", "CREATE_IN_PROGRESS"]:
+                    continue
 
-                    # If no tags key is specified, or if the tags dict is empty
-                    if cfn_tags is not None:
-                        cfn_args["Tags"] = cfn_tags
+                changes = response.get("Changes", [])
+                while response.get("NextToken"):
+                    response = my_cfn.describe_change_set(ChangeSetName=change_set_id, NextToken=response["NextToken"])
+                    changes.extend(response.get("Changes", []))
+                response["Changes"] = changes
+                results[change_set_id] = response
+                pending.remove(change_set_id)
 
-                    response = my_cfn.update_stack(**cfn_args)
-                except ClientError as e:
-                    if e.response["Error"]["Code"] == "ValidationError":
-                        if "No updates are to be performed." in str(e):
-                            # No changes made to Config rule definition, so CloudFormation won't do anything.
-                            print(f"[{my_session.region_name}]: No changes to Config Rule.")
-                        else:
-                            # Something unexpected has gone wrong.  Emit an error and bail.
-                            print(f"[{my_session.region_name}]: Validation Error on CFN\n")
-                            print(f"[{my_session.region_name}]: " + json.dumps(cfn_args) + "\n")
-                            print(f"[{my_session.region_name}]: {e}\n")
-                            return 1
-                    else:
-                        raise
+            if pending:
+                time.sleep(_jittered_delay(delay))
+                delay = min(delay * 2, CFN_WAIT_MAX_DELAY)
 
-                my_lambda_arn = self.__get_lambda_arn_for_stack(my_stack_name)
+        return results
 
-                print(f"[{my_session.region_name}]: Publishing Lambda code...")
-                my_lambda_client = my_session.client("lambda")
-                my_lambda_client.update_function_code(
-                    FunctionName=my_lambda_arn,
-                    S3Bucket=code_bucket_name,
-                    S3Key=s3_dst,
-                    Publish=True,
+    def __report_rule_plans(self, rule_names, my_session):
+        region = my_session.region_name
+        my_cfn = my_session.client("cloudformation")
+
+        change_sets = self.__wait_for_change_sets(my_cfn, [plan["ChangeSetId"] for plan in self.__rule_plans.values()])
+
+        print(f"[{region}]: Planned changes:")
+        changed_rules = []
+        failed_rules = []
+        for rule_name in rule_names:
+            plan = self.__rule_plans[rule_name]
+            change_set = change_sets[plan["ChangeSetId"]]
+            code_changed = plan.get("CodeChanged", False)
+
+            if change_set["Status"] == "FAILED":
+                status_reason = change_set.get("StatusReason", "")
+                if (
+                    "didn't contain changes" not in status_reason
+                    and "No updates are to be performed" not in status_reason
+                ):
+                    print(f"[{region}]:   {rule_name}: planning failed: {status_reason}")
+                    failed_rules.append(rule_name)
+                    continue
+                # An empty change set can't be executed, so don't leave it for --apply.
+                my_cfn.delete_change_set(ChangeSetName=plan["ChangeSetId"])
+                if not code_changed:
+                    print(f"[{region}]:   {rule_name}: no changes")
+                    continue
+                print(f"[{region}]:   {rule_name}: update")
+            else:
+                print(f"[{region}]:   {rule_name}: {plan['ChangeSetType'].lower()}")
+
+            changed_rules.append(rule_name)
+            for change in change_set["Changes"]:
+                resource_change = change.get("ResourceChange", {})
+                line = "{:<8} {:<40} {}".format(
+                    resource_change.get("Action", ""),
+                    resource_change.get("ResourceType", ""),
+                    resource_change.get("LogicalResourceId", ""),
                 )
-                print(f"[{my_session.region_name}]: Lambda code updated.")
-            except ClientError as e:
-                # If we're in the exception, the stack does not exist and we should create it.
-                print(f"[{my_session.region_name}]: Creating CloudFormation Stack for " + rule_name)
-                cfn_args = {
-                    "StackName": my_stack_name,
-                    "TemplateBody": json.dumps(yaml_body, indent=2),
-                    "Parameters": my_params,
-                    "Capabilities": ["CAPABILITY_IAM", "CAPABILITY_NAMED_IAM"],
-                }
+                if resource_change.get("Replacement") in ["True", "Conditional"]:
+                    line += f" (replacement: {resource_change['Replacement']})"
+                print(f"[{region}]:     {line}")
+            if code_changed:
+                print(f"[{region}]:     Lambda code changed")
+
+        print(f"[{region}]: {len(changed_rules)} of {len(rule_names)} Rules have planned changes.")
+        if failed_rules:
+            print(f"[{region}]: Planning failed for {len(failed_rules)} Rules: " + ", ".join(failed_rules))
+            return 1
+        if changed_rules:
+            print(f"[{region}]: Run deploy with --apply to deploy them.")
 
-                if cfn_tags is not None:
-                    cfn_args["Tags"] = cfn_tags
+        return 0
 
-                response = my_cfn.create_stack(**cfn_args)
+    def __deploy_rules_in_parallel(self, rule_names, account_id, partition, code_bucket_name):
+        region = self.__get_boto_session().region_name
+        print(f"[{region}]: Deploying {len(rule_names)} Rules, up to {self.args.parallel} at a time.")
 
-            # wait for changes to propagate.
-            self.__wait_for_cfn_stack(my_cfn, my_stack_name)
+        # Prefix every line printed by a worker with its Rule name so concurrent output stays readable.
+        output = ThreadPrefixedOutput(sys.stdout)
 
-            # Cloudformation is not supporting tagging config rule currently.
-            if cfn_tags is not None and len(cfn_tags) > 0:
-                self.__tag_config_rule(rule_name, cfn_tags, my_session)
+        def deploy_rule(rule_name):
+            output.set_prefix(f"[{rule_name}]")
+            try:
+                return self.__deploy_rule(rule_name, self.__get_boto_session(), account_id, partition, code_bucket_name)
+            except SystemExit as se:
+                return se.code if isinstance(se.code, int) else 1
+            except Exception as e:
+                print(f"[{region}]: Exception encountered deploying Rule: {e}")
+                return 1
+            finally:
+                output.clear_prefix()
 
-        print(f"[{my_session.region_name}]: Config deploy complete.")
+        results = {}
+        sys.stdout = output
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.args.parallel) as executor:
+                future_to_rule = {executor.submit(deploy_rule, rule_name): rule_name for rule_name in rule_names}
+                for future in concurrent.futures.as_completed(future_to_rule):
+                    results[future_to_rule[future]] = future.result()
+        finally:
+            sys.stdout = output.stream
+
+        failed_rules = sorted(rule_name for rule_name, return_val in results.items() if return_val)
+        if failed_rules:
+            print(
+                f"[{region}]: Deploy failed for {len(failed_rules)} of {len(rule_names)} Rules: "
+                + ", ".join(failed_rules)
+            )
+            return 1
 
         return 0
 
+    def stage_multi_region_artifacts(self, primary_region):
+        # Called once before a multi-region deploy fans out: build every Rule package a single time and upload it
+        # to the primary region's code bucket.  Region workers then reuse the local packages and copy from there.
+        if self.args.command == "deploy-organization":
+            self.__parse_deploy_organization_args()
+        else:
+            self.__parse_deploy_args()
+        self.args.region = primary_region
+
+        # Planning doesn't upload anything.
+        if getattr(self.args, "plan", False):
+            return None
+
+        rule_names = self.__get_rule_list_for_command()
+        my_session = self.__get_boto_session()
+
+        print(f"[{primary_region}]: Building Rule packages for all regions.")
+
+        account_id = self.__get_caller_identity_details(my_session)["account_id"]
+        if self.args.custom_code_bucket:
+            code_bucket_name = self.args.custom_code_bucket
+        else:
+            code_bucket_name = code_bucket_prefix + account_id + "-" + primary_region
+
+        staged_rules = 0
+        for rule_name in rule_names:
+            rule_params, cfn_tags = self.__get_rule_parameters(rule_name)
+            if "SourceIdentifier" in rule_params:
+                continue
+            try:
+                self.__upload_function_code(rule_name, rule_params, account_id, my_session, code_bucket_name)
+            except (ClientError, boto3.exceptions.S3UploadFailedError) as ce:
+                # The code bucket may not exist yet.  Each region will upload its own copy instead.
+                print(f"[{primary_region}]: Unable to stage Rule packages in {code_bucket_name}: {ce}")
+                return None
+            staged_rules += 1
+
+        if not staged_rules:
+            return None
+
+        return code_bucket_name
+
     def deploy_organization(self):
         self.__parse_deploy_organization_args()
 
@@ -2210,6 +3177,8 @@ class rdk:
             print("We don't handle Function Only deployment for Organizations")
             sys.exit(1)
 
+        self.__resolve_lambda_layers(my_session, rule_names)
+
         # If we're deploying both the functions and the Config rules, run the following process:
         for rule_name in rule_names:
             rule_params, cfn_tags = self.__get_rule_parameters(rule_name)
@@ -2307,9 +3276,8 @@ class rdk:
                     "configManagedRuleOrganization.yaml",
                 )
 
-                try:
-                    my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
-                    my_stack = my_cfn.describe_stacks(StackName=my_stack_name)
+                my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
+                if self.__describe_cfn_stack(my_cfn, my_stack_name) is not None:
                     # If we've gotten here, stack exists and we should update it.
                     print("Updating CloudFormation Stack for " + rule_name)
                     try:
@@ -2335,8 +3303,8 @@ class rdk:
                                 return 1
                         else:
                             raise
-                except ClientError as e:
-                    # If we're in the exception, the stack does not exist and we should create it.
+                else:
+                    # The stack does not exist, so we should create it.
                     print("Creating CloudFormation Stack for " + rule_name)
                     cfn_args = {
                         "StackName": my_stack_name,
@@ -2477,9 +3445,8 @@ class rdk:
 
             # deploy config rule
             my_cfn = my_session.client("cloudformation")
-            try:
-                my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
-                my_stack = my_cfn.describe_stacks(StackName=my_stack_name)
+            my_stack_name = self.__get_stack_name_from_rule_name(rule_name)
+            if self.__describe_cfn_stack(my_cfn, my_stack_name) is not None:
                 # If we've gotten here, stack exists and we should update it.
                 print("Updating CloudFormation Stack for " + rule_name)
                 try:
@@ -2511,17 +3478,9 @@ class rdk:
 
                 my_lambda_arn = self.__get_lambda_arn_for_stack(my_stack_name)
 
-                print("Publishing Lambda code...")
-                my_lambda_client = my_session.client("lambda")
-                my_lambda_client.update_function_code(
-                    FunctionName=my_lambda_arn,
-                    S3Bucket=code_bucket_name,
-                    S3Key=s3_dst,
-                    Publish=True,
-                )
-                print("Lambda code updated.")
-            except ClientError as e:
-                # If we're in the exception, the stack does not exist and we should create it.
+                self.__publish_function_code(rule_name, my_lambda_arn, my_session, code_bucket_name, s3_dst)
+            else:
+                # The stack does not exist, so we should create it.
                 print("Creating CloudFormation Stack for " + rule_name)
                 cfn_args = {
                     "StackName": my_stack_name,
@@ -2557,6 +3516,8 @@ class rdk:
         # run the export code
         print("Running export")
 
+        self.__resolve_lambda_layers(self.__get_boto_session(), rule_names)
+
         for rule_name in rule_names:
             rule_params, cfn_tags = self.__get_rule_parameters(rule_name)
 
@@ -2956,8 +3917,70 @@ class rdk:
         # Next, go through each rule in our rule list and add the CFN to deploy it.
         rule_names = self.__get_rule_list_for_command()
         for rule_name in rule_names:
-            params, tags = self.__get_rule_parameters(rule_name)
-            input_params = json.loads(params["InputParameters"])
+            rule_template = self.__create_rule_cloudformation_resources(rule_name, self.args.rules_only)
+            parameters.update(rule_template["Parameters"])
+            required_parameter_group["Parameters"].extend(rule_template["RequiredParameters"])
+            optional_parameter_group["Parameters"].extend(rule_template["OptionalParameters"])
+            conditions.update(rule_template["Conditions"])
+            resources.update(rule_template["Resources"])
+            script_for_tag += rule_template["TagScript"]
+
+        template["Resources"] = resources
+        template["Conditions"] = conditions
+        template["Parameters"] = parameters
+        template["Metadata"] = {
+            "AWS::CloudFormation::Interface": {
+                "ParameterGroups": [
+                    {
+                        "Label": {"default": "Lambda Account ID"},
+                        "Parameters": ["LambdaAccountId"],
+                    },
+                    required_parameter_group,
+                    optional_parameter_group,
+                ],
+                "ParameterLabels": {
+                    "LambdaAccountId": {
+                        "default": "REQUIRED: Account ID that contains Lambda Function(s) that back the Rules in this template."
+                    }
+                },
+            }
+        }
+
+        output_file = open(self.args.output_file, "w")
+        output_file.write(json.dumps(template, indent=2))
+        print("CloudFormation template written to " + self.args.output_file)
+
+        if script_for_tag:
+            print("Found tags on config rules. Cloudformation do not support tagging config rule at the moment")
+            print("Generating script for config rules tags")
+            script_for_tag = "#! /bin/bash \n" + script_for_tag
+            if self.args.tag_config_rules_script:
+                with open(self.args.tag_config_rules_script, "w") as rsh:
+                    rsh.write(script_for_tag)
+            else:
+                print("=========SCRIPT=========")
+                print(script_for_tag)
+                print("you can use flag [--tag-config-rules-script <file path> ] to output the script")
+
+    def __create_rule_cloudformation_resources(self, rule_name, rules_only, inline_parameters=False):
+        # Builds the CloudFormation for a single Rule's Config Rule and remediation.  By default the Rule's input
+        # parameters become template Parameters so the template can be reused; with inline_parameters their values
+        # are written straight into the Config Rule instead.
+        rule_template = {
+            "Parameters": {},
+            "RequiredParameters": [],
+            "OptionalParameters": [],
+            "Conditions": {},
+            "Resources": {},
+            "TagScript": "",
+        }
+        parameters = rule_template["Parameters"]
+        conditions = rule_template["Conditions"]
+        resources = rule_template["Resources"]
+
+        params, tags = self.__get_rule_parameters(rule_name)
+        input_params = json.loads(params["InputParameters"])
+        if not inline_parameters:
             for input_param in input_params:
                 cfn_param = {}
                 cfn_param["Description"] = (
@@ -2974,7 +3997,7 @@ class rdk:
 
                 param_name = self.__get_alphanumeric_rule_name(rule_name) + input_param
                 parameters[param_name] = cfn_param
-                required_parameter_group["Parameters"].append(param_name)
+                rule_template["RequiredParameters"].append(param_name)
 
             if "OptionalParameters" in params:
                 optional_params = json.loads(params["OptionalParameters"])
@@ -2989,66 +4012,74 @@ class rdk:
                     param_name = self.__get_alphanumeric_rule_name(rule_name) + optional_param
 
                     parameters[param_name] = cfn_param
-                    optional_parameter_group["Parameters"].append(param_name)
+                    rule_template["OptionalParameters"].append(param_name)
 
                     conditions[param_name] = {"Fn::Not": [{"Fn::Equals": ["", {"Ref": param_name}]}]}
 
-            config_rule = {}
-            config_rule["Type"] = "AWS::Config::ConfigRule"
-            if not self.args.rules_only:
-                config_rule["DependsOn"] = "DeliveryChannel"
+        config_rule = {}
+        config_rule["Type"] = "AWS::Config::ConfigRule"
+        if not rules_only:
+            config_rule["DependsOn"] = "DeliveryChannel"
 
-            properties = {}
-            source = {}
-            source["SourceDetails"] = []
-
-            properties["ConfigRuleName"] = rule_name
-            try:
-                properties["Description"] = params["Description"]
-            except KeyError:
-                properties["Description"] = rule_name
+        properties = {}
+        source = {}
+        source["SourceDetails"] = []
 
-            # Create the SourceDetails stanza.
-            if "SourceEvents" in params:
-                # If there are SourceEvents specified for the Rule, generate the Scope clause.
-                source_events = params["SourceEvents"].split(",")
-                properties["Scope"] = {"ComplianceResourceTypes": source_events}
+        properties["ConfigRuleName"] = rule_name
+        try:
+            properties["Description"] = params["Description"]
+        except KeyError:
+            properties["Description"] = rule_name
+
+        # Create the SourceDetails stanza.
+        if "SourceEvents" in params:
+            # If there are SourceEvents specified for the Rule, generate the Scope clause.
+            source_events = params["SourceEvents"].split(",")
+            properties["Scope"] = {"ComplianceResourceTypes": source_events}
+
+            # Also add the appropriate event source.
+            source["SourceDetails"].append(
+                {
+                    "EventSource": "aws.config",
+                    "MessageType": "ConfigurationItemChangeNotification",
+                }
+            )
+        if "SourcePeriodic" in params:
+            source["SourceDetails"].append(
+                {
+                    "EventSource": "aws.config",
+                    "MessageType": "ScheduledNotification",
+                    "MaximumExecutionFrequency": params["SourcePeriodic"],
+                }
+            )
 
-                # Also add the appropriate event source.
-                source["SourceDetails"].append(
-                    {
-                        "EventSource": "aws.config",
-                        "MessageType": "ConfigurationItemChangeNotification",
-                    }
-                )
+        # If it's a Managed Rule it will have a SourceIdentifier string in the params and we need to set the source appropriately.  Otherwise, set the source to our custom lambda function.
+        if "SourceIdentifier" in params:
+            source["Owner"] = "AWS"
+            source["SourceIdentifier"] = params["SourceIdentifier"]
+            # Check the frequency of the managed rule if defined
             if "SourcePeriodic" in params:
-                source["SourceDetails"].append(
-                    {
-                        "EventSource": "aws.config",
-                        "MessageType": "ScheduledNotification",
-                        "MaximumExecutionFrequency": params["SourcePeriodic"],
-                    }
-                )
-
-            # If it's a Managed Rule it will have a SourceIdentifier string in the params and we need to set the source appropriately.  Otherwise, set the source to our custom lambda function.
-            if "SourceIdentifier" in params:
-                source["Owner"] = "AWS"
-                source["SourceIdentifier"] = params["SourceIdentifier"]
-                # Check the frequency of the managed rule if defined
-                if "SourcePeriodic" in params:
-                    properties["MaximumExecutionFrequency"] = params["SourcePeriodic"]
-                del source["SourceDetails"]
-            else:
-                source["Owner"] = "CUSTOM_LAMBDA"
-                source["SourceIdentifier"] = {
-                    "Fn::Sub": "arn:${AWS::Partition}:lambda:${AWS::Region}:${LambdaAccountId}:function:"
-                    + self.__get_lambda_name(rule_name, params)
-                }
+                properties["MaximumExecutionFrequency"] = params["SourcePeriodic"]
+            del source["SourceDetails"]
+        else:
+            source["Owner"] = "CUSTOM_LAMBDA"
+            source["SourceIdentifier"] = {
+                "Fn::Sub": "arn:${AWS::Partition}:lambda:${AWS::Region}:${LambdaAccountId}:function:"
+                + self.__get_lambda_name(rule_name, params)
+            }
 
-            properties["Source"] = source
+        properties["Source"] = source
 
-            properties["InputParameters"] = {}
+        properties["InputParameters"] = {}
 
+        if inline_parameters:
+            # Same values that a single-Rule deploy passes: required parameters as-is, optional ones only if set.
+            properties["InputParameters"].update(input_params)
+            if "OptionalParameters" in params:
+                for optional_param, value in json.loads(params["OptionalParameters"]).items():
+                    if value:
+                        properties["InputParameters"][optional_param] = value
+        else:
             if "InputParameters" in params:
                 for required_param in json.loads(params["InputParameters"]):
                     cfn_param_name = self.__get_alphanumeric_rule_name(rule_name) + required_param
@@ -3065,93 +4096,58 @@ class rdk:
                         ]
                     }
 
-            config_rule["Properties"] = properties
-            config_rule_resource_name = self.__get_alphanumeric_rule_name(rule_name) + "ConfigRule"
-            resources[config_rule_resource_name] = config_rule
-
-            # If Remediation create the remediation section with potential links to the SSM Details
-            if "Remediation" in params:
-                remediation = self.__create_remediation_cloudformation_block(params["Remediation"])
-                remediation["DependsOn"] = [config_rule_resource_name]
-                if not self.args.rules_only:
-                    remediation["DependsOn"].append("ConfigRole")
-
-                if "SSMAutomation" in params:
-                    ssm_automation = self.__create_automation_cloudformation_block(params["SSMAutomation"], rule_name)
-                    # AWS needs to build the SSM before the Config Rule
-                    remediation["DependsOn"].append(self.__get_alphanumeric_rule_name(rule_name + "RemediationAction"))
-                    # Add JSON Reference to SSM Document { "Ref" : "MyEC2Instance" }
-                    remediation["Properties"]["TargetId"] = {
-                        "Ref": self.__get_alphanumeric_rule_name(rule_name) + "RemediationAction"
-                    }
-
-                    if "IAM" in params["SSMAutomation"]:
-                        print("Lets Build IAM Role and Policy For the SSM Document")
-                        (
-                            ssm_iam_role,
-                            ssm_iam_policy,
-                        ) = self.__create_automation_iam_cloudformation_block(params["SSMAutomation"], rule_name)
-                        resources[self.__get_alphanumeric_rule_name(rule_name + "Role")] = ssm_iam_role
-                        resources[self.__get_alphanumeric_rule_name(rule_name + "Policy")] = ssm_iam_policy
-                        remediation["Properties"]["Parameters"]["AutomationAssumeRole"]["StaticValue"]["Values"] = [
-                            {
-                                "Fn::GetAtt": [
-                                    self.__get_alphanumeric_rule_name(rule_name + "Role"),
-                                    "Arn",
-                                ]
-                            }
-                        ]
-                        # Override the placeholder to associate the SSM Document Role with newly crafted role
-                        resources[self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")] = ssm_automation
-                resources[self.__get_alphanumeric_rule_name(rule_name) + "Remediation"] = remediation
-
-            if tags:
-                tags_str = ""
-                for tag in tags:
-                    key = tag["Key"]
-                    val = tag["Value"]
-                    tags_str += f"Key={key},Value={val} "
-                script_for_tag += (
-                    "aws configservice tag-resource --resources-arn $(aws configservice describe-config-rules "
-                    + f"--config-rule-names {rule_name} --query 'ConfigRules[0].ConfigRuleArn' | tr -d '\"') --tags {tags_str} \n"
-                )
-
-        template["Resources"] = resources
-        template["Conditions"] = conditions
-        template["Parameters"] = parameters
-        template["Metadata"] = {
-            "AWS::CloudFormation::Interface": {
-                "ParameterGroups": [
-                    {
-                        "Label": {"default": "Lambda Account ID"},
-                        "Parameters": ["LambdaAccountId"],
-                    },
-                    required_parameter_group,
-                    optional_parameter_group,
-                ],
-                "ParameterLabels": {
-                    "LambdaAccountId": {
-                        "default": "REQUIRED: Account ID that contains Lambda Function(s) that back the Rules in this template."
-                    }
-                },
-            }
-        }
-
-        output_file = open(self.args.output_file, "w")
-        output_file.write(json.dumps(template, indent=2))
-        print("CloudFormation template written to " + self.args.output_file)
+        config_rule["Properties"] = properties
+        config_rule_resource_name = self.__get_alphanumeric_rule_name(rule_name) + "ConfigRule"
+        resources[config_rule_resource_name] = config_rule
+
+        # If Remediation create the remediation section with potential links to the SSM Details
+        if "Remediation" in params:
+            remediation = self.__create_remediation_cloudformation_block(params["Remediation"])
+            remediation["DependsOn"] = [config_rule_resource_name]
+            if not rules_only:
+                remediation["DependsOn"].append("ConfigRole")
+
+            if "SSMAutomation" in params:
+                ssm_automation = self.__create_automation_cloudformation_block(params["SSMAutomation"], rule_name)
+                # AWS needs to build the SSM before the Config Rule
+                remediation["DependsOn"].append(self.__get_alphanumeric_rule_name(rule_name + "RemediationAction"))
+                # Add JSON Reference to SSM Document { "Ref" : "MyEC2Instance" }
+                remediation["Properties"]["TargetId"] = {
+                    "Ref": self.__get_alphanumeric_rule_name(rule_name) + "RemediationAction"
+                }
 
-        if script_for_tag:
-            print("Found tags on config rules. Cloudformation do not support tagging config rule at the moment")
-            print("Generating script for config rules tags")
-            script_for_tag = "#! /bin/bash \n" + script_for_tag
-            if self.args.tag_config_rules_script:
-                with open(self.args.tag_config_rules_script, "w") as rsh:
-                    rsh.write(script_for_tag)
-            else:
-                print("=========SCRIPT=========")
-                print(script_for_tag)
-                print("you can use flag [--tag-config-rules-script <file path> ] to output the script")
+                if "IAM" in params["SSMAutomation"]:
+                    print("Lets Build IAM Role and Policy For the SSM Document")
+                    (
+                        ssm_iam_role,
+                        ssm_iam_policy,
+                    ) = self.__create_automation_iam_cloudformation_block(params["SSMAutomation"], rule_name)
+                    resources[self.__get_alphanumeric_rule_name(rule_name + "Role")] = ssm_iam_role
+                    resources[self.__get_alphanumeric_rule_name(rule_name + "Policy")] = ssm_iam_policy
+                    remediation["Properties"]["Parameters"]["AutomationAssumeRole"]["StaticValue"]["Values"] = [
+                        {
+                            "Fn::GetAtt": [
+                                self.__get_alphanumeric_rule_name(rule_name + "Role"),
+                                "Arn",
+                            ]
+                        }
+                    ]
+                    # Override the placeholder to associate the SSM Document Role with newly crafted role
+                    resources[self.__get_alphanumeric_rule_name(rule_name + "RemediationAction")] = ssm_automation
+            resources[self.__get_alphanumeric_rule_name(rule_name) + "Remediation"] = remediation
+
+        if tags:
+            tags_str = ""
+            for tag in tags:
+                key = tag["Key"]
+                val = tag["Value"]
+                tags_str += f"Key={key},Value={val} "
+            rule_template["TagScript"] = (
+                "aws configservice tag-resource --resources-arn $(aws configservice describe-config-rules "
+                + f"--config-rule-names {rule_name} --query 'ConfigRules[0].ConfigRuleArn' | tr -d '\"') --tags {tags_str} \n"
+            )
+
+        return rule_template
 
     def create_region_set(self):
         self.args = get_create_region_set_parser().parse_args(self.args.command_args, self.args)
@@ -3323,36 +4319,165 @@ class rdk:
         return "/aws/lambda/" + self.__get_lambda_name(self.args.rulename, params)
 
     def __get_boto_session(self):
-        session_args = {}
+        # Sessions are cached per region, so credentials (which may involve SSO or assume-role) are only resolved
+        # once, and each service client is only built once per region.
+        with self.__sessions_lock:
+            if self.args.region not in self.__sessions:
+                session_args = {}
+
+                if self.args.region:
+                    session_args["region_name"] = self.args.region
+
+                if self.args.profile:
+                    session_args["profile_name"] = self.args.profile
+                elif self.args.access_key_id and self.args.secret_access_key:
+                    session_args["aws_access_key_id"] = self.args.access_key_id
+                    session_args["aws_secret_access_key"] = self.args.secret_access_key
+
+                # For an --accounts-file run, work in the account's role instead of with the credentials given.
+                if getattr(self.args, "role_arn", None):
+                    session_args = self.__get_assumed_role_session_args(session_args)
+
+                # Size the HTTP connection pool so concurrent Rule workers don't queue for connections.  Adaptive
+                # retry mode backs off throttled calls with jitter and rate limits each client with a token bucket.
+                # Clients are shared per service and region, so every worker in this process draws on the same bucket
+                # for each service endpoint.
+                client_config = botocore.config.Config(
+                    max_pool_connections=max(BOTO_MAX_POOL_CONNECTIONS, getattr(self.args, "parallel", 1)),
+                    retries={"mode": "adaptive", "max_attempts": BOTO_MAX_ATTEMPTS},
+                )
+                self.__sessions[self.args.region] = CachedSession(client_config=client_config, **session_args)
 
-        if self.args.region:
-            session_args["region_name"] = self.args.region
+            return self.__sessions[self.args.region]
 
-        if self.args.profile:
-            session_args["profile_name"] = self.args.profile
-        elif self.args.access_key_id and self.args.secret_access_key:
-            session_args["aws_access_key_id"] = self.args.access_key_id
-            session_args["aws_secret_access_key"] = self.args.secret_access_key
+    def __get_assumed_role_session_args(self, session_args):
+        role_arn = self.args.role_arn
+        external_id = getattr(self.args, "role_external_id", None)
+        cache_key = (
+            role_arn,
+            external_id,
+            session_args.get("profile_name") or session_args.get("aws_access_key_id"),
+        )
+
+        with _assumed_role_credentials_cache_lock:
+            credentials = _assumed_role_credentials_cache.get(cache_key)
+            if credentials is None:
+                # botocore assumes the role again whenever the credentials get close to expiring, so sessions built on
+                # them keep working however long the cell runs.
+                source_session = botocore.session.Session(profile=session_args.get("profile_name"))
+                if "aws_access_key_id" in session_args:
+                    source_session.set_credentials(
+                        session_args["aws_access_key_id"], session_args["aws_secret_access_key"]
+                    )
+                extra_args = {"RoleSessionName": "rdk-" + self.args.command}
+                if external_id:
+                    extra_args["ExternalId"] = external_id
+                fetcher = botocore.credentials.AssumeRoleCredentialFetcher(
+                    client_creator=source_session.create_client,
+                    source_credentials=source_session.get_credentials(),
+                    role_arn=role_arn,
+                    extra_args=extra_args,
+                )
+                credentials = botocore.credentials.DeferredRefreshableCredentials(
+                    refresh_using=fetcher.fetch_credentials, method="assume-role"
+                )
+                try:
+                    # Assume the role now, so that a role we can't assume fails here rather than in the first API call.
+                    credentials.get_frozen_credentials()
+                except (ClientError, botocore.exceptions.BotoCoreError) as e:
+                    print(f"[{self.args.region}]: Unable to assume role {role_arn}: {e}")
+                    sys.exit(1)
+                _assumed_role_credentials_cache[cache_key] = credentials
 
-        return Session(**session_args)
+        botocore_session = botocore.session.Session()
+        botocore_session.get_component("credential_provider").insert_before(
+            "env", AssumedRoleCredentialProvider(credentials)
+        )
+        return {"region_name": session_args.get("region_name"), "botocore_session": botocore_session}
 
     def __get_caller_identity_details(self, my_session):
-        my_sts = my_session.client("sts")
-        try:
-            response = my_sts.get_caller_identity()
-        except botocore.exceptions.ClientError:
-            logging.error(
-                "Unable to establish session to AWS. Make sure your CLI has access to valid AWS credentials and permissions to sts:GetCallerIdentity."
-            )
-            sys.exit(1)
-        arn_split = response["Arn"].split(":")
+        # Returns the account, partition and region that this session deploys to.  The identity behind a set of
+        # credentials doesn't change, so it is only looked up once per process, and optionally shared between runs
+        # through a cache file that expires after RDK_IDENTITY_CACHE_TTL seconds.
+        cache_key = self.__get_caller_identity_cache_key(my_session)
+
+        with _caller_identity_cache_lock:
+            identity = _caller_identity_cache.get(cache_key)
+            if identity is None:
+                identity = self.__read_caller_identity_cache(cache_key)
+            if identity is None:
+                my_sts = my_session.client("sts")
+                try:
+                    response = my_sts.get_caller_identity()
+                except botocore.exceptions.ClientError:
+                    logging.error(
+                        "Unable to establish session to AWS. Make sure your CLI has access to valid AWS credentials and permissions to sts:GetCallerIdentity."
+                    )
+                    sys.exit(1)
+                identity = {"Account": response["Account"], "Arn": response["Arn"]}
+                self.__write_caller_identity_cache(cache_key, identity)
+            _caller_identity_cache[cache_key] = identity
 
         return {
-            "account_id": response["Account"],
-            "partition": arn_split[1],
-            "region": arn_split[3],
+            "account_id": identity["Account"],
+            "partition": identity["Arn"].split(":")[1],
+            "region": my_session.region_name,
         }
 
+    def __get_caller_identity_cache_key(self, my_session):
+        # An assumed role, and otherwise an explicit profile, identifies the caller on its own (and avoids resolving
+        # assume-role or SSO credentials just to build the key).
+        if getattr(self.args, "role_arn", None):
+            credential_source = "role:" + self.args.role_arn
+        elif self.args.profile:
+            credential_source = "profile:" + self.args.profile
+        else:
+            credentials = my_session.get_credentials()
+            if credentials is None:
+                logging.error(
+                    "Unable to establish session to AWS. Make sure your CLI has access to valid AWS credentials and permissions to sts:GetCallerIdentity."
+                )
+                sys.exit(1)
+            credential_source = "key:" + credentials.access_key
+        # Hashed so that the cache file name doesn't reveal the profile or access key.
+        return hashlib.sha256(credential_source.encode("utf-8")).hexdigest()
+
+    def __get_caller_identity_cache_ttl(self):
+        try:
+            return max(0, int(os.environ.get(identity_cache_ttl_variable, "0")))
+        except ValueError:
+            return 0
+
+    def __get_caller_identity_cache_path(self, cache_key):
+        return os.path.join(os.getcwd(), rdk_dir, "identity", cache_key + ".json")
+
+    def __read_caller_identity_cache(self, cache_key):
+        ttl = self.__get_caller_identity_cache_ttl()
+        if not ttl:
+            return None
+        try:
+            with open(self.__get_caller_identity_cache_path(cache_key), "r") as cache_file:
+                cached = json.load(cache_file)
+            if time.time() - cached["CachedAt"] < ttl:
+                return {"Account": cached["Account"], "Arn": cached["Arn"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def __write_caller_identity_cache(self, cache_key, identity):
+        if not self.__get_caller_identity_cache_ttl():
+            return
+        cache_path = self.__get_caller_identity_cache_path(cache_key)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = cache_path + "." + str(uuid.uuid4())
+            with open(tmp_path, "w") as cache_file:
+                json.dump(dict(identity, CachedAt=time.time()), cache_file)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # The cache is only an optimisation; carry on with the identity we already have.
+            pass
+
     def __get_stack_name_from_rule_name(self, rule_name):
         output = rule_name.replace("_", "")
 
@@ -3367,6 +4492,8 @@ class rdk:
         rule_names = []
         if self.args.all:
             for obj_name in os.listdir("."):
+                if obj_name.startswith("."):
+                    continue  # Skip hidden items, including rdk's own working directory
                 obj_path = os.path.join(".", obj_name)
                 if os.path.isdir(obj_path) and not obj_name == "rdk":
                     for file_name in os.listdir(obj_path):
@@ -3546,8 +4673,32 @@ class rdk:
             print("You must specify both lambda-security-groups and lambda-subnets, or neither.")
             sys.exit(1)
 
-        if self.args.stack_name and not self.args.functions_only:
-            print("--stack-name can only be specified when using the --functions-only feature.")
+        aggregate = getattr(self.args, "aggregate", False)
+        if self.args.stack_name and not (self.args.functions_only or aggregate):
+            print("--stack-name can only be specified when using the --functions-only or --aggregate features.")
+            sys.exit(1)
+
+        if aggregate and not self.args.all:
+            # The aggregated stacks are rebuilt from the selected Rules, so any Rule left out would be removed.
+            print("--aggregate can only be used with --all.")
+            sys.exit(1)
+
+        if aggregate and (
+            self.args.functions_only or getattr(self.args, "plan", False) or getattr(self.args, "apply", False)
+        ):
+            print("--aggregate cannot be used with --functions-only, --plan or --apply.")
+            sys.exit(1)
+
+        if getattr(self.args, "resume", False) and (self.args.functions_only or aggregate or self.args.plan):
+            print("--resume cannot be used with --functions-only, --aggregate or --plan.")
+            sys.exit(1)
+
+        if getattr(self.args, "parallel", 1) < 1:
+            print("--parallel must be a positive integer.")
+            sys.exit(1)
+
+        if (getattr(self.args, "plan", False) or getattr(self.args, "apply", False)) and self.args.functions_only:
+            print("--plan and --apply cannot be used with the --functions-only feature.")
             sys.exit(1)
 
         # Make sure we're not exceeding Layer limits
@@ -3584,6 +4735,9 @@ class rdk:
         if self.args.functions_only and not self.args.stack_name:
             self.args.stack_name = "RDK-Config-Rule-Functions"
 
+        if aggregate and not self.args.stack_name:
+            self.args.stack_name = aggregated_stack_prefix
+
         if self.args.rulesets:
             self.args.rulesets = self.args.rulesets.split(",")
 
@@ -3655,45 +4809,10 @@ class rdk:
 
     def __package_function_code(self, rule_name, params):
         my_session = self.__get_boto_session()
-        if params["SourceRuntime"] == "java8":
-            # Do java build and package.
-            print("Running Gradle Build for " + rule_name)
-            working_dir = os.path.join(os.getcwd(), rules_dir, rule_name)
-            command = ["gradle", "build"]
-            subprocess.call(command, cwd=working_dir)
-
-            # set source as distribution zip
-            s3_src = os.path.join(
-                os.getcwd(),
-                rules_dir,
-                rule_name,
-                "build",
-                "distributions",
-                rule_name + ".zip",
-            )
-
-        else:
-            print("Zipping " + rule_name)
-            # Remove old zip file if it already exists
-            package_file_dst = os.path.join(rule_name, rule_name + ".zip")
-            self.__delete_package_file(package_file_dst)
-
-            # zip rule code files and upload to s3 bucket
-            s3_src_dir = os.path.join(os.getcwd(), rules_dir, rule_name)
-            tmp_src = shutil.make_archive(
-                os.path.join(tempfile.gettempdir(), rule_name + my_session.region_name),
-                "zip",
-                s3_src_dir,
-            )
-            if not (os.path.exists(package_file_dst)):
-                shutil.copy(tmp_src, package_file_dst)
-            s3_src = os.path.abspath(package_file_dst)
-            self.__delete_package_file(tmp_src)
+        self.__build_function_package(rule_name, params, my_session.region_name)
 
         s3_dst = "/".join((rule_name, rule_name + ".zip"))
 
-        print("Zipping complete.")
-
         return s3_dst
 
     def __populate_params(self):
@@ -3852,53 +4971,197 @@ class rdk:
         parameters_file.close()
 
     def __wait_for_cfn_stack(self, cfn_client, stackname):
-        my_session = self.__get_boto_session()
-        in_progress = True
-        while in_progress:
-            my_stacks = []
-            response = cfn_client.list_stacks()
-
-            all_stacks = response["StackSummaries"]
-            while "NextToken" in response:
-                response = cfn_client.list_stacks(NextToken=response["NextToken"])
-                all_stacks += response["StackSummaries"]
-
-            for stack in all_stacks:
-                if stack["StackName"] == stackname:
-                    my_stacks.append(stack)
-
-            # Find the stack (if any) that hasn't already been deleted.
-            all_deleted = True
-            active_stack = None
-            for stack in my_stacks:
-                if stack["StackStatus"] != "DELETE_COMPLETE":
-                    active_stack = stack
-                    all_deleted = False
-
-            # If all stacks have been deleted, clearly we're done!
-            if all_deleted:
-                in_progress = False
-                print(f"[{my_session.region_name}]: CloudFormation stack operation complete.")
-                continue
+        return self.__wait_for_cfn_stacks(cfn_client, [stackname])[stackname]
+
+    def __wait_for_cfn_stacks(self, cfn_client, stack_names):
+        region = cfn_client.meta.region_name
+
+        # Resolve each stack name to its unique Stack ID once.  Describing a stack by ID keeps working after it has
+        # been deleted, so there's no need to page through the account's whole stack history on every poll.
+        pending_stacks = {}
+        final_statuses = {}
+        for stack_name in stack_names:
+            stack = self.__describe_cfn_stack(cfn_client, stack_name)
+            if stack is None:
+                final_statuses[stack_name] = "DELETE_COMPLETE"
+                print(f"[{region}]: CloudFormation stack operation complete for " + stack_name + ".")
             else:
-                if "FAILED" in active_stack["StackStatus"]:
-                    in_progress = False
-                    print(f"[{my_session.region_name}]: CloudFormation stack operation Failed for " + stackname + ".")
-                    if "StackStatusReason" in active_stack:
-                        print(f"[{my_session.region_name}]: Reason: " + active_stack["StackStatusReason"])
-                elif active_stack["StackStatus"] == "ROLLBACK_COMPLETE":
-                    in_progress = False
+                pending_stacks[stack_name] = stack["StackId"]
+
+        delay = CFN_WAIT_MIN_DELAY
+        while pending_stacks:
+            status_changed = False
+            for stack_name, stack_id in list(pending_stacks.items()):
+                try:
+                    stack = cfn_client.describe_stacks(StackName=stack_id)["Stacks"][0]
+                except ClientError as ce:
+                    if ce.response["Error"]["Code"] not in THROTTLING_ERROR_CODES:
+                        raise
+                    # Back off as far as we're allowed and try the remaining stacks on the next poll.
+                    delay = CFN_WAIT_MAX_DELAY
+                    break
+
+                if stack["StackStatus"].endswith("_IN_PROGRESS") and stack["StackStatus"] != "REVIEW_IN_PROGRESS":
+                    continue
+
+                del pending_stacks[stack_name]
+                final_statuses[stack_name] = stack["StackStatus"]
+                status_changed = True
+                self.__print_cfn_stack_result(cfn_client, stack_name, stack)
+
+            if pending_stacks:
+                if len(pending_stacks) == 1:
+                    print(f"[{region}]: Waiting for CloudFormation stack operation to complete...")
+                else:
                     print(
-                        f"[{my_session.region_name}]: CloudFormation stack operation Rolled Back for " + stackname + "."
+                        f"[{region}]: Waiting for {len(pending_stacks)} CloudFormation stack operations to complete..."
                     )
-                    if "StackStatusReason" in active_stack:
-                        print(f"[{my_session.region_name}]: Reason: " + active_stack["StackStatusReason"])
-                elif "COMPLETE" in active_stack["StackStatus"]:
-                    in_progress = False
-                    print(f"[{my_session.region_name}]: CloudFormation stack operation complete.")
+                time.sleep(_jittered_delay(delay))
+                # Poll quickly while stacks are finishing, and back off while nothing is changing.
+                if status_changed:
+                    delay = CFN_WAIT_MIN_DELAY
+                else:
+                    delay = min(delay * 2, CFN_WAIT_MAX_DELAY)
+
+        return final_statuses
+
+    def __delete_cfn_stacks(self, cfn_client, stack_names):
+        # Starts deleting all of the stacks at once.  Returns the Stack ID of each stack being deleted, by name, to
+        # wait on with __wait_for_cfn_stack_deletions; stacks that don't exist are left out.
+        region = cfn_client.meta.region_name
+
+        def delete_stack(stack_name):
+            stack = self.__describe_cfn_stack(cfn_client, stack_name)
+            if stack is None:
+                return None
+            cfn_client.delete_stack(StackName=stack["StackId"])
+            return stack["StackId"]
+
+        deleted_stacks = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=CFN_DELETE_WORKERS) as executor:
+            future_to_stack = {executor.submit(delete_stack, stack_name): stack_name for stack_name in stack_names}
+            for future in concurrent.futures.as_completed(future_to_stack):
+                stack_name = future_to_stack[future]
+                try:
+                    stack_id = future.result()
+                except ClientError as ce:
+                    print(
+                        f"[{region}]: Client Error encountered attempting to delete CloudFormation stack {stack_name}: "
+                        + str(ce)
+                    )
+                    continue
+                if stack_id is not None:
+                    deleted_stacks[stack_name] = stack_id
+
+        return deleted_stacks
+
+    def __wait_for_cfn_stack_deletions(self, cfn_client, deleted_stacks):
+        # Waits on every stack being deleted in a single polling loop.  Each poll is one (paginated) ListStacks query for
+        # the stacks still being deleted, rather than one call per stack; only stacks that have dropped out of it are
+        # described, to report how their deletion ended.
+        region = cfn_client.meta.region_name
+        pending_stacks = dict(deleted_stacks)
+        final_statuses = {}
+        delay = CFN_WAIT_MIN_DELAY
+        while pending_stacks:
+            deleting_stack_ids = set()
+            for page in cfn_client.get_paginator("list_stacks").paginate(StackStatusFilter=["DELETE_IN_PROGRESS"]):
+                deleting_stack_ids.update(stack["StackId"] for stack in page["StackSummaries"])
+
+            status_changed = False
+            for stack_name, stack_id in list(pending_stacks.items()):
+                if stack_id in deleting_stack_ids:
+                    continue
+                stack = cfn_client.describe_stacks(StackName=stack_id)["Stacks"][0]
+                if stack["StackStatus"] == "DELETE_IN_PROGRESS":
+                    continue
+
+                del pending_stacks[stack_name]
+                final_statuses[stack_name] = stack["StackStatus"]
+                status_changed = True
+                self.__print_cfn_stack_result(cfn_client, stack_name, stack)
+
+            if pending_stacks:
+                print(f"[{region}]: Waiting for {len(pending_stacks)} CloudFormation stacks to be deleted...")
+                time.sleep(_jittered_delay(delay))
+                if status_changed:
+                    delay = CFN_WAIT_MIN_DELAY
                 else:
-                    print(f"[{my_session.region_name}]: Waiting for CloudFormation stack operation to complete...")
-                    time.sleep(5)
+                    delay = min(delay * 2, CFN_WAIT_MAX_DELAY)
+
+        return final_statuses
+
+    def __delete_s3_bucket(self, s3_client, bucket_name):
+        # Empties the bucket with concurrent DeleteObjects batches, then deletes it.  Every object version and delete
+        # marker is removed, so that versioned buckets can be deleted too; unversioned objects are listed with a "null"
+        # version, which deletes them the same way.
+        def delete_batch(batch):
+            return s3_client.delete_objects(Bucket=bucket_name, Delete={"Objects": batch, "Quiet": True}).get(
+                "Errors", []
+            )
+
+        futures = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=S3_DELETE_WORKERS) as executor:
+            batch = []
+            for page in s3_client.get_paginator("list_object_versions").paginate(Bucket=bucket_name):
+                for version in (page.get("Versions") or []) + (page.get("DeleteMarkers") or []):
+                    batch.append({"Key": version["Key"], "VersionId": version["VersionId"]})
+                    if len(batch) == S3_DELETE_BATCH_SIZE:
+                        futures.append(executor.submit(delete_batch, batch))
+                        batch = []
+            if batch:
+                futures.append(executor.submit(delete_batch, batch))
+
+        errors = [error for future in futures for error in future.result()]
+        if errors:
+            print(f"Unable to delete {len(errors)} objects from {bucket_name}. First error: {errors[0]['Message']}")
+
+        s3_client.delete_bucket(Bucket=bucket_name)
+
+    def __describe_cfn_stack(self, cfn_client, stack_name):
+        try:
+            return cfn_client.describe_stacks(StackName=stack_name)["Stacks"][0]
+        except ClientError as ce:
+            if ce.response["Error"]["Code"] == "ValidationError" and "does not exist" in str(ce):
+                return None
+            raise
+
+    def __print_cfn_stack_result(self, cfn_client, stack_name, stack):
+        region = cfn_client.meta.region_name
+        stack_status = stack["StackStatus"]
+        if stack_status == "DELETE_COMPLETE":
+            print(f"[{region}]: CloudFormation stack operation complete for " + stack_name + ".")
+            return
+
+        if "FAILED" in stack_status:
+            print(f"[{region}]: CloudFormation stack operation Failed for " + stack_name + ".")
+        elif stack_status in ["ROLLBACK_COMPLETE", "UPDATE_ROLLBACK_COMPLETE"]:
+            print(f"[{region}]: CloudFormation stack operation Rolled Back for " + stack_name + ".")
+        else:
+            print(f"[{region}]: CloudFormation stack operation complete for " + stack_name + ".")
+            return
+
+        if "StackStatusReason" in stack:
+            print(f"[{region}]: Reason: " + stack["StackStatusReason"])
+
+        # The stack-level reason rarely says what actually broke, so surface the first resource that failed.
+        try:
+            stack_events = cfn_client.describe_stack_events(StackName=stack["StackId"])["StackEvents"]
+        except ClientError:
+            return
+        # Events are newest first; stop at the event that started the current operation.
+        first_failure = None
+        for event in stack_events:
+            if event["LogicalResourceId"] == stack_name:
+                if event.get("ResourceStatusReason") == "User Initiated":
+                    break
+            elif event["ResourceStatus"].endswith("_FAILED"):
+                first_failure = event
+        if first_failure:
+            print(
+                f"[{region}]: Resource {first_failure['LogicalResourceId']} failed: "
+                + first_failure.get("ResourceStatusReason", first_failure["ResourceStatus"])
+            )
 
     def __get_handler(self, rule_name, params):
         if "SourceHandler" in params:
@@ -4018,57 +5281,177 @@ class rdk:
             pass
 
     def __upload_function_code(self, rule_name, params, account_id, my_session, code_bucket_name):
+        s3_src, content_hash = self.__build_function_package(rule_name, params, my_session.region_name)
+        s3_dst = "/".join((rule_name, rule_name + ".zip"))
+
+        my_s3_client = my_session.client("s3")
+
+        # The content hash of the last upload is kept as object metadata, so unchanged code is never re-sent.
+        try:
+            uploaded_object = my_s3_client.head_object(Bucket=code_bucket_name, Key=s3_dst)
+            uploaded_content_hash = uploaded_object["Metadata"].get(content_hash_metadata_key)
+        except ClientError:
+            uploaded_content_hash = None
+
+        artifact_source_bucket = getattr(self.args, "artifact_source_bucket", None)
+        if uploaded_content_hash == content_hash:
+            print(f"[{my_session.region_name}]: No changes to {rule_name} code in S3. Skipping upload.")
+        elif (
+            artifact_source_bucket
+            and artifact_source_bucket != code_bucket_name
+            and self.__copy_staged_function_code(
+                my_s3_client, artifact_source_bucket, code_bucket_name, s3_dst, content_hash
+            )
+        ):
+            print(f"[{my_session.region_name}]: Copied {rule_name} code from " + artifact_source_bucket)
+        else:
+            print(f"[{my_session.region_name}]: Uploading " + rule_name)
+            my_s3_client.upload_file(
+                s3_src,
+                code_bucket_name,
+                s3_dst,
+                ExtraArgs={"Metadata": {content_hash_metadata_key: content_hash}},
+            )
+            print(f"[{my_session.region_name}]: Upload complete.")
+
+        return s3_dst
+
+    def __copy_staged_function_code(self, s3_client, source_bucket, code_bucket_name, s3_dst, content_hash):
+        # Server-side copy of a package already staged in another region's code bucket, if it is the same code.
+        try:
+            staged_object = s3_client.head_object(Bucket=source_bucket, Key=s3_dst)
+            if staged_object["Metadata"].get(content_hash_metadata_key) != content_hash:
+                return False
+            s3_client.copy_object(
+                CopySource={"Bucket": source_bucket, "Key": s3_dst},
+                Bucket=code_bucket_name,
+                Key=s3_dst,
+                MetadataDirective="COPY",
+            )
+        except ClientError:
+            return False
+
+        return True
+
+    def __build_function_package(self, rule_name, params, region):
+        rule_dir = os.path.join(os.getcwd(), rules_dir, rule_name)
+        if params["SourceRuntime"] == "java8":
+            package_file = os.path.join(rule_dir, "build", "distributions", rule_name + ".zip")
+        else:
+            package_file = os.path.join(rule_dir, rule_name + ".zip")
+
+        content_hash = self.__get_rule_content_hash(rule_name, params)
+        package_record = self.__read_package_record(rule_name)
+        if package_record.get("ContentHash") == content_hash and os.path.exists(package_file):
+            print(f"[{region}]: No changes to {rule_name} since it was last packaged. Skipping packaging.")
+            return package_file, content_hash
+
         if params["SourceRuntime"] == "java8":
             # Do java build and package.
-            print(f"[{my_session.region_name}]: Running Gradle Build for " + rule_name)
-            working_dir = os.path.join(os.getcwd(), rules_dir, rule_name)
+            print(f"[{region}]: Running Gradle Build for " + rule_name)
             command = ["gradle", "build"]
-            subprocess.call(command, cwd=working_dir)
-
-            # set source as distribution zip
-            s3_src = os.path.join(
-                os.getcwd(),
-                rules_dir,
+            subprocess.call(command, cwd=rule_dir)
+        else:
+            print(f"[{region}]: Zipping " + rule_name)
+            include_patterns, exclude_patterns, keep_paths = self.__get_package_patterns(rule_name, params)
+            package_zip = build_package_zip(rule_dir, include_patterns, exclude_patterns, keep_paths)
+
+            # Write to a hidden file first (excluded from packages) and rename it into place, so that other
+            # region processes never see a partially-written zip.
+            tmp_package_file = os.path.join(rule_dir, "." + rule_name + str(uuid.uuid4()) + ".zip")
+            with open(tmp_package_file, "wb") as f:
+                f.write(package_zip)
+            os.replace(tmp_package_file, package_file)
+            print(f"[{region}]: Zipping complete.")
+
+        if os.path.exists(package_file):
+            self.__write_package_record(
                 rule_name,
-                "build",
-                "distributions",
-                rule_name + my_session.region_name + ".zip",
+                {"ContentHash": content_hash, "CodeSha256": self.__get_code_sha256(package_file)},
             )
-            s3_dst = "/".join((rule_name, rule_name + ".zip"))
 
-            my_s3 = my_session.resource("s3")
+        return package_file, content_hash
 
-            print(f"[{my_session.region_name}]: Uploading " + rule_name)
-            my_s3.meta.client.upload_file(s3_src, code_bucket_name, s3_dst)
-            print(f"[{my_session.region_name}]: Upload complete.")
+    def __get_rule_content_hash(self, rule_name, params):
+        # Hash exactly the files that go into the package, in a fixed order, so the result doesn't depend on
+        # timestamps or the filesystem.
+        include_patterns, exclude_patterns, keep_paths = self.__get_package_patterns(rule_name, params)
+        rule_dir = os.path.join(os.getcwd(), rules_dir, rule_name)
+        content_hash = hashlib.sha256()
+        for relative_path, file_path in get_package_files(rule_dir, include_patterns, exclude_patterns, keep_paths):
+            with open(file_path, "rb") as f:
+                file_hash = hashlib.sha256(f.read()).hexdigest()
+            content_hash.update(f"{relative_path}\0{file_hash}\n".encode("utf-8"))
 
-        else:
-            print(f"[{my_session.region_name}]: Zipping " + rule_name)
-            # Remove old zip file if it already exists
-            package_file_dst = os.path.join(rule_name, rule_name + ".zip")
-            self.__delete_package_file(package_file_dst)
-
-            # zip rule code files and upload to s3 bucket
-            s3_src_dir = os.path.join(os.getcwd(), rules_dir, rule_name)
-
-            tmp_src = shutil.make_archive(
-                os.path.join(tempfile.gettempdir(), rule_name + my_session.region_name),
-                "zip",
-                s3_src_dir,
-            )
+        return content_hash.hexdigest()
 
-            s3_dst = "/".join((rule_name, rule_name + ".zip"))
+    def __get_package_patterns(self, rule_name, params):
+        # Returns the include patterns, the exclude patterns and the files that are kept whatever the patterns say.
+        if params["SourceRuntime"] == "java8":
+            # Gradle decides what goes into Java packages; only its inputs matter for change detection.
+            return ["*"], JAVA_SOURCE_EXCLUDE_PATTERNS, []
 
-            my_s3 = my_session.resource("s3")
+        include_patterns = params.get("PackageInclude", ["*"])
+        exclude_patterns = (
+            PACKAGE_EXCLUDE_PATTERNS + [rule_name + ".zip", rule_name + "_test.py"] + params.get("PackageExclude", [])
+        )
+        # The handler's module is always packaged, even if its name looks like a test module (e.g. a Rule "ssl_test").
+        handler = self.__get_handler(rule_name, params)
+        if not handler:
+            return include_patterns, exclude_patterns, []
+        return include_patterns, exclude_patterns, [handler.rsplit(".", 1)[0].replace(".", "/") + ".py"]
 
-            print(f"[{my_session.region_name}]: Uploading " + rule_name)
-            my_s3.meta.client.upload_file(tmp_src, code_bucket_name, s3_dst)
-            print(f"[{my_session.region_name}]: Upload complete.")
-            if not (os.path.exists(package_file_dst)):
-                shutil.copy(tmp_src, package_file_dst)
-            self.__delete_package_file(tmp_src)
+    def __get_code_sha256(self, file_path):
+        # Same encoding as the CodeSha256 that Lambda reports for a function's deployment package.
+        with open(file_path, "rb") as f:
+            return base64.b64encode(hashlib.sha256(f.read()).digest()).decode("utf-8")
 
-        return s3_dst
+    def __get_package_record_path(self, rule_name):
+        return os.path.join(os.getcwd(), rdk_dir, "packages", rule_name + ".json")
+
+    def __read_package_record(self, rule_name):
+        try:
+            with open(self.__get_package_record_path(rule_name), "r") as record_file:
+                return json.load(record_file)
+        except (OSError, ValueError):
+            return {}
+
+    def __write_package_record(self, rule_name, record):
+        record_path = self.__get_package_record_path(rule_name)
+        os.makedirs(os.path.dirname(record_path), exist_ok=True)
+        # Write then rename so that concurrent region processes never read a half-written record.
+        tmp_path = record_path + "." + str(uuid.uuid4())
+        with open(tmp_path, "w") as record_file:
+            json.dump(record, record_file, indent=2)
+        os.replace(tmp_path, record_path)
+
+    def __is_function_code_current(self, rule_name, lambda_arn, my_session):
+        # Compares the last package built for the Rule with the code the Lambda function is running.
+        code_sha256 = self.__read_package_record(rule_name).get("CodeSha256")
+        try:
+            deployed_code_sha256 = my_session.client("lambda").get_function_configuration(FunctionName=lambda_arn)[
+                "CodeSha256"
+            ]
+        except ClientError:
+            deployed_code_sha256 = None
+
+        return bool(code_sha256) and code_sha256 == deployed_code_sha256
+
+    def __publish_function_code(self, rule_name, lambda_arn, my_session, code_bucket_name, s3_dst):
+        my_lambda_client = my_session.client("lambda")
+
+        if self.__is_function_code_current(rule_name, lambda_arn, my_session):
+            print(f"[{my_session.region_name}]: Lambda code is already up to date.")
+            return
+
+        print(f"[{my_session.region_name}]: Publishing Lambda code...")
+        my_lambda_client.update_function_code(
+            FunctionName=lambda_arn,
+            S3Bucket=code_bucket_name,
+            S3Key=s3_dst,
+            Publish=True,
+        )
+        print(f"[{my_session.region_name}]: Lambda code updated.")
 
     def __create_remediation_cloudformation_block(self, remediation_config):
         remediation = {
@@ -4144,7 +5527,7 @@ class rdk:
 
         return (ssm_automation_iam_role, ssm_automation_iam_policy)
 
-    def __create_function_cloudformation_template(self):
+    def __create_function_cloudformation_template(self, identity_details, rule_names=None):
         print("Generating CloudFormation template for Lambda Functions!")
 
         # First add the common elements - description, parameters, and resource section header
@@ -4166,7 +5549,6 @@ class rdk:
         resources = {}
 
         my_session = self.__get_boto_session()
-        identity_details = self.__get_caller_identity_details(my_session)
         account_id = identity_details["account_id"]
         partition = identity_details["partition"]
         lambdaRoleArn = ""
@@ -4251,65 +5633,75 @@ class rdk:
             ]
             resources["rdkLambdaRole"] = lambda_role
 
-        rule_names = self.__get_rule_list_for_command()
+        if rule_names is None:
+            rule_names = self.__get_rule_list_for_command()
         for rule_name in rule_names:
-            alphanum_rule_name = self.__get_alphanumeric_rule_name(rule_name)
-            params, tags = self.__get_rule_parameters(rule_name)
-
-            if "SourceIdentifier" in params:
-                print("Skipping Managed Rule.")
-                continue
-
-            lambda_function = {}
-            lambda_function["Type"] = "AWS::Lambda::Function"
-            properties = {}
-            properties["FunctionName"] = self.__get_lambda_name(rule_name, params)
-            properties["Code"] = {
-                "S3Bucket": {"Ref": "SourceBucket"},
-                "S3Key": rule_name + "/" + rule_name + ".zip",
-            }
-            properties["Description"] = "Function for AWS Config Rule " + rule_name
-            properties["Handler"] = self.__get_handler(rule_name, params)
-            properties["MemorySize"] = "256"
-            if self.args.lambda_role_arn or self.args.lambda_role_name:
-                properties["Role"] = lambdaRoleArn
-            else:
-                lambda_function["DependsOn"] = "rdkLambdaRole"
-                properties["Role"] = {"Fn::GetAtt": ["rdkLambdaRole", "Arn"]}
-            properties["Runtime"] = self.__get_runtime_string(params)
-            properties["Timeout"] = str(self.args.lambda_timeout)
-            properties["Tags"] = tags
-            if self.args.lambda_subnets and self.args.lambda_security_groups:
-                properties["VpcConfig"] = {
-                    "SecurityGroupIds": self.args.lambda_security_groups.split(","),
-                    "SubnetIds": self.args.lambda_subnets.split(","),
-                }
-            layers = []
-            if self.args.rdklib_layer_arn:
-                layers.append(self.args.rdklib_layer_arn)
-            if self.args.lambda_layers:
-                for layer in self.args.lambda_layers.split(","):
-                    layers.append(layer)
-            if layers:
-                properties["Layers"] = layers
-
-            lambda_function["Properties"] = properties
-            resources[alphanum_rule_name + "LambdaFunction"] = lambda_function
-
-            lambda_permissions = {}
-            lambda_permissions["Type"] = "AWS::Lambda::Permission"
-            lambda_permissions["DependsOn"] = alphanum_rule_name + "LambdaFunction"
-            lambda_permissions["Properties"] = {
-                "FunctionName": {"Fn::GetAtt": [alphanum_rule_name + "LambdaFunction", "Arn"]},
-                "Action": "lambda:InvokeFunction",
-                "Principal": "config.amazonaws.com",
-            }
-            resources[alphanum_rule_name + "LambdaPermissions"] = lambda_permissions
+            resources.update(self.__create_function_cloudformation_resources(rule_name, lambdaRoleArn))
 
         template["Resources"] = resources
 
         return json.dumps(template, indent=2)
 
+    def __create_function_cloudformation_resources(self, rule_name, lambdaRoleArn):
+        # The Lambda function and invoke permission for a single custom Rule, given the role ARN (or "" to use the
+        # template's rdkLambdaRole).
+        resources = {}
+
+        alphanum_rule_name = self.__get_alphanumeric_rule_name(rule_name)
+        params, tags = self.__get_rule_parameters(rule_name)
+
+        if "SourceIdentifier" in params:
+            print("Skipping Managed Rule.")
+            return resources
+
+        lambda_function = {}
+        lambda_function["Type"] = "AWS::Lambda::Function"
+        properties = {}
+        properties["FunctionName"] = self.__get_lambda_name(rule_name, params)
+        properties["Code"] = {
+            "S3Bucket": {"Ref": "SourceBucket"},
+            "S3Key": rule_name + "/" + rule_name + ".zip",
+        }
+        properties["Description"] = "Function for AWS Config Rule " + rule_name
+        properties["Handler"] = self.__get_handler(rule_name, params)
+        properties["MemorySize"] = "256"
+        if self.args.lambda_role_arn or self.args.lambda_role_name:
+            properties["Role"] = lambdaRoleArn
+        else:
+            lambda_function["DependsOn"] = "rdkLambdaRole"
+            properties["Role"] = {"Fn::GetAtt": ["rdkLambdaRole", "Arn"]}
+        properties["Runtime"] = self.__get_runtime_string(params)
+        properties["Timeout"] = str(self.args.lambda_timeout)
+        properties["Tags"] = tags
+        if self.args.lambda_subnets and self.args.lambda_security_groups:
+            properties["VpcConfig"] = {
+                "SecurityGroupIds": self.args.lambda_security_groups.split(","),
+                "SubnetIds": self.args.lambda_subnets.split(","),
+            }
+        layers = []
+        if self.args.rdklib_layer_arn:
+            layers.append(self.args.rdklib_layer_arn)
+        if self.args.lambda_layers:
+            for layer in self.args.lambda_layers.split(","):
+                layers.append(layer)
+        if layers:
+            properties["Layers"] = layers
+
+        lambda_function["Properties"] = properties
+        resources[alphanum_rule_name + "LambdaFunction"] = lambda_function
+
+        lambda_permissions = {}
+        lambda_permissions["Type"] = "AWS::Lambda::Permission"
+        lambda_permissions["DependsOn"] = alphanum_rule_name + "LambdaFunction"
+        lambda_permissions["Properties"] = {
+            "FunctionName": {"Fn::GetAtt": [alphanum_rule_name + "LambdaFunction", "Arn"]},
+            "Action": "lambda:InvokeFunction",
+            "Principal": "config.amazonaws.com",
+        }
+        resources[alphanum_rule_name + "LambdaPermissions"] = lambda_permissions
+
+        return resources
+
     def __tag_config_rule(self, rule_name, cfn_tags, my_session):
         config_client = my_session.client("config")
         config_arn = config_client.describe_config_rules(ConfigRuleNames=[rule_name])["ConfigRules"][0]["ConfigRuleArn"]
@@ -4329,17 +5721,25 @@ class rdk:
                 "python3.13-lib",
             ]:
                 if hasattr(args, "generated_lambda_layer") and args.generated_lambda_layer:
-                    lambda_layer_version = self.__get_existing_lambda_layer(
-                        my_session, layer_name=args.custom_layer_name
-                    )
-                    if not lambda_layer_version:
-                        print(
-                            f"{my_session.region_name} generated-lambda-layer flag received, but layer [{args.custom_layer_name}] not found in {my_session.region_name}. Creating one now"
-                        )
-                        self.__create_new_lambda_layer(my_session, layer_name=args.custom_layer_name)
+                    # Held while creating the layer, so that Rules deploying in parallel don't each create one.
+                    with self.__lambda_layer_lock:
                         lambda_layer_version = self.__get_existing_lambda_layer(
                             my_session, layer_name=args.custom_layer_name
                         )
+                        if not lambda_layer_version and getattr(args, "plan", False):
+                            # Planning only looks the layer up, and --apply runs the planned change sets as they are.
+                            print(
+                                f"[{my_session.region_name}]: Layer [{args.custom_layer_name}] not found. Create it with 'rdk init --generate-lambda-layer --custom-layer-name {args.custom_layer_name}' or deploy without --plan."
+                            )
+                            sys.exit(1)
+                        if not lambda_layer_version:
+                            print(
+                                f"{my_session.region_name} generated-lambda-layer flag received, but layer [{args.custom_layer_name}] not found in {my_session.region_name}. Creating one now"
+                            )
+                            self.__create_new_lambda_layer(my_session, layer_name=args.custom_layer_name)
+                            lambda_layer_version = self.__get_existing_lambda_layer(
+                                my_session, layer_name=args.custom_layer_name, refresh=True
+                            )
                     layers.append(lambda_layer_version)
                 elif hasattr(args, "rdklib_layer_arn") and args.rdklib_layer_arn:
                     layers.append(args.rdklib_layer_arn)
@@ -4349,15 +5749,74 @@ class rdk:
                     layers.append(rdklib_arn)
         return layers
 
-    def __get_existing_lambda_layer(self, my_session, layer_name="rdklib-layer"):
+    def __resolve_lambda_layers(self, my_session, rule_names):
+        # Resolves the layers for all of the Rules in one step, before any of them are deployed.  Every Rule uses the
+        # same generated layer, so only the first lookup calls Lambda; the rest are answered from the cache.  When
+        # planning, the layers are only looked up: nothing is created or published, and the cache file is not written.
+        for rule_name in rule_names:
+            rule_params, cfn_tags = self.__get_rule_parameters(rule_name)
+            self.__get_lambda_layers(my_session, self.args, rule_params)
+
+    def __get_existing_lambda_layer(self, my_session, layer_name="rdklib-layer", refresh=False):
+        # The latest version of each layer is looked up once per region per run, and optionally shared between runs
+        # through a cache file that expires after RDK_LAYER_CACHE_TTL seconds.  refresh skips both caches.
         region = my_session.region_name
-        lambda_client = my_session.client("lambda")
-        print(f"[{region}]: Checking for Existing RDK Layer")
-        response = lambda_client.list_layer_versions(LayerName=layer_name)
-        if response["LayerVersions"]:
-            return response["LayerVersions"][0]["LayerVersionArn"]
-        elif not response["LayerVersions"]:
+        with self.__lambda_layer_lock:
+            cache_key = (region, layer_name)
+            if not refresh and cache_key in self.__lambda_layer_versions:
+                return self.__lambda_layer_versions[cache_key]
+
+            cache_path = self.__get_lambda_layer_cache_path(my_session, layer_name)
+            layer_version_arn = None if refresh else self.__read_lambda_layer_cache(cache_path)
+            if layer_version_arn is None:
+                lambda_client = my_session.client("lambda")
+                print(f"[{region}]: Checking for Existing RDK Layer")
+                response = lambda_client.list_layer_versions(LayerName=layer_name)
+                if response["LayerVersions"]:
+                    layer_version_arn = response["LayerVersions"][0]["LayerVersionArn"]
+                    if not getattr(self.args, "plan", False):
+                        self.__write_lambda_layer_cache(cache_path, layer_version_arn)
+
+            self.__lambda_layer_versions[cache_key] = layer_version_arn
+            return layer_version_arn
+
+    def __get_lambda_layer_cache_ttl(self):
+        try:
+            return max(0, int(os.environ.get(layer_cache_ttl_variable, "0")))
+        except ValueError:
+            return 0
+
+    def __get_lambda_layer_cache_path(self, my_session, layer_name):
+        # Layer names may be ARNs, and the same name means a different layer in each account and region.
+        account_id = self.__get_caller_identity_details(my_session)["account_id"]
+        cache_key = hashlib.sha256(f"{account_id}:{my_session.region_name}:{layer_name}".encode("utf-8")).hexdigest()
+        return os.path.join(os.getcwd(), rdk_dir, "layer-versions", cache_key + ".json")
+
+    def __read_lambda_layer_cache(self, cache_path):
+        ttl = self.__get_lambda_layer_cache_ttl()
+        if not ttl:
             return None
+        try:
+            with open(cache_path, "r") as cache_file:
+                cached = json.load(cache_file)
+            if time.time() - cached["CachedAt"] < ttl:
+                return cached["LayerVersionArn"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def __write_lambda_layer_cache(self, cache_path, layer_version_arn):
+        if not self.__get_lambda_layer_cache_ttl():
+            return
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = cache_path + "." + str(uuid.uuid4())
+            with open(tmp_path, "w") as cache_file:
+                json.dump({"LayerVersionArn": layer_version_arn, "CachedAt": time.time()}, cache_file)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # The cache is only an optimisation; carry on with the layer we already have.
+            pass
 
     def __create_new_lambda_layer(self, my_session, layer_name="rdklib-layer"):
         successful_return = None
@@ -4377,115 +5836,325 @@ class rdk:
             self.__create_new_lambda_layer_locally(my_session, layer_name)
 
     def __create_new_lambda_layer_serverless_repo(self, my_session):
+        change_set = self.__submit_lambda_layer_change_set(my_session)
+        if change_set is None:
+            return None
+        if self.__await_lambda_layer_change_sets([change_set])[my_session.region_name]:
+            return 1
+        return None
+
+    def __submit_lambda_layer_change_set(self, my_session):
+        # Starts deploying the rdklib-layer from the Serverless Application Repository, without waiting for it.  Returns
+        # a handle to pass to __await_lambda_layer_change_sets, or None if SAR can't be used in this region.
         try:
             cfn_client = my_session.client("cloudformation")
             sar_client = my_session.client("serverlessrepo")
             sar_client.get_application(ApplicationId=RDKLIB_LAYER_SAR_ID)
-            # Try to create the stack from scratch
-            create_type = "update"
-            try:
-                cfn_client.describe_stacks(StackName="serverlessrepo-rdklib")
-            except ClientError as ce:
-                if ce.response["Error"]["Code"] == "ValidationError":
-                    create_type = "create"
-                else:
-                    raise ce
             change_set_arn = sar_client.create_cloud_formation_change_set(
                 ApplicationId=RDKLIB_LAYER_SAR_ID, StackName="rdklib"
             )["ChangeSetId"]
             print(f"[{my_session.region_name}]: Creating change set to deploy rdklib-layer")
-            code = self.__check_on_change_set(cfn_client, change_set_arn)
-            if code == 1:
-                print(
-                    f"[{my_session.region_name}]: Lambda layer up to date with the Serverless Application Repository Version"
-                )
-                return 1
-            if code == -1:
-                print(f"[{my_session.region_name}]: Error creating change set, attempting to use manual deployment")
-                raise ClientError()
-            print(f"[{my_session.region_name}]: Executing change set to deploy rdklib-layer")
-            cfn_client.execute_change_set(ChangeSetName=change_set_arn)
-            waiter = cfn_client.get_waiter(f"stack_{create_type}_complete")
-            waiter.wait(StackName="serverlessrepo-rdklib")
-            print(f"[{my_session.region_name}]: Successfully executed change set")
-            return 1
+            return {"Region": my_session.region_name, "Client": cfn_client, "ChangeSetId": change_set_arn}
         # 2021-10-13 -> aws partition regions where SAR is not supported throw EndpointConnectionError and aws-cn throw ClientError
         except (EndpointConnectionError, ClientError):
             return None
 
+    def __await_lambda_layer_change_sets(self, change_sets):
+        # Waits on the rdklib-layer change sets of any number of regions in one loop, executing each one as soon as it
+        # is ready and then waiting on its stack.  A region drops out as soon as it reaches a terminal state, and the
+        # polls back off while nothing is changing.  Returns a dict of region to whether the layer is now up to date.
+        results = {}
+        pending = [dict(change_set, Executed=False) for change_set in change_sets]
+        deadline = time.time() + SAR_CHANGE_SET_TIMEOUT
+        delay = CFN_WAIT_MIN_DELAY
+        while pending:
+            status_changed = False
+            for change_set in list(pending):
+                region = change_set["Region"]
+                cfn_client = change_set["Client"]
+                try:
+                    if change_set["Executed"]:
+                        stack_status = cfn_client.describe_stacks(StackName=change_set["StackId"])["Stacks"][0][
+                            "StackStatus"
+                        ]
+                        if stack_status.endswith("_IN_PROGRESS"):
+                            continue
+                        results[region] = stack_status in ["CREATE_COMPLETE", "UPDATE_COMPLETE"]
+                        if results[region]:
+                            print(f"[{region}]: Successfully executed change set")
+                        else:
+                            print(f"[{region}]: Change set to deploy rdklib-layer failed ({stack_status})")
+                    else:
+                        response = cfn_client.describe_change_set(ChangeSetName=change_set["ChangeSetId"])
+                        if response["Status"] in ["CREATE_PENDING", "CREATE_IN_PROGRESS"]:
+                            if time.time() < deadline:
+                                continue
+                            print(f"[{region}]: Timed out creating change set, attempting to use manual deployment")
+                            results[region] = False
+                        elif response["Status"] == "CREATE_COMPLETE":
+                            print(f"[{region}]: Executing change set to deploy rdklib-layer")
+                            cfn_client.execute_change_set(ChangeSetName=change_set["ChangeSetId"])
+                            change_set["Executed"] = True
+                            change_set["StackId"] = response["StackId"]
+                            status_changed = True
+                            continue
+                        elif "No updates are to be performed" in response.get(
+                            "StatusReason", ""
+                        ) or "didn't contain changes" in response.get("StatusReason", ""):
+                            print(
+                                f"[{region}]: Lambda layer up to date with the Serverless Application Repository Version"
+                            )
+                            results[region] = True
+                        else:
+                            print(f"[{region}]: Error creating change set, attempting to use manual deployment")
+                            results[region] = False
+                except ClientError as ce:
+                    if ce.response["Error"]["Code"] in THROTTLING_ERROR_CODES:
+                        delay = CFN_WAIT_MAX_DELAY
+                        break
+                    print(f"[{region}]: Error deploying rdklib-layer: {ce}")
+                    results[region] = False
+
+                pending.remove(change_set)
+                status_changed = True
+
+            if pending:
+                time.sleep(_jittered_delay(delay))
+                # Poll quickly while regions are finishing, and back off while nothing is changing.
+                if status_changed:
+                    delay = CFN_WAIT_MIN_DELAY
+                else:
+                    delay = min(delay * 2, CFN_WAIT_MAX_DELAY)
+
+        return results
+
+    def prepare_multi_region_lambda_layer(self, regions):
+        # Called once per account before a multi-region init fans out, when init is deploying the rdklib-layer from the
+        # Serverless Application Repository.  The change sets for every region are created first and then awaited
+        # together, instead of each region worker blocking on its own.  Returns a dict of region to whether the layer is
+        # now up to date, so that the regions where SAR failed go straight to building the layer locally.
+        self.args = get_init_parser().parse_args(self.args.command_args, self.args)
+        if not self.args.generate_lambda_layer or self.args.custom_layer_name != "rdklib-layer":
+            return {}
+
+        change_sets = []
+        for region in regions:
+            self.args.region = region
+            change_set = self.__submit_lambda_layer_change_set(self.__get_boto_session())
+            if change_set is not None:
+                change_sets.append(change_set)
+
+        self.args.region = regions[0]
+        results = self.__await_lambda_layer_change_sets(change_sets)
+        return {region: results.get(region, False) for region in regions}
+
     def __create_new_lambda_layer_locally(self, my_session, layer_name="rdklib-layer"):
         region = my_session.region_name
         print(f"[{region}]: Creating new {layer_name}")
-        folder_name = "lib" + str(uuid.uuid4())
-        shell_command = "pip3 install --target python boto3 botocore rdk rdklib future mock"
+        layer_zip, content_hash = self.__build_lambda_layer(region)
 
-        print(f"[{region}]: Installing Packages to {folder_name}/python")
+        # Publish from the code bucket rather than a temporary bucket.  The zip is stored by content, so a layer that
+        # has already been uploaded to this region isn't sent again.
+        account_id = self.__get_caller_identity_details(my_session)["account_id"]
+        code_bucket_name = getattr(self.args, "custom_code_bucket", None) or (
+            code_bucket_prefix + account_id + "-" + region
+        )
+        s3_client = my_session.client("s3")
+        if not self.__s3_bucket_exists(s3_client, code_bucket_name):
+            # e.g. init --skip-code-bucket-creation without a --custom-code-bucket.
+            self.__publish_lambda_layer_from_temporary_bucket(my_session, layer_name, layer_zip)
+            return
+
+        s3_key = "/".join(("rdk-layers", layer_name, content_hash + ".zip"))
         try:
-            os.makedirs(folder_name + "/python")
-        except FileExistsError as e:
-            print(e)
-            sys.exit(1)
-        os.chdir(folder_name)
-        _ = subprocess.run(shell_command, capture_output=True, shell=True)
+            s3_client.head_object(Bucket=code_bucket_name, Key=s3_key)
+            print(f"[{region}]: {layer_name} zip already uploaded to {code_bucket_name}. Skipping upload.")
+        except ClientError:
+            print(f"[{region}]: Uploading {layer_name} zip to {code_bucket_name}")
+            s3_client.upload_file(layer_zip, code_bucket_name, s3_key)
+
+        print(f"[{region}]: Publishing Lambda Layer")
+        my_session.client("lambda").publish_layer_version(
+            LayerName=layer_name,
+            Content={"S3Bucket": code_bucket_name, "S3Key": s3_key},
+            CompatibleRuntimes=lambda_layer_runtimes,
+        )
 
-        print(f"[{region}]: Creating rdk_lib_layer.zip")
-        shutil.make_archive(f"rdk_lib_layer", "zip", ".", "python")
-        os.chdir("..")
+    def __publish_lambda_layer_from_temporary_bucket(self, my_session, layer_name, layer_zip):
+        region = my_session.region_name
         s3_client = my_session.client("s3")
-        s3_resource = my_session.resource("s3")
 
         print(f"[{region}]: Creating temporary S3 Bucket")
         bucket_name = "rdkliblayertemp" + str(uuid.uuid4())
-        if region != "us-east-1":
-            s3_client.create_bucket(
-                Bucket=bucket_name,
-                CreateBucketConfiguration={"LocationConstraint": region},
-            )
         if region == "us-east-1":
             s3_client.create_bucket(Bucket=bucket_name)
+        else:
+            s3_client.create_bucket(Bucket=bucket_name, CreateBucketConfiguration={"LocationConstraint": region})
 
-        print(f"[{region}]: Uploading rdk_lib_layer.zip to S3")
-        s3_resource.Bucket(bucket_name).upload_file(f"{folder_name}/rdk_lib_layer.zip", layer_name)
-
-        lambda_client = my_session.client("lambda")
+        try:
+            print(f"[{region}]: Uploading rdk_lib_layer.zip to S3")
+            s3_client.upload_file(layer_zip, bucket_name, layer_name)
+
+            print(f"[{region}]: Publishing Lambda Layer")
+            my_session.client("lambda").publish_layer_version(
+                LayerName=layer_name,
+                Content={"S3Bucket": bucket_name, "S3Key": layer_name},
+                CompatibleRuntimes=lambda_layer_runtimes,
+            )
+        finally:
+            print(f"[{region}]: Deleting temporary S3 Bucket")
+            try:
+                self.__delete_s3_bucket(s3_client, bucket_name)
+            except Exception as e:
+                print(e)
+
+    def __build_lambda_layer(self, region):
+        # Returns the layer zip and its cache key.  Zips are kept in .rdk/layers/, keyed by the package versions pip
+        # resolves, so the layer is only built again when one of its packages has a new release.
+        prebuilt_lambda_layer = getattr(self.args, "prebuilt_lambda_layer", None)
+        if prebuilt_lambda_layer and os.path.exists(prebuilt_lambda_layer[0]):
+            print(f"[{region}]: Reusing the layer built before the region workers started.")
+            return prebuilt_lambda_layer
+
+        profile = getattr(self.args, "lambda_layer_profile", "full")
+        precompile_runtime = getattr(self.args, "precompile_lambda_layer", None)
+        with self.__layer_build_lock:
+            package_versions = self.__resolve_lambda_layer_packages()
+            if package_versions is None:
+                # Without resolved versions there's no safe key, so build a one-off zip in a temporary directory that
+                # is removed once this process is done with it, rather than in .rdk/layers/.  It's keyed by content.
+                if self.__unresolved_lambda_layer is None:
+                    layer_dir = tempfile.TemporaryDirectory()
+                    layer_zip = os.path.join(layer_dir.name, "rdk_lib_layer.zip")
+                    self.__build_lambda_layer_zip(region, layer_dir.name, layer_zip, profile, precompile_runtime)
+                    with open(layer_zip, "rb") as f:
+                        cache_key = hashlib.sha256(f.read()).hexdigest()
+                    self.__unresolved_lambda_layer = (layer_dir, layer_zip, cache_key)
+                return self.__unresolved_lambda_layer[1:]
+
+            layer_record = {"Packages": package_versions, "Profile": profile, "Precompile": precompile_runtime}
+            cache_key = hashlib.sha256(json.dumps(layer_record, sort_keys=True).encode("utf-8")).hexdigest()
+            layer_dir = os.path.join(os.getcwd(), rdk_dir, "layers", cache_key)
+            layer_zip = os.path.join(layer_dir, "rdk_lib_layer.zip")
+            if os.path.exists(layer_zip):
+                print(f"[{region}]: Reusing the layer already built for the same package versions.")
+                return layer_zip, cache_key
+
+            os.makedirs(layer_dir, exist_ok=True)
+            self.__build_lambda_layer_zip(region, layer_dir, layer_zip, profile, precompile_runtime)
+            with open(os.path.join(layer_dir, "layer.json"), "w") as record_file:
+                json.dump(layer_record, record_file, indent=2)
+            return layer_zip, cache_key
+
+    def __build_lambda_layer_zip(self, region, layer_dir, layer_zip, profile, precompile_runtime):
+        build_dir = tempfile.mkdtemp(dir=layer_dir)
+        try:
+            print(f"[{region}]: Installing Packages to {build_dir}/python")
+            result = subprocess.run(
+                ["pip3", "install", "--target", os.path.join(build_dir, "python")] + lambda_layer_packages,
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                print(f"[{region}]: Unable to install the layer packages: {result.stderr}")
+                sys.exit(1)
 
-        print(f"[{region}]: Publishing Lambda Layer")
-        lambda_client.publish_layer_version(
-            LayerName=layer_name,
-            Content={"S3Bucket": bucket_name, "S3Key": layer_name},
-            CompatibleRuntimes=[
-                "python3.7",
-                "python3.8",
-                "python3.9",
-                "python3.10",
-                "python3.11",
-                "python3.12",
-                "python3.13",
-            ],
-        )
+            python_dir = os.path.join(build_dir, "python")
+            installed_size = self.__get_directory_size(python_dir)
+            if profile == "slim":
+                self.__slim_lambda_layer(python_dir)
+            if precompile_runtime:
+                self.__precompile_lambda_layer(region, python_dir, precompile_runtime)
+            layer_size = self.__get_directory_size(python_dir)
+
+            print(f"[{region}]: Creating rdk_lib_layer.zip")
+            built_zip = shutil.make_archive(
+                os.path.join(build_dir, "rdk_lib_layer"), "zip", root_dir=build_dir, base_dir="python"
+            )
+            print(
+                f"[{region}]: Layer size: {installed_size / 1048576:.1f} MB installed, "
+                + f"{layer_size / 1048576:.1f} MB in the {profile} layer, "
+                + f"{os.path.getsize(built_zip) / 1048576:.1f} MB zipped."
+            )
+            # Rename into place, so that concurrent region processes never see a half-written zip.
+            os.replace(built_zip, layer_zip)
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    def __slim_lambda_layer(self, python_dir):
+        excluded_packages = {package.lower().replace("-", "_") for package in lambda_layer_slim_excludes}
+        for entry in os.listdir(python_dir):
+            # Package directories, single-module packages and .dist-info directories all start with the package name.
+            package_name = entry.split("-")[0] if entry.endswith(".dist-info") else os.path.splitext(entry)[0]
+            if package_name.lower() in excluded_packages or entry == "bin":
+                entry_path = os.path.join(python_dir, entry)
+                if os.path.isdir(entry_path):
+                    shutil.rmtree(entry_path)
+                else:
+                    os.remove(entry_path)
+
+        for top, dirs, filenames in os.walk(python_dir):
+            for dir_name in list(dirs):
+                dir_path = os.path.join(top, dir_name)
+                if dir_name in ["tests", "__pycache__"]:
+                    shutil.rmtree(dir_path)
+                    dirs.remove(dir_name)
+                elif dir_name.endswith(".dist-info"):
+                    for dist_info_file in os.listdir(dir_path):
+                        dist_info_path = os.path.join(dir_path, dist_info_file)
+                        if dist_info_file not in lambda_layer_slim_dist_info_files:
+                            if os.path.isdir(dist_info_path):
+                                shutil.rmtree(dist_info_path)
+                            else:
+                                os.remove(dist_info_path)
+                    dirs.remove(dir_name)
 
-        print(f"[{region}]: Deleting temporary S3 Bucket")
-        try:
-            bucket = s3_resource.Bucket(bucket_name)
-            bucket.objects.all().delete()
-            bucket.delete()
-        except Exception as e:
-            print(e)
+    def __precompile_lambda_layer(self, region, python_dir, runtime):
+        # Bytecode is specific to the Python version, so it has to be compiled by the runtime's own interpreter.
+        if shutil.which(runtime) is None:
+            print(f"[{region}]: {runtime} is not installed locally. Skipping precompiling the layer.")
+            return
+        print(f"[{region}]: Precompiling the layer for {runtime}")
+        result = subprocess.run([runtime, "-m", "compileall", "-q", python_dir], capture_output=True, text=True)
+        if result.returncode != 0:
+            # compileall reports the files it couldn't compile on stdout.
+            print(f"[{region}]: Unable to precompile the layer: {result.stdout}{result.stderr}")
+            sys.exit(1)
 
-        print(f"[{region}]: Cleaning up temp_folder")
-        shutil.rmtree(f"./{folder_name}")
+    def __get_directory_size(self, directory):
+        return sum(
+            os.path.getsize(os.path.join(top, filename))
+            for top, dirs, filenames in os.walk(directory)
+            for filename in filenames
+        )
 
-    def __check_on_change_set(self, cfn_client, name):
-        for i in range(0, 120):
-            response = cfn_client.describe_change_set(ChangeSetName=name)
-            status = response["Status"]
-            reason = response.get("StatusReason", "")
-            if status == "FAILED" and reason == "No updates are to be performed.":
-                return 1
-            if status == "CREATE_COMPLETE":
-                return 0
-            time.sleep(5)
-        return -1
+    def __resolve_lambda_layer_packages(self):
+        # Asks pip which version of each package (and dependency) it would install, without installing anything.
+        with tempfile.TemporaryDirectory() as report_dir:
+            report_path = os.path.join(report_dir, "report.json")
+            result = subprocess.run(
+                ["pip3", "install", "--dry-run", "--ignore-installed", "--quiet", "--report", report_path]
+                + lambda_layer_packages,
+                capture_output=True,
+            )
+            if result.returncode != 0:
+                return None
+            try:
+                with open(report_path, "r") as report_file:
+                    report = json.load(report_file)
+                return {item["metadata"]["name"].lower(): item["metadata"]["version"] for item in report["install"]}
+            except (OSError, ValueError, KeyError):
+                return None
+
+    def prebuild_lambda_layer(self, sar_failed=False):
+        # Called once before a multi-region init with --generate-lambda-layer fans out, so that region workers reuse
+        # one build.  Layers with a custom name are always built locally; rdklib-layer only when sar_failed says that
+        # the Serverless Application Repository couldn't deploy it in some region.  Returns the layer zip and its cache
+        # key, if one was built.
+        self.args = get_init_parser().parse_args(self.args.command_args, self.args)
+        if self.args.generate_lambda_layer and (self.args.custom_layer_name != "rdklib-layer" or sar_failed):
+            return self.__build_lambda_layer(self.args.region)
+        return None
 
 
 class TestCI:
@@ -4513,3 +6182,81 @@ class TestCI:
 
     def get_json(self):
         return self.ci_json
+
+
+class CachedSession(Session):
+    # A boto3 Session that hands out one shared client per service.  Building clients is slow (credential and
+    # endpoint resolution) and not thread-safe, so it happens once under a lock; the clients themselves are
+    # thread-safe and can be shared between Rule workers.
+    def __init__(self, client_config=None, **session_args):
+        super().__init__(**session_args)
+        self.client_config = client_config
+        self.clients = {}
+        self.lock = threading.RLock()
+
+    def client(self, service_name, *args, **kwargs):
+        with self.lock:
+            # Clients with non-default settings are built on request and not shared.
+            if args or kwargs:
+                return super().client(service_name, *args, **kwargs)
+            if service_name not in self.clients:
+                self.clients[service_name] = super().client(service_name, config=self.client_config)
+            return self.clients[service_name]
+
+    def resource(self, *args, **kwargs):
+        # Resources build their own client through client() above, so share its lock.
+        with self.lock:
+            return super().resource(*args, **kwargs)
+
+
+class AssumedRoleCredentialProvider(botocore.credentials.CredentialProvider):
+    # Puts the shared, refreshable credentials of an assumed role at the front of a botocore session's credential
+    # chain, so that every session for the role draws on the same credentials.
+    METHOD = "rdk-assume-role"
+    CANONICAL_NAME = "rdk-assume-role"
+
+    def __init__(self, credentials):
+        super().__init__()
+        self.credentials = credentials
+
+    def load(self):
+        return self.credentials
+
+
+class ThreadPrefixedOutput:
+    # Wraps a text stream so that lines written from a thread with a prefix set are buffered
+    # and emitted whole, each line starting with that prefix.  Other threads write through untouched.
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def set_prefix(self, prefix):
+        self.local.prefix = prefix
+        self.local.buffer = ""
+
+    def clear_prefix(self):
+        if getattr(self.local, "buffer", ""):
+            self.write("\n")
+        self.local.prefix = None
+
+    def write(self, text):
+        prefix = getattr(self.local, "prefix", None)
+        if prefix is None:
+            with self.lock:
+                return self.stream.write(text)
+
+        *lines, self.local.buffer = (self.local.buffer + text).split("\n")
+        if lines:
+            with self.lock:
+                for line in lines:
+                    self.stream.write(f"{prefix} {line}\n")
+                self.stream.flush()
+        return len(text)
+
+    def flush(self):
+        with self.lock:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
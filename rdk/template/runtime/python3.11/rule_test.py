@@ -1,6 +1,7 @@
+import datetime
 import sys
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 import botocore
 
 ##############
@@ -146,6 +147,56 @@ def sts_mock():
     STS_CLIENT_MOCK.assume_role = MagicMock(return_value=assume_role_response)
 
 
+def build_assume_role_response(seconds_left):
+    expiration = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=seconds_left)
+    return {
+        "Credentials": {
+            "AccessKeyId": "string",
+            "SecretAccessKey": "string",
+            "SessionToken": "string",
+            "Expiration": expiration,
+        }
+    }
+
+
+def build_old_evaluation(resource_type, resource_id, compliance_type="NON_COMPLIANT"):
+    return {
+        "EvaluationResultIdentifier": {
+            "EvaluationResultQualifier": {
+                "ConfigRuleName": "myrule",
+                "ResourceType": resource_type,
+                "ResourceId": resource_id,
+            }
+        },
+        "ComplianceType": compliance_type,
+    }
+
+
+def build_api_configuration_item(resource_id, configuration="{}"):
+    return {
+        "version": "1.3",
+        "accountId": "123456789012",
+        "configurationItemStatus": "OK",
+        "configurationItemMD5Hash": "",
+        "arn": "some-arn",
+        "resourceType": "AWS::EC2::SecurityGroup",
+        "resourceId": resource_id,
+        "configuration": configuration,
+        "relationships": [{"relationshipName": "Is associated with", "resourceId": "vpc-1"}],
+    }
+
+
+def build_throttling_error():
+    return botocore.exceptions.ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "throttled"}}, "operation"
+    )
+
+
+def config_client_mock():
+    CONFIG_CLIENT_MOCK.reset_mock(return_value=True, side_effect=True)
+    RULE.AWS_CONFIG_CLIENT = CONFIG_CLIENT_MOCK
+
+
 ##################
 # Common Testing #
 ##################
@@ -175,3 +226,220 @@ class TestStsErrors(unittest.TestCase):
         assert_customer_error_response(
             self, response, "AccessDenied", "AWS Config does not have permission to assume the IAM role."
         )
+
+
+class TestCleanUpOldEvaluations(unittest.TestCase):
+    def setUp(self):
+        config_client_mock()
+
+    def test_old_evaluations_not_in_latest_become_not_applicable(self):
+        CONFIG_CLIENT_MOCK.get_compliance_details_by_config_rule = MagicMock(
+            side_effect=[
+                {
+                    "EvaluationResults": [
+                        build_old_evaluation("AWS::S3::Bucket", "bucket-1"),
+                        build_old_evaluation("AWS::S3::Bucket", "bucket-2"),
+                    ],
+                    "NextToken": "next-token",
+                },
+                {"EvaluationResults": [build_old_evaluation("AWS::EC2::Instance", "bucket-1")]},
+            ]
+        )
+        event = build_lambda_scheduled_event()
+        latest_evaluations = [RULE.build_evaluation("bucket-1", "COMPLIANT", event, resource_type="AWS::S3::Bucket")]
+        evaluations = RULE.clean_up_old_evaluations(latest_evaluations, event)
+        self.assertEqual(
+            [
+                ("AWS::S3::Bucket", "bucket-2", "NOT_APPLICABLE"),
+                ("AWS::EC2::Instance", "bucket-1", "NOT_APPLICABLE"),
+                ("AWS::S3::Bucket", "bucket-1", "COMPLIANT"),
+            ],
+            [
+                (evaluation["ComplianceResourceType"], evaluation["ComplianceResourceId"], evaluation["ComplianceType"])
+                for evaluation in evaluations
+            ],
+        )
+        self.assertEqual(
+            "next-token", CONFIG_CLIENT_MOCK.get_compliance_details_by_config_rule.call_args_list[1][1]["NextToken"]
+        )
+
+    def test_no_old_evaluations(self):
+        CONFIG_CLIENT_MOCK.get_compliance_details_by_config_rule = MagicMock(return_value={"EvaluationResults": []})
+        event = build_lambda_scheduled_event()
+        latest_evaluations = [RULE.build_evaluation("123456789012", "COMPLIANT", event)]
+        self.assertEqual(latest_evaluations, RULE.clean_up_old_evaluations(latest_evaluations, event))
+
+
+class TestPutEvaluations(unittest.TestCase):
+    def setUp(self):
+        config_client_mock()
+        self.event = build_lambda_scheduled_event()
+        self.evaluations = [RULE.build_evaluation(str(i), "COMPLIANT", self.event) for i in range(250)]
+
+    def test_batches_by_item_count(self):
+        self.assertEqual([(0, 100), (100, 200), (200, 250)], RULE.batch_evaluations(self.evaluations))
+
+    def test_batches_by_size(self):
+        evaluations = [RULE.build_evaluation("1", "COMPLIANT", self.event, annotation="a" * 200)] * 3
+        evaluation_bytes = len(RULE.json.dumps(evaluations[0], default=str))
+        with patch.object(RULE, "PUT_EVALUATIONS_MAX_BYTES", 2 * evaluation_bytes):
+            self.assertEqual([(0, 2), (2, 3)], RULE.batch_evaluations(evaluations))
+
+    def test_retries_throttled_batch(self):
+        CONFIG_CLIENT_MOCK.put_evaluations = MagicMock(
+            side_effect=[build_throttling_error(), build_throttling_error(), {"FailedEvaluations": []}]
+        )
+        with patch.object(RULE.time, "sleep") as sleep_mock:
+            self.assertEqual(0, RULE.put_evaluations_batch(self.evaluations[:1], "token", False))
+        self.assertEqual(3, CONFIG_CLIENT_MOCK.put_evaluations.call_count)
+        self.assertEqual(2, sleep_mock.call_count)
+
+    def test_gives_up_after_max_attempts(self):
+        CONFIG_CLIENT_MOCK.put_evaluations = MagicMock(side_effect=build_throttling_error())
+        with patch.object(RULE.time, "sleep"):
+            with self.assertRaises(botocore.exceptions.ClientError):
+                RULE.put_evaluations_batch(self.evaluations[:1], "token", False)
+        self.assertEqual(RULE.PUT_EVALUATIONS_MAX_ATTEMPTS, CONFIG_CLIENT_MOCK.put_evaluations.call_count)
+
+    def test_does_not_retry_other_errors(self):
+        CONFIG_CLIENT_MOCK.put_evaluations = MagicMock(
+            side_effect=botocore.exceptions.ClientError(
+                {"Error": {"Code": "InvalidParameterValueException", "Message": "invalid"}}, "operation"
+            )
+        )
+        with self.assertRaises(botocore.exceptions.ClientError):
+            RULE.put_evaluations_batch(self.evaluations[:1], "token", False)
+        self.assertEqual(1, CONFIG_CLIENT_MOCK.put_evaluations.call_count)
+
+    def test_counts_submitted_and_dropped(self):
+        CONFIG_CLIENT_MOCK.put_evaluations = MagicMock(
+            side_effect=lambda Evaluations, **kwargs: {"FailedEvaluations": Evaluations[:1]}
+        )
+        self.assertEqual((247, 3), RULE.put_evaluations(self.evaluations, "token", False))
+        self.assertEqual(3, CONFIG_CLIENT_MOCK.put_evaluations.call_count)
+
+
+class TestGetConfiguration(unittest.TestCase):
+    def setUp(self):
+        config_client_mock()
+        RULE.CONFIGURATION_ITEM_CACHE.clear()
+        CONFIG_CLIENT_MOCK.get_resource_config_history = MagicMock(
+            side_effect=lambda resourceType, resourceId, **kwargs: {
+                "configurationItems": [build_api_configuration_item(resourceId, '{"key": "value"}')]
+            }
+        )
+
+    def test_repeated_item_is_cached(self):
+        configuration_item = RULE.get_configuration("AWS::EC2::SecurityGroup", "sg-1", "time")
+        self.assertEqual({"key": "value"}, configuration_item["configuration"])
+        self.assertEqual("Is associated with", configuration_item["relationships"][0]["name"])
+        self.assertEqual(configuration_item, RULE.get_configuration("AWS::EC2::SecurityGroup", "sg-1", "time"))
+        self.assertEqual(1, CONFIG_CLIENT_MOCK.get_resource_config_history.call_count)
+
+    def test_cached_item_is_not_shared(self):
+        configuration_item = RULE.get_configuration("AWS::EC2::SecurityGroup", "sg-1", "time")
+        configuration_item["configuration"]["key"] = "changed"
+        configuration_item["relationships"][0]["name"] = "changed"
+        configuration_item = RULE.get_configuration("AWS::EC2::SecurityGroup", "sg-1", "time")
+        self.assertEqual({"key": "value"}, configuration_item["configuration"])
+        self.assertEqual("Is associated with", configuration_item["relationships"][0]["name"])
+
+    def test_evicts_least_recently_used_items(self):
+        with patch.object(RULE, "CONFIGURATION_ITEM_CACHE_MAX_ITEMS", 2):
+            RULE.get_configuration("AWS::EC2::SecurityGroup", "sg-1", "time")
+            RULE.get_configuration("AWS::EC2::SecurityGroup", "sg-2", "time")
+            RULE.get_configuration("AWS::EC2::SecurityGroup", "sg-1", "time")
+            RULE.get_configuration("AWS::EC2::SecurityGroup", "sg-3", "time")
+        self.assertEqual(["sg-1", "sg-3"], [cache_key[1] for cache_key in RULE.CONFIGURATION_ITEM_CACHE])
+
+    def test_evicts_by_configuration_size(self):
+        configuration_bytes = len('{"key": "value"}')
+        with patch.object(RULE, "CONFIGURATION_ITEM_CACHE_MAX_BYTES", 2 * configuration_bytes):
+            for resource_id in ["sg-1", "sg-2", "sg-3"]:
+                RULE.get_configuration("AWS::EC2::SecurityGroup", resource_id, "time")
+        self.assertEqual(["sg-2", "sg-3"], [cache_key[1] for cache_key in RULE.CONFIGURATION_ITEM_CACHE])
+
+    def test_does_not_cache_items_over_the_size_limit(self):
+        with patch.object(RULE, "CONFIGURATION_ITEM_CACHE_MAX_BYTES", 4):
+            RULE.get_configuration("AWS::EC2::SecurityGroup", "sg-1", "time")
+        self.assertEqual(0, len(RULE.CONFIGURATION_ITEM_CACHE))
+
+
+class TestGetInvocationContext(unittest.TestCase):
+    def test_parsed_once_per_invocation(self):
+        event = build_lambda_scheduled_event('{"SomeParameterKey":"SomeParameterValue"}')
+        invocation_context = RULE.get_invocation_context(event)
+        self.assertIs(invocation_context, RULE.get_invocation_context(event))
+        self.assertEqual("ScheduledNotification", invocation_context["invoking_event"]["messageType"])
+        self.assertEqual("2017-12-23T22:11:18.158Z", invocation_context["ordering_timestamp"])
+        self.assertEqual({"SomeParameterKey": "SomeParameterValue"}, invocation_context["rule_parameters"])
+
+    def test_reset_between_invocations(self):
+        first_context = RULE.get_invocation_context(build_lambda_scheduled_event('{"SomeParameterKey":"first"}'))
+        second_context = RULE.get_invocation_context(build_lambda_scheduled_event('{"SomeParameterKey":"second"}'))
+        self.assertIsNot(first_context, second_context)
+        self.assertEqual({"SomeParameterKey": "second"}, second_context["rule_parameters"])
+
+
+class TestGetClient(unittest.TestCase):
+    def setUp(self):
+        RULE.ASSUME_ROLE_MODE = False
+        RULE.CLIENT_CACHE.clear()
+        self.addCleanup(RULE.CLIENT_CACHE.clear)
+        client_patcher = patch.object(RULE.boto3, "client", MagicMock(side_effect=lambda *args, **kwargs: MagicMock()))
+        self.boto3_client_mock = client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+
+    def test_client_is_reused(self):
+        event = build_lambda_scheduled_event()
+        config_client = RULE.get_client("config", event)
+        self.assertIs(config_client, RULE.get_client("config", event))
+        self.assertIs(config_client, RULE.get_client("config", build_lambda_scheduled_event()))
+        self.assertEqual(1, self.boto3_client_mock.call_count)
+
+    def test_client_per_service_and_region(self):
+        event = build_lambda_scheduled_event()
+        config_client = RULE.get_client("config", event)
+        self.assertIsNot(config_client, RULE.get_client("config", event, "us-west-2"))
+        self.assertIsNot(config_client, RULE.get_client("ec2", event))
+        self.assertEqual(3, self.boto3_client_mock.call_count)
+
+
+class TestAssumeRoleCredentials(unittest.TestCase):
+    def setUp(self):
+        RULE.ASSUME_ROLE_MODE = True
+        RULE.CLIENT_CACHE.clear()
+        RULE.CREDENTIALS_CACHE.clear()
+        self.addCleanup(RULE.CLIENT_CACHE.clear)
+        self.addCleanup(RULE.CREDENTIALS_CACHE.clear)
+        sts_mock()
+        client_patcher = patch.object(
+            RULE.boto3,
+            "client",
+            MagicMock(
+                side_effect=lambda service, *args, **kwargs: STS_CLIENT_MOCK if service == "sts" else MagicMock()
+            ),
+        )
+        client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+
+    def test_valid_credentials_are_reused(self):
+        STS_CLIENT_MOCK.assume_role = MagicMock(
+            return_value=build_assume_role_response(RULE.CONFIG_ROLE_TIMEOUT_SECONDS)
+        )
+        event = build_lambda_scheduled_event()
+        config_client = RULE.get_client("config", event)
+        self.assertIs(config_client, RULE.get_client("config", build_lambda_scheduled_event()))
+        self.assertEqual(1, STS_CLIENT_MOCK.assume_role.call_count)
+
+    def test_credentials_are_refreshed_near_expiry(self):
+        STS_CLIENT_MOCK.assume_role = MagicMock(
+            side_effect=[
+                build_assume_role_response(RULE.CONFIG_ROLE_REFRESH_SECONDS - 60),
+                build_assume_role_response(RULE.CONFIG_ROLE_TIMEOUT_SECONDS),
+            ]
+        )
+        event = build_lambda_scheduled_event()
+        config_client = RULE.get_client("config", event)
+        self.assertIsNot(config_client, RULE.get_client("config", build_lambda_scheduled_event()))
+        self.assertEqual(2, STS_CLIENT_MOCK.assume_role.call_count)
@@ -1,6 +1,11 @@
 import json
 import sys
 import datetime
+import random
+import time
+import concurrent.futures
+import collections
+import copy
 import boto3
 import botocore
 
@@ -21,6 +26,23 @@ ASSUME_ROLE_MODE = False
 
 # Other parameters (no change needed)
 CONFIG_ROLE_TIMEOUT_SECONDS = 900
+CONFIG_ROLE_REFRESH_SECONDS = 300  # cached assumed-role credentials are renewed once they have less than this left
+CONFIGURATION_ITEM_CACHE_MAX_ITEMS = 32  # oversized configuration items kept between invocations
+CONFIGURATION_ITEM_CACHE_MAX_BYTES = 8000000  # budget for the configurations of the cached configuration items
+PUT_EVALUATIONS_MAX_ITEMS = 100  # the most evaluations that a PutEvaluations request accepts
+PUT_EVALUATIONS_MAX_BYTES = 256000  # budget for the serialized evaluations of one PutEvaluations request
+PUT_EVALUATIONS_WORKERS = 4  # PutEvaluations requests sent at the same time
+PUT_EVALUATIONS_MAX_ATTEMPTS = 5  # attempts for each PutEvaluations request while AWS Config is throttling
+
+# The current invocation's parsed invoking event, timestamp and rule parameters. See get_invocation_context().
+INVOCATION_CONTEXT = None
+
+# Clients and assumed-role credentials, kept between the invocations of a warm Lambda container. See get_client().
+CLIENT_CACHE = {}
+CREDENTIALS_CACHE = {}
+
+# Oversized configuration items as returned by the API, least recently used first. See get_configuration().
+CONFIGURATION_ITEM_CACHE = collections.OrderedDict()
 
 #############
 # Main Code #
@@ -96,16 +118,27 @@ def get_client(service, event, region=None):
     event -- the event variable given in the lambda handler
     region -- the region where the client is called (default: None)
     """
+    role_arn = get_execution_role_arn(event) if ASSUME_ROLE_MODE else None
+    credentials = get_assume_role_credentials(role_arn, region) if ASSUME_ROLE_MODE else None
+
+    # Reuse the client from an earlier invocation, as long as it was built with the same credentials.
+    cache_key = (service, region, role_arn)
+    cached_client = CLIENT_CACHE.get(cache_key)
+    if cached_client and cached_client["credentials"] is credentials:
+        return cached_client["client"]
+
     if not ASSUME_ROLE_MODE:
-        return boto3.client(service, region)
-    credentials = get_assume_role_credentials(get_execution_role_arn(event), region)
-    return boto3.client(
-        service,
-        aws_access_key_id=credentials["AccessKeyId"],
-        aws_secret_access_key=credentials["SecretAccessKey"],
-        aws_session_token=credentials["SessionToken"],
-        region_name=region,
-    )
+        client = boto3.client(service, region)
+    else:
+        client = boto3.client(
+            service,
+            aws_access_key_id=credentials["AccessKeyId"],
+            aws_secret_access_key=credentials["SecretAccessKey"],
+            aws_session_token=credentials["SessionToken"],
+            region_name=region,
+        )
+    CLIENT_CACHE[cache_key] = {"client": client, "credentials": credentials}
+    return client
 
 
 # This generates an evaluation for config
@@ -125,7 +158,7 @@ def build_evaluation(resource_id, compliance_type, event, resource_type=DEFAULT_
     eval_cc["ComplianceResourceType"] = resource_type
     eval_cc["ComplianceResourceId"] = resource_id
     eval_cc["ComplianceType"] = compliance_type
-    eval_cc["OrderingTimestamp"] = str(json.loads(event["invokingEvent"])["notificationCreationTime"])
+    eval_cc["OrderingTimestamp"] = get_invocation_context(event)["ordering_timestamp"]
     return eval_cc
 
 
@@ -151,11 +184,37 @@ def build_evaluation_from_config_item(configuration_item, compliance_type, annot
 # Boilerplate Code #
 ####################
 
+# Parse the invoking event and rule parameters once per invocation, rather than every time an evaluation is built.
+def get_invocation_context(event):
+    global INVOCATION_CONTEXT
+
+    if (
+        INVOCATION_CONTEXT is None
+        or INVOCATION_CONTEXT["event"] is not event
+        or INVOCATION_CONTEXT["raw_invoking_event"] is not event["invokingEvent"]
+    ):
+        invoking_event = json.loads(event["invokingEvent"])
+        rule_parameters = {}
+        if "ruleParameters" in event:
+            rule_parameters = json.loads(event["ruleParameters"])
+        ordering_timestamp = None
+        if "notificationCreationTime" in invoking_event:
+            ordering_timestamp = str(invoking_event["notificationCreationTime"])
+        INVOCATION_CONTEXT = {
+            "event": event,
+            "raw_invoking_event": event["invokingEvent"],
+            "invoking_event": invoking_event,
+            "ordering_timestamp": ordering_timestamp,
+            "rule_parameters": rule_parameters,
+        }
+    return INVOCATION_CONTEXT
+
+
 # Get execution role for Lambda function
 def get_execution_role_arn(event):
     role_arn = None
     if "ruleParameters" in event:
-        rule_params = json.loads(event["ruleParameters"])
+        rule_params = get_invocation_context(event)["rule_parameters"]
         role_name = rule_params.get("ExecutionRoleName")
         if role_name:
             execution_role_prefix = event["executionRoleArn"].split("/")[0]
@@ -196,11 +255,37 @@ def is_scheduled_notification(message_type):
 # Get configurationItem using getResourceConfigHistory API
 # in case of OversizedConfigurationItemChangeNotification
 def get_configuration(resource_type, resource_id, configuration_capture_time):
-    result = AWS_CONFIG_CLIENT.get_resource_config_history(
-        resourceType=resource_type, resourceId=resource_id, laterTime=configuration_capture_time, limit=1
-    )
-    configuration_item = result["configurationItems"][0]
-    return convert_api_configuration(configuration_item)
+    # Bursts of changes to the same resource can notify about the same configuration item more than once.
+    cache_key = (resource_type, resource_id, configuration_capture_time)
+    if cache_key in CONFIGURATION_ITEM_CACHE:
+        CONFIGURATION_ITEM_CACHE.move_to_end(cache_key)
+        configuration_item = CONFIGURATION_ITEM_CACHE[cache_key][0]
+    else:
+        result = AWS_CONFIG_CLIENT.get_resource_config_history(
+            resourceType=resource_type, resourceId=resource_id, laterTime=configuration_capture_time, limit=1
+        )
+        configuration_item = result["configurationItems"][0]
+        item_bytes = len(configuration_item.get("configuration") or "")
+        configuration_item = convert_api_configuration(configuration_item)
+        cache_configuration_item(cache_key, configuration_item, item_bytes)
+
+    # The rule may change the item it is given, so it gets a copy and the cached item is left as converted.
+    return copy.deepcopy(configuration_item)
+
+
+# Keep a configuration item for later invocations, evicting the least recently used items to stay within the limits.
+# item_bytes is the length of the configuration string as returned by the API, before it was parsed.
+def cache_configuration_item(cache_key, configuration_item, item_bytes):
+    if item_bytes > CONFIGURATION_ITEM_CACHE_MAX_BYTES:
+        return
+    CONFIGURATION_ITEM_CACHE[cache_key] = (configuration_item, item_bytes)
+    cached_bytes = sum(cached_item_bytes for _, cached_item_bytes in CONFIGURATION_ITEM_CACHE.values())
+    while (
+        len(CONFIGURATION_ITEM_CACHE) > CONFIGURATION_ITEM_CACHE_MAX_ITEMS
+        or cached_bytes > CONFIGURATION_ITEM_CACHE_MAX_BYTES
+    ):
+        _, (_, evicted_bytes) = CONFIGURATION_ITEM_CACHE.popitem(last=False)
+        cached_bytes -= evicted_bytes
 
 
 # Convert from the API model to the original invocation model
@@ -253,7 +338,20 @@ def is_applicable(configuration_item, event):
     return status in ("OK", "ResourceDiscovered") and not event_left_scope
 
 
+# Check whether cached credentials are still valid for long enough to be reused.
+def is_fresh_credentials(credentials):
+    expiration = credentials.get("Expiration")
+    if not isinstance(expiration, datetime.datetime):
+        return False
+    remaining = expiration - datetime.datetime.now(expiration.tzinfo)
+    return remaining.total_seconds() > CONFIG_ROLE_REFRESH_SECONDS
+
+
 def get_assume_role_credentials(role_arn, region=None):
+    cache_key = (role_arn, region)
+    if cache_key in CREDENTIALS_CACHE and is_fresh_credentials(CREDENTIALS_CACHE[cache_key]):
+        return CREDENTIALS_CACHE[cache_key]
+
     sts_client = boto3.client("sts", region)
     try:
         assume_role_response = sts_client.assume_role(
@@ -261,6 +359,7 @@ def get_assume_role_credentials(role_arn, region=None):
         )
         if "liblogging" in sys.modules:
             liblogging.logSession(role_arn, assume_role_response)
+        CREDENTIALS_CACHE[cache_key] = assume_role_response["Credentials"]
         return assume_role_response["Credentials"]
     except botocore.exceptions.ClientError as ex:
         # Scrub error message for any internal account info leaks
@@ -273,43 +372,103 @@ def get_assume_role_credentials(role_arn, region=None):
         raise ex
 
 
+# Yield the current COMPLIANT and NON_COMPLIANT evaluation results of the rule, one page at a time.
+def get_old_evaluations(event):
+    kwargs = {
+        "ConfigRuleName": event["configRuleName"],
+        "ComplianceTypes": ["COMPLIANT", "NON_COMPLIANT"],
+        "Limit": 100,
+    }
+    while True:
+        old_eval = AWS_CONFIG_CLIENT.get_compliance_details_by_config_rule(**kwargs)
+        for old_result in old_eval["EvaluationResults"]:
+            yield old_result
+        if "NextToken" not in old_eval:
+            break
+        kwargs["NextToken"] = old_eval["NextToken"]
+
+
 # This removes older evaluation (usually useful for periodic rule not reporting on AWS::::Account).
 def clean_up_old_evaluations(latest_evaluations, event):
 
     cleaned_evaluations = []
 
-    old_eval = AWS_CONFIG_CLIENT.get_compliance_details_by_config_rule(
-        ConfigRuleName=event["configRuleName"], ComplianceTypes=["COMPLIANT", "NON_COMPLIANT"], Limit=100
-    )
-
-    old_eval_list = []
-
-    while True:
-        for old_result in old_eval["EvaluationResults"]:
-            old_eval_list.append(old_result)
-        if "NextToken" in old_eval:
-            next_token = old_eval["NextToken"]
-            old_eval = AWS_CONFIG_CLIENT.get_compliance_details_by_config_rule(
-                ConfigRuleName=event["configRuleName"],
-                ComplianceTypes=["COMPLIANT", "NON_COMPLIANT"],
-                Limit=100,
-                NextToken=next_token,
+    # Index the latest evaluations once, so each old evaluation is checked with a single lookup.
+    latest_resources = set()
+    for latest_eval in latest_evaluations:
+        latest_resources.add((latest_eval["ComplianceResourceType"], latest_eval["ComplianceResourceId"]))
+
+    for old_eval in get_old_evaluations(event):
+        old_qualifier = old_eval["EvaluationResultIdentifier"]["EvaluationResultQualifier"]
+        old_resource_id = old_qualifier["ResourceId"]
+        if (old_qualifier["ResourceType"], old_resource_id) not in latest_resources:
+            cleaned_evaluations.append(
+                build_evaluation(old_resource_id, "NOT_APPLICABLE", event, resource_type=old_qualifier["ResourceType"])
             )
-        else:
-            break
-
-    for old_eval in old_eval_list:
-        old_resource_id = old_eval["EvaluationResultIdentifier"]["EvaluationResultQualifier"]["ResourceId"]
-        newer_founded = False
-        for latest_eval in latest_evaluations:
-            if old_resource_id == latest_eval["ComplianceResourceId"]:
-                newer_founded = True
-        if not newer_founded:
-            cleaned_evaluations.append(build_evaluation(old_resource_id, "NOT_APPLICABLE", event))
 
     return cleaned_evaluations + latest_evaluations
 
 
+# Split the evaluations into (start, end) ranges that each fit in one PutEvaluations request.
+def batch_evaluations(evaluations):
+    batches = []
+    start = 0
+    batch_bytes = 0
+    for end, evaluation in enumerate(evaluations):
+        evaluation_bytes = len(json.dumps(evaluation, default=str))
+        if end > start and (
+            end - start >= PUT_EVALUATIONS_MAX_ITEMS or batch_bytes + evaluation_bytes > PUT_EVALUATIONS_MAX_BYTES
+        ):
+            batches.append((start, end))
+            start = end
+            batch_bytes = 0
+        batch_bytes += evaluation_bytes
+    if start < len(evaluations):
+        batches.append((start, len(evaluations)))
+    return batches
+
+
+# Send one batch, backing off and retrying while AWS Config is throttling. Return how many evaluations were rejected.
+def put_evaluations_batch(evaluations, result_token, test_mode):
+    for attempt in range(PUT_EVALUATIONS_MAX_ATTEMPTS):
+        try:
+            response = AWS_CONFIG_CLIENT.put_evaluations(
+                Evaluations=evaluations, ResultToken=result_token, TestMode=test_mode
+            )
+            return len(response.get("FailedEvaluations", []))
+        except botocore.exceptions.ClientError as ex:
+            if not is_throttling_error(ex) or attempt == PUT_EVALUATIONS_MAX_ATTEMPTS - 1:
+                raise ex
+            time.sleep(random.uniform(0, 2**attempt))
+
+
+# Report the evaluations to AWS Config, sending several batches at once.
+# Return the number of evaluations submitted and the number dropped.
+def put_evaluations(evaluations, result_token, test_mode):
+    submitted = 0
+    dropped = 0
+    error = None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=PUT_EVALUATIONS_WORKERS) as executor:
+        future_to_size = {
+            executor.submit(put_evaluations_batch, evaluations[start:end], result_token, test_mode): end - start
+            for start, end in batch_evaluations(evaluations)
+        }
+        for future in concurrent.futures.as_completed(future_to_size):
+            batch_size = future_to_size[future]
+            try:
+                rejected = future.result()
+            except botocore.exceptions.ClientError as ex:
+                error = error or ex
+                rejected = batch_size
+            submitted += batch_size - rejected
+            dropped += rejected
+
+    print("Submitted {} evaluations to AWS Config, dropped {}.".format(submitted, dropped))
+    if error:
+        raise error
+    return submitted, dropped
+
+
 def lambda_handler(event, context):
     if "liblogging" in sys.modules:
         liblogging.logEvent(event)
@@ -318,10 +477,10 @@ def lambda_handler(event, context):
 
     # print(event)
     check_defined(event, "event")
-    invoking_event = json.loads(event["invokingEvent"])
-    rule_parameters = {}
-    if "ruleParameters" in event:
-        rule_parameters = json.loads(event["ruleParameters"])
+    invocation_context = get_invocation_context(event)
+    invoking_event = invocation_context["invoking_event"]
+    # A copy, so that evaluate_parameters() can't change the parameters that get_execution_role_arn() reads.
+    rule_parameters = dict(invocation_context["rule_parameters"])
 
     try:
         valid_rule_parameters = evaluate_parameters(rule_parameters)
@@ -399,13 +558,7 @@ def lambda_handler(event, context):
         test_mode = True
 
     # Invoke the Config API to report the result of the evaluation
-    evaluation_copy = []
-    evaluation_copy = evaluations[:]
-    while evaluation_copy:
-        AWS_CONFIG_CLIENT.put_evaluations(
-            Evaluations=evaluation_copy[:100], ResultToken=result_token, TestMode=test_mode
-        )
-        del evaluation_copy[:100]
+    put_evaluations(evaluations, result_token, test_mode)
 
     # Used solely for RDK test to be able to test Lambda function
     return evaluations
@@ -420,6 +573,15 @@ def is_internal_error(exception):
     )
 
 
+def is_throttling_error(exception):
+    return exception.response["Error"]["Code"] in (
+        "Throttling",
+        "ThrottlingException",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+    )
+
+
 def build_internal_error_response(internal_error_message, internal_error_details=None):
     return build_error_response(internal_error_message, internal_error_details, "InternalError", "InternalError")
 
@@ -0,0 +1,77 @@
+import argparse
+import json
+import unittest
+from unittest import mock
+
+from rdk import rdk
+
+
+def rule_resources(resource_count):
+    return {f"Resource{i}": {"Type": "AWS::Config::ConfigRule", "Properties": {}} for i in range(resource_count)}
+
+
+class AggregatedStacksTest(unittest.TestCase):
+    def setUp(self):
+        self.rdk = rdk.rdk(argparse.Namespace(stack_name="rdk-rules"))
+        self.base_template = {"Resources": {"Role": {"Type": "AWS::IAM::Role"}}}
+
+    def assign(self, rule_names, resources, existing_stacks=None):
+        return self.rdk._rdk__assign_aggregated_stacks(rule_names, resources, self.base_template, existing_stacks or {})
+
+    def test_fills_stacks_in_order(self):
+        resources = {f"Rule{i}": rule_resources(3) for i in range(5)}
+        with mock.patch.object(rdk, "CFN_MAX_RESOURCES", 10):
+            stacks = self.assign(sorted(resources), resources)
+        self.assertEqual(
+            {"rdk-rules-1": ["Rule0", "Rule1", "Rule2"], "rdk-rules-2": ["Rule3", "Rule4"]},
+            stacks,
+        )
+
+    def test_respects_template_size(self):
+        resources = {f"Rule{i}": rule_resources(1) for i in range(4)}
+        rule_size = len(json.dumps(resources["Rule0"], indent=2))
+        base_size = len(json.dumps(self.base_template, indent=2))
+        with mock.patch.object(rdk, "CFN_MAX_TEMPLATE_SIZE", base_size + 2 * rule_size):
+            stacks = self.assign(sorted(resources), resources)
+        self.assertEqual([["Rule0", "Rule1"], ["Rule2", "Rule3"]], list(stacks.values()))
+
+    def test_keeps_existing_placement(self):
+        resources = {f"Rule{i}": rule_resources(3) for i in range(4)}
+        existing_stacks = {"rdk-rules-1": ["Rule3"], "rdk-rules-2": ["Rule0", "Rule1"]}
+        with mock.patch.object(rdk, "CFN_MAX_RESOURCES", 10):
+            stacks = self.assign(sorted(resources), resources, existing_stacks)
+        self.assertEqual(["Rule3", "Rule2"], stacks["rdk-rules-1"])
+        self.assertEqual(["Rule0", "Rule1"], stacks["rdk-rules-2"])
+
+    def test_drops_removed_rules_and_empty_stacks(self):
+        resources = {"Rule0": rule_resources(1)}
+        existing_stacks = {"rdk-rules-1": ["Rule0"], "rdk-rules-2": ["RuleGone"]}
+        self.assertEqual({"rdk-rules-1": ["Rule0"]}, self.assign(["Rule0"], resources, existing_stacks))
+
+    def test_rule_too_large_exits(self):
+        resources = {"Rule0": rule_resources(20)}
+        with mock.patch.object(rdk, "CFN_MAX_RESOURCES", 10), mock.patch("builtins.print"):
+            with self.assertRaises(SystemExit):
+                self.assign(["Rule0"], resources)
+
+
+class AggregateArgsTest(unittest.TestCase):
+    def parse_args(self, command_args, force_argument=False):
+        my_rdk = rdk.rdk(argparse.Namespace(command_args=command_args))
+        my_rdk._rdk__parse_deploy_args(ForceArgument=force_argument)
+        return my_rdk.args
+
+    def test_requires_all(self):
+        for force_argument in [False, True]:
+            with self.subTest(force_argument=force_argument):
+                with mock.patch("builtins.print"), self.assertRaises(SystemExit):
+                    self.parse_args(["RuleA", "--aggregate"], force_argument)
+
+    def test_undeploy_accepts_aggregate(self):
+        args = self.parse_args(["--all", "--aggregate", "--force"], force_argument=True)
+        self.assertTrue(args.aggregate)
+        self.assertEqual(rdk.aggregated_stack_prefix, args.stack_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
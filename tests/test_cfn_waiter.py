@@ -0,0 +1,104 @@
+import argparse
+import unittest
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+from rdk import rdk
+
+
+def stack(stack_name, stack_status):
+    return {"Stacks": [{"StackId": stack_name + "-id", "StackName": stack_name, "StackStatus": stack_status}]}
+
+
+def client_error(code, message):
+    return ClientError({"Error": {"Code": code, "Message": message}}, "DescribeStacks")
+
+
+def cfn_client_mock(responses):
+    # responses maps each stack name to the describe_stacks responses it returns in turn, by name and then by ID.
+    cfn_client = mock.MagicMock()
+    cfn_client.meta.region_name = "us-east-1"
+    remaining = {stack_name: list(stack_responses) for stack_name, stack_responses in responses.items()}
+
+    def describe_stacks(StackName):
+        response = remaining[StackName.replace("-id", "")].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    cfn_client.describe_stacks.side_effect = describe_stacks
+    cfn_client.describe_stack_events.return_value = {"StackEvents": []}
+    return cfn_client
+
+
+class WaitForCfnStacksTest(unittest.TestCase):
+    def setUp(self):
+        self.rdk = rdk.rdk(argparse.Namespace())
+        for patcher in [mock.patch("builtins.print"), mock.patch.object(rdk.time, "sleep")]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def wait(self, cfn_client, stack_names):
+        return self.rdk._rdk__wait_for_cfn_stacks(cfn_client, stack_names)
+
+    def test_waits_for_in_progress_stacks(self):
+        cfn_client = cfn_client_mock(
+            {
+                "RuleA": [
+                    stack("RuleA", "CREATE_IN_PROGRESS"),
+                    stack("RuleA", "CREATE_IN_PROGRESS"),
+                    stack("RuleA", "CREATE_COMPLETE"),
+                ],
+                "RuleB": [stack("RuleB", "UPDATE_IN_PROGRESS"), stack("RuleB", "UPDATE_COMPLETE")],
+            }
+        )
+        self.assertEqual(
+            {"RuleA": "CREATE_COMPLETE", "RuleB": "UPDATE_COMPLETE"}, self.wait(cfn_client, ["RuleA", "RuleB"])
+        )
+        self.assertEqual(1, rdk.time.sleep.call_count)
+
+    def test_returns_failed_and_rolled_back_statuses(self):
+        for stack_status in ["CREATE_FAILED", "ROLLBACK_COMPLETE", "UPDATE_ROLLBACK_COMPLETE", "DELETE_FAILED"]:
+            with self.subTest(stack_status=stack_status):
+                cfn_client = cfn_client_mock(
+                    {"RuleA": [stack("RuleA", "CREATE_IN_PROGRESS"), stack("RuleA", stack_status)]}
+                )
+                statuses = self.wait(cfn_client, ["RuleA"])
+                self.assertEqual({"RuleA": stack_status}, statuses)
+                self.assertTrue(rdk._is_failed_stack_status(statuses["RuleA"]))
+                cfn_client.describe_stack_events.assert_called_once_with(StackName="RuleA-id")
+
+    def test_review_in_progress_is_final(self):
+        cfn_client = cfn_client_mock({"RuleA": [stack("RuleA", "REVIEW_IN_PROGRESS")] * 2})
+        self.assertEqual({"RuleA": "REVIEW_IN_PROGRESS"}, self.wait(cfn_client, ["RuleA"]))
+        rdk.time.sleep.assert_not_called()
+
+    def test_missing_stack_is_deleted(self):
+        cfn_client = cfn_client_mock({"RuleA": [client_error("ValidationError", "Stack with id RuleA does not exist")]})
+        self.assertEqual({"RuleA": "DELETE_COMPLETE"}, self.wait(cfn_client, ["RuleA"]))
+
+    def test_backs_off_when_throttled(self):
+        cfn_client = cfn_client_mock(
+            {
+                "RuleA": [
+                    stack("RuleA", "CREATE_IN_PROGRESS"),
+                    client_error("Throttling", "Rate exceeded"),
+                    stack("RuleA", "CREATE_COMPLETE"),
+                ]
+            }
+        )
+        with mock.patch.object(rdk, "_jittered_delay", side_effect=lambda delay: delay):
+            self.assertEqual({"RuleA": "CREATE_COMPLETE"}, self.wait(cfn_client, ["RuleA"]))
+        rdk.time.sleep.assert_called_once_with(rdk.CFN_WAIT_MAX_DELAY)
+
+    def test_other_errors_are_raised(self):
+        cfn_client = cfn_client_mock(
+            {"RuleA": [stack("RuleA", "CREATE_IN_PROGRESS"), client_error("AccessDenied", "Access denied")]}
+        )
+        with self.assertRaises(ClientError):
+            self.wait(cfn_client, ["RuleA"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from rdk import rdk
+
+
+def cfn_client_mock(stack_status):
+    cfn_client = mock.MagicMock()
+    cfn_client.meta.region_name = "us-east-1"
+    cfn_client.describe_stacks.return_value = {
+        "Stacks": [{"StackId": "stack-id", "StackName": "RuleA", "StackStatus": stack_status}]
+    }
+    cfn_client.describe_stack_events.return_value = {"StackEvents": []}
+    return cfn_client
+
+
+class DeployJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.rdk = rdk.rdk(argparse.Namespace(resume=False))
+        self.rdk._rdk__open_deploy_journal("us-east-1")
+        self.journal = self.rdk._rdk__journal
+        self.journal["Rules"]["RuleA"] = {"Fingerprint": "fingerprint", "Phases": ["Packaged", "StackSubmitted"]}
+        print_patcher = mock.patch("builtins.print")
+        print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def read_journal(self):
+        with open(self.journal["Path"], "r") as journal_file:
+            return json.load(journal_file)["Rules"]
+
+    def test_completed_stack_is_recorded(self):
+        for stack_status in ["CREATE_COMPLETE", "UPDATE_COMPLETE"]:
+            with self.subTest(stack_status=stack_status):
+                cfn_client = cfn_client_mock(stack_status)
+                self.assertEqual(0, self.rdk._rdk__wait_for_rule_stack("RuleA", cfn_client, "RuleA"))
+                self.assertEqual(
+                    ["Packaged", "StackSubmitted", "StackComplete"], self.read_journal()["RuleA"]["Phases"]
+                )
+
+    def test_failed_stack_is_not_recorded(self):
+        for stack_status in ["CREATE_FAILED", "ROLLBACK_COMPLETE", "UPDATE_ROLLBACK_COMPLETE", "UPDATE_FAILED"]:
+            with self.subTest(stack_status=stack_status):
+                self.journal["Rules"]["RuleA"]["Phases"] = ["Packaged", "StackSubmitted"]
+                cfn_client = cfn_client_mock(stack_status)
+                self.assertEqual(1, self.rdk._rdk__wait_for_rule_stack("RuleA", cfn_client, "RuleA"))
+                self.assertEqual(["Packaged"], self.read_journal()["RuleA"]["Phases"])
+
+
+class ResumeDeployTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.session = mock.MagicMock()
+        self.session.region_name = "us-east-1"
+        print_patcher = mock.patch("builtins.print")
+        print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def open_journal(self, resume, rule_params=None):
+        my_rdk = rdk.rdk(argparse.Namespace(resume=resume, plan=False))
+        my_rdk._rdk__get_rule_parameters = lambda rule_name: (rule_params or {"SourceIdentifier": "IAM_ROOT"}, [])
+        my_rdk._rdk__open_deploy_journal("us-east-1")
+        return my_rdk
+
+    def write_journal(self, phases, rule_params=None):
+        my_rdk = self.open_journal(False, rule_params)
+        my_rdk._rdk__start_deploy_journal_entry("RuleA")
+        my_rdk._rdk__record_deploy_phases("RuleA", *phases)
+
+    def test_resume_loads_journal(self):
+        self.write_journal(["Packaged", "Uploaded"])
+        my_rdk = self.open_journal(True)
+        self.assertEqual(["Packaged", "Uploaded"], my_rdk._rdk__start_deploy_journal_entry("RuleA"))
+
+    def test_without_resume_starts_over(self):
+        self.write_journal(["Packaged", "Uploaded"])
+        my_rdk = self.open_journal(False)
+        self.assertEqual([], my_rdk._rdk__start_deploy_journal_entry("RuleA"))
+
+    def test_changed_rule_starts_over(self):
+        self.write_journal(["Packaged", "Uploaded"])
+        my_rdk = self.open_journal(True, {"SourceIdentifier": "IAM_PASSWORD_POLICY"})
+        self.assertEqual([], my_rdk._rdk__start_deploy_journal_entry("RuleA"))
+
+    def test_completed_rule_is_skipped(self):
+        self.write_journal(["Packaged", "Uploaded", "StackSubmitted", "StackComplete", "Complete"])
+        my_rdk = self.open_journal(True)
+        my_rdk._rdk__deploy_rule_phases = mock.MagicMock()
+        self.assertEqual(0, my_rdk._rdk__deploy_rule("RuleA", self.session, "123456789012", "aws", "code-bucket"))
+        my_rdk._rdk__deploy_rule_phases.assert_not_called()
+        self.assertEqual("Skipped", my_rdk.rule_results["RuleA"]["Status"])
+
+    def test_interrupted_rule_continues(self):
+        self.write_journal(["Packaged", "Uploaded"])
+        my_rdk = self.open_journal(True)
+        my_rdk._rdk__deploy_rule_phases = mock.MagicMock(return_value=0)
+        self.assertEqual(0, my_rdk._rdk__deploy_rule("RuleA", self.session, "123456789012", "aws", "code-bucket"))
+        self.assertEqual(["Packaged", "Uploaded"], my_rdk._rdk__deploy_rule_phases.call_args.args[-1])
+        self.assertEqual("Deployed", my_rdk.rule_results["RuleA"]["Status"])
+        with open(my_rdk._rdk__journal["Path"], "r") as journal_file:
+            self.assertIn("Complete", json.load(journal_file)["Rules"]["RuleA"]["Phases"])
+
+    def test_failed_rule_is_not_completed(self):
+        my_rdk = self.open_journal(True)
+        my_rdk._rdk__deploy_rule_phases = mock.MagicMock(return_value=1)
+        self.assertEqual(1, my_rdk._rdk__deploy_rule("RuleA", self.session, "123456789012", "aws", "code-bucket"))
+        self.assertEqual("Failed", my_rdk.rule_results["RuleA"]["Status"])
+        self.assertNotIn("Complete", my_rdk._rdk__journal["Rules"]["RuleA"]["Phases"])
+
+
+if __name__ == "__main__":
+    unittest.main()
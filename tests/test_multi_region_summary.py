@@ -0,0 +1,93 @@
+import argparse
+import unittest
+from unittest import mock
+
+from rdk import rdk
+
+
+class RunMultiRegionTest(unittest.TestCase):
+    def run_command(self, process_command):
+        args = argparse.Namespace(region="us-east-1", role_arn="arn:aws:iam::123456789012:role/rdk")
+        with mock.patch.object(rdk.rdk, "process_command", process_command):
+            return rdk.run_multi_region(args)
+
+    def test_return_value_and_log(self):
+        def process_command(my_rdk):
+            print("Deploying RuleA")
+            my_rdk.rule_results["RuleA"] = {"Status": "Deployed", "Duration": 1.0}
+            return 0
+
+        result = self.run_command(process_command)
+        self.assertEqual("123456789012", result["Account"])
+        self.assertEqual("us-east-1", result["Region"])
+        self.assertEqual(0, result["ReturnValue"])
+        self.assertEqual({"RuleA": {"Status": "Deployed", "Duration": 1.0}}, result["Rules"])
+        self.assertEqual("Deploying RuleA\n", result["Log"])
+
+    def test_system_exit(self):
+        for code, return_val in [(None, 0), (0, 0), (2, 2), ("Invalid parameters", 1)]:
+            with self.subTest(code=code):
+
+                def process_command(my_rdk):
+                    raise SystemExit(code)
+
+                self.assertEqual(return_val, self.run_command(process_command)["ReturnValue"])
+
+    def test_exception(self):
+        def process_command(my_rdk):
+            raise RuntimeError("boom")
+
+        result = self.run_command(process_command)
+        self.assertEqual(1, result["ReturnValue"])
+        self.assertIn("RuntimeError: boom", result["Log"])
+
+
+class PrintMultiRegionSummaryTest(unittest.TestCase):
+    def summary(self, results):
+        with mock.patch("builtins.print") as print_mock:
+            rdk.print_multi_region_summary(results)
+        return [call.args[0].split() for call in print_mock.call_args_list]
+
+    def result(self, account, region, return_val, rules=None):
+        return {"Account": account, "Region": region, "ReturnValue": return_val, "Duration": 2.0, "Rules": rules or {}}
+
+    def test_rows_per_account_region_and_rule(self):
+        rows = self.summary(
+            [
+                self.result("222222222222", "us-east-1", 0),
+                self.result(
+                    "111111111111",
+                    "us-west-2",
+                    1,
+                    {
+                        "RuleB": {"Status": "Failed", "Duration": 1.25},
+                        "RuleA": {"Status": "Deployed", "Duration": 0.5},
+                    },
+                ),
+            ]
+        )
+        self.assertEqual(
+            [
+                ["Account", "Region", "Rule", "Status", "Duration"],
+                ["111111111111", "us-west-2", "Failed", "(1)", "2.0s"],
+                ["RuleA", "Deployed", "0.5s"],
+                ["RuleB", "Failed", "1.2s"],
+                ["222222222222", "us-east-1", "Succeeded", "2.0s"],
+            ],
+            rows,
+        )
+
+    def test_drops_account_column_without_accounts(self):
+        rows = self.summary([self.result(None, "us-east-1", 0), self.result(None, "eu-west-1", 3)])
+        self.assertEqual(
+            [
+                ["Region", "Rule", "Status", "Duration"],
+                ["eu-west-1", "Failed", "(3)", "2.0s"],
+                ["us-east-1", "Succeeded", "2.0s"],
+            ],
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+from rdk import rdk
+
+
+class PackageZipTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rule_dir = self.tmp.name
+        self.files = {
+            "ssl_test.py": "def lambda_handler(event, context): pass\n",
+            "ssl_test_test.py": "import ssl_test\n",
+            "helper_test.py": "",
+            "helper.py": "",
+            "parameters.json": "{}",
+            "lib/data.json": "{}",
+            "__pycache__/helper.cpython-312.pyc": "",
+            ".hidden/secret": "",
+            "bin/tool": "#!/bin/sh\n",
+        }
+        for relative_path, content in self.files.items():
+            file_path = os.path.join(self.rule_dir, relative_path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w") as f:
+                f.write(content)
+        os.chmod(os.path.join(self.rule_dir, "bin", "tool"), 0o700)
+        os.chmod(os.path.join(self.rule_dir, "helper.py"), 0o600)
+        self.exclude_patterns = rdk.PACKAGE_EXCLUDE_PATTERNS + ["ssl_test.zip", "ssl_test_test.py"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_package_files_excludes(self):
+        package_files = rdk.get_package_files(self.rule_dir, ["*"], self.exclude_patterns)
+        self.assertEqual(
+            ["bin/tool", "helper.py", "lib/data.json"], [relative_path for relative_path, _ in package_files]
+        )
+
+    def test_get_package_files_keeps_handler(self):
+        package_files = rdk.get_package_files(self.rule_dir, ["*"], self.exclude_patterns, ["ssl_test.py"])
+        relative_paths = [relative_path for relative_path, _ in package_files]
+        self.assertIn("ssl_test.py", relative_paths)
+        self.assertNotIn("ssl_test_test.py", relative_paths)
+        self.assertNotIn("helper_test.py", relative_paths)
+
+    def test_get_package_files_includes(self):
+        package_files = rdk.get_package_files(self.rule_dir, ["*.py"], self.exclude_patterns, ["ssl_test.py"])
+        self.assertEqual(["helper.py", "ssl_test.py"], [relative_path for relative_path, _ in package_files])
+
+    def test_build_package_zip_is_deterministic(self):
+        first = rdk.build_package_zip(self.rule_dir, ["*"], self.exclude_patterns, ["ssl_test.py"])
+        os.utime(os.path.join(self.rule_dir, "helper.py"), (0, 0))
+        second = rdk.build_package_zip(self.rule_dir, ["*"], self.exclude_patterns, ["ssl_test.py"])
+        self.assertEqual(first, second)
+
+    def test_build_package_zip_normalises_modes(self):
+        package_zip = rdk.build_package_zip(self.rule_dir, ["*"], self.exclude_patterns, ["ssl_test.py"])
+        with zipfile.ZipFile(io.BytesIO(package_zip)) as z:
+            modes = {zip_info.filename: zip_info.external_attr >> 16 for zip_info in z.infolist()}
+            self.assertEqual(sorted(modes), [zip_info.filename for zip_info in z.infolist()])
+        self.assertEqual(0o755, modes["bin/tool"])
+        self.assertEqual(0o644, modes["helper.py"])
+        self.assertEqual(0o644, modes["ssl_test.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import argparse
+import threading
+import unittest
+from unittest import mock
+
+from rdk import rdk
+
+
+class ParallelDeployTest(unittest.TestCase):
+    def setUp(self):
+        self.rdk = rdk.rdk(argparse.Namespace(parallel=2))
+        session = mock.MagicMock()
+        session.region_name = "us-east-1"
+        self.rdk._rdk__get_boto_session = lambda: session
+        self.deployed = []
+        self.deployed_lock = threading.Lock()
+        print_patcher = mock.patch("builtins.print")
+        self.print = print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+
+    def deploy(self, outcomes):
+        # outcomes maps each Rule to what deploying it returns, or raises.
+        def deploy_rule(rule_name, my_session, account_id, partition, code_bucket_name):
+            with self.deployed_lock:
+                self.deployed.append(rule_name)
+            if isinstance(outcomes[rule_name], BaseException):
+                raise outcomes[rule_name]
+            return outcomes[rule_name]
+
+        self.rdk._rdk__deploy_rule = deploy_rule
+        return self.rdk._rdk__deploy_rules_in_parallel(sorted(outcomes), "123456789012", "aws", "config-rule-code")
+
+    def test_all_rules_succeed(self):
+        self.assertEqual(0, self.deploy({"RuleA": 0, "RuleB": 0, "RuleC": None}))
+        self.assertEqual(["RuleA", "RuleB", "RuleC"], sorted(self.deployed))
+
+    def test_failures_are_reported_after_all_rules_are_attempted(self):
+        outcomes = {
+            "RuleA": 0,
+            "RuleB": 1,
+            "RuleC": SystemExit(2),
+            "RuleD": SystemExit("Invalid parameters"),
+            "RuleE": RuntimeError("boom"),
+            "RuleF": 0,
+        }
+        self.assertEqual(1, self.deploy(outcomes))
+        self.assertEqual(sorted(outcomes), sorted(self.deployed))
+        self.print.assert_any_call("[us-east-1]: Deploy failed for 4 of 6 Rules: RuleB, RuleC, RuleD, RuleE")
+
+    def test_restores_stdout(self):
+        with mock.patch("sys.stdout") as stdout:
+            self.deploy({"RuleA": RuntimeError("boom")})
+            self.assertIs(stdout, rdk.sys.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
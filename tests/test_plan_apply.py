@@ -0,0 +1,111 @@
+import argparse
+import unittest
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+from rdk import rdk
+
+
+def cfn_client_mock(stack_status=None, change_sets=()):
+    # A stack_status of None means the stack doesn't exist.
+    cfn_client = mock.MagicMock()
+    cfn_client.meta.region_name = "us-east-1"
+    if stack_status is None:
+        cfn_client.describe_stacks.side_effect = ClientError(
+            {"Error": {"Code": "ValidationError", "Message": "Stack with id RuleA does not exist"}}, "DescribeStacks"
+        )
+    else:
+        cfn_client.describe_stacks.return_value = {
+            "Stacks": [{"StackId": "RuleA-id", "StackName": "RuleA", "StackStatus": stack_status}]
+        }
+    cfn_client.get_paginator.return_value.paginate.return_value = [{"Summaries": list(change_sets)}]
+    cfn_client.create_change_set.return_value = {"Id": "change-set-id"}
+    return cfn_client
+
+
+def plan_change_set(change_set_id, creation_time, status="CREATE_COMPLETE", execution_status="AVAILABLE"):
+    return {
+        "ChangeSetId": change_set_id,
+        "ChangeSetName": rdk.plan_change_set_prefix + change_set_id,
+        "CreationTime": creation_time,
+        "Status": status,
+        "ExecutionStatus": execution_status,
+    }
+
+
+class DeployRuleStackTest(unittest.TestCase):
+    def setUp(self):
+        self.cfn_args = {"StackName": "RuleA", "TemplateBody": "{}"}
+        print_patcher = mock.patch("builtins.print")
+        print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+
+    def deploy(self, cfn_client, plan=False, apply=False):
+        self.rdk = rdk.rdk(argparse.Namespace(plan=plan, apply=apply))
+        return self.rdk._rdk__deploy_rule_stack("RuleA", cfn_client, self.cfn_args)
+
+    def test_creates_and_updates_stacks(self):
+        cfn_client = cfn_client_mock()
+        self.assertEqual("CREATE", self.deploy(cfn_client))
+        cfn_client.create_stack.assert_called_once_with(**self.cfn_args)
+
+        cfn_client = cfn_client_mock("CREATE_COMPLETE")
+        self.assertEqual("UPDATE", self.deploy(cfn_client))
+        cfn_client.update_stack.assert_called_once_with(**self.cfn_args)
+
+    def test_unapplied_plan_is_not_updated(self):
+        cfn_client = cfn_client_mock("REVIEW_IN_PROGRESS")
+        self.assertEqual("FAILED", self.deploy(cfn_client))
+        cfn_client.create_stack.assert_not_called()
+        cfn_client.update_stack.assert_not_called()
+
+    def test_plan_creates_change_set(self):
+        for stack_status, change_set_type in [
+            (None, "CREATE"),
+            ("REVIEW_IN_PROGRESS", "CREATE"),
+            ("CREATE_COMPLETE", "UPDATE"),
+            ("UPDATE_ROLLBACK_COMPLETE", "UPDATE"),
+        ]:
+            with self.subTest(stack_status=stack_status):
+                cfn_client = cfn_client_mock(stack_status)
+                self.assertEqual(change_set_type, self.deploy(cfn_client, plan=True))
+                change_set_args = cfn_client.create_change_set.call_args.kwargs
+                self.assertEqual(change_set_type, change_set_args["ChangeSetType"])
+                self.assertTrue(change_set_args["ChangeSetName"].startswith(rdk.plan_change_set_prefix))
+                self.assertEqual("{}", change_set_args["TemplateBody"])
+                cfn_client.create_stack.assert_not_called()
+                cfn_client.update_stack.assert_not_called()
+                self.assertEqual(
+                    {"StackName": "RuleA", "ChangeSetId": "change-set-id", "ChangeSetType": change_set_type},
+                    self.rdk._rdk__rule_plans["RuleA"],
+                )
+
+    def test_plan_replaces_earlier_plans(self):
+        cfn_client = cfn_client_mock("CREATE_COMPLETE", [plan_change_set("old", 1)])
+        self.deploy(cfn_client, plan=True)
+        cfn_client.delete_change_set.assert_called_once_with(ChangeSetName="old")
+
+    def test_apply_executes_latest_plan(self):
+        for stack_status, operation in [("REVIEW_IN_PROGRESS", "CREATE"), ("CREATE_COMPLETE", "UPDATE")]:
+            with self.subTest(stack_status=stack_status):
+                cfn_client = cfn_client_mock(stack_status, [plan_change_set("new", 2), plan_change_set("old", 1)])
+                self.assertEqual(operation, self.deploy(cfn_client, apply=True))
+                cfn_client.execute_change_set.assert_called_once_with(ChangeSetName="new")
+                cfn_client.create_stack.assert_not_called()
+                cfn_client.update_stack.assert_not_called()
+
+    def test_apply_without_plan(self):
+        self.assertEqual("FAILED", self.deploy(cfn_client_mock(), apply=True))
+        cfn_client = cfn_client_mock("CREATE_COMPLETE")
+        self.assertIsNone(self.deploy(cfn_client, apply=True))
+        cfn_client.execute_change_set.assert_not_called()
+
+    def test_apply_failed_plan(self):
+        cfn_client = cfn_client_mock("CREATE_COMPLETE", [plan_change_set("new", 2, "FAILED", "UNAVAILABLE")])
+        self.assertEqual("FAILED", self.deploy(cfn_client, apply=True))
+        cfn_client.execute_change_set.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import argparse
+import unittest
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+from rdk import rdk
+
+
+def s3_client_mock(objects):
+    # objects maps (bucket, key) to the content hash stored on the object.
+    s3_client = mock.MagicMock()
+
+    def head_object(Bucket, Key):
+        if (Bucket, Key) not in objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        return {"Metadata": {rdk.content_hash_metadata_key: objects[(Bucket, Key)]}}
+
+    s3_client.head_object.side_effect = head_object
+    return s3_client
+
+
+class UploadFunctionCodeTest(unittest.TestCase):
+    def setUp(self):
+        self.rdk = rdk.rdk(argparse.Namespace(artifact_source_bucket=None))
+        self.rdk._rdk__build_function_package = lambda rule_name, params, region: ("/tmp/RuleA.zip", "new-hash")
+        print_patcher = mock.patch("builtins.print")
+        print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+
+    def upload(self, s3_client):
+        session = mock.MagicMock()
+        session.region_name = "us-east-1"
+        session.client.return_value = s3_client
+        return self.rdk._rdk__upload_function_code("RuleA", {}, "123456789012", session, "code-bucket")
+
+    def assert_uploaded(self, s3_client):
+        s3_client.upload_file.assert_called_once_with(
+            "/tmp/RuleA.zip",
+            "code-bucket",
+            "RuleA/RuleA.zip",
+            ExtraArgs={"Metadata": {rdk.content_hash_metadata_key: "new-hash"}},
+        )
+
+    def test_unchanged_code_is_not_uploaded(self):
+        s3_client = s3_client_mock({("code-bucket", "RuleA/RuleA.zip"): "new-hash"})
+        self.assertEqual("RuleA/RuleA.zip", self.upload(s3_client))
+        s3_client.upload_file.assert_not_called()
+        s3_client.copy_object.assert_not_called()
+
+    def test_changed_code_is_uploaded(self):
+        s3_client = s3_client_mock({("code-bucket", "RuleA/RuleA.zip"): "old-hash"})
+        self.assertEqual("RuleA/RuleA.zip", self.upload(s3_client))
+        self.assert_uploaded(s3_client)
+
+    def test_missing_object_is_uploaded(self):
+        s3_client = s3_client_mock({})
+        self.upload(s3_client)
+        self.assert_uploaded(s3_client)
+
+    def test_staged_code_is_copied(self):
+        self.rdk.args.artifact_source_bucket = "staging-bucket"
+        s3_client = s3_client_mock({("staging-bucket", "RuleA/RuleA.zip"): "new-hash"})
+        self.upload(s3_client)
+        s3_client.copy_object.assert_called_once_with(
+            CopySource={"Bucket": "staging-bucket", "Key": "RuleA/RuleA.zip"},
+            Bucket="code-bucket",
+            Key="RuleA/RuleA.zip",
+            MetadataDirective="COPY",
+        )
+        s3_client.upload_file.assert_not_called()
+
+    def test_stale_staged_code_is_uploaded(self):
+        self.rdk.args.artifact_source_bucket = "staging-bucket"
+        s3_client = s3_client_mock({("staging-bucket", "RuleA/RuleA.zip"): "old-hash"})
+        self.upload(s3_client)
+        s3_client.copy_object.assert_not_called()
+        self.assert_uploaded(s3_client)
+
+    def test_staging_bucket_is_not_copied_onto_itself(self):
+        self.rdk.args.artifact_source_bucket = "code-bucket"
+        s3_client = s3_client_mock({})
+        self.upload(s3_client)
+        s3_client.copy_object.assert_not_called()
+        self.assert_uploaded(s3_client)
+
+
+if __name__ == "__main__":
+    unittest.main()